@@ -11,8 +11,11 @@ from typing import Dict, List, Optional, Any
 import uuid
 import threading
 import time
+import os
+import heapq
+import itertools
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
 
 class AgentStatus(Enum):
     INACTIVE = "inactive"
@@ -30,6 +33,23 @@ class AgentType(Enum):
     PORTFOLIO_OPTIMIZER = "portfolio_optimizer"
     ALERT_MANAGER = "alert_manager"
 
+class TaskTier(IntEnum):
+    """Preemptive scheduling tiers, drained in order (RISK first)"""
+    RISK = 0
+    SIGNAL = 1
+    MARKET = 2
+    BACKGROUND = 3
+
+# Default tier per task type; anything unlisted runs as background work
+TASK_TYPE_TIERS = {
+    'assess_risk': TaskTier.RISK,
+    'analyze_signal': TaskTier.SIGNAL,
+    'monitor_market': TaskTier.MARKET,
+}
+
+# Lower tiers hold back while more than this many RISK tasks are in flight
+RISK_YIELD_THRESHOLD = int(os.getenv('AGENT_RISK_YIELD_THRESHOLD', '2'))
+
 @dataclass
 class AgentConfig:
     """Configuration for an agent"""
@@ -55,6 +75,7 @@ class AgentTask:
     priority: int = 5
     retry_count: int = 0
     max_retries: int = 3
+    tier: TaskTier = TaskTier.BACKGROUND
 
 class Agent:
     """Base agent class"""
@@ -211,7 +232,11 @@ class AgentManager:
     def __init__(self, db_path='ai_learning.db'):
         self.db_path = db_path
         self.agents: Dict[str, Agent] = {}
-        self.task_queue: List[AgentTask] = []
+        # One heap per tier of (-priority, created_at, seq, task)
+        self.task_queues: List[list] = [[] for _ in TaskTier]
+        self.task_queue_lock = threading.Lock()
+        self.task_sequence = itertools.count()
+        self.risk_tasks_inflight = 0
         self.running = False
         self.scheduler_thread = None
         self.init_database()
@@ -351,6 +376,29 @@ class AgentManager:
             agent.status = AgentStatus.ACTIVE
             self.agents[agent_id] = agent
     
+    def _enqueue_task(self, task: AgentTask):
+        """Queue a task in its tier, highest priority then oldest first"""
+        with self.task_queue_lock:
+            heapq.heappush(self.task_queues[task.tier],
+                           (-task.priority, task.created_at, next(self.task_sequence), task))
+    
+    def _next_queued_task(self) -> Optional[AgentTask]:
+        """Pop the next queued task, draining RISK before SIGNAL before MARKET before BACKGROUND"""
+        with self.task_queue_lock:
+            for queue in self.task_queues:
+                if queue:
+                    return heapq.heappop(queue)[-1]
+        return None
+    
+    def _can_dispatch(self, task: AgentTask) -> bool:
+        """Lower tiers wait behind queued higher-tier work and behind a busy RISK tier"""
+        if task.tier == TaskTier.RISK:
+            return True
+        with self.task_queue_lock:
+            if self.risk_tasks_inflight > RISK_YIELD_THRESHOLD:
+                return False
+            return not any(self.task_queues[tier] for tier in range(task.tier))
+    
     def submit_task(self, task: AgentTask) -> bool:
         """Submit a task to the appropriate agent"""
         # Find suitable agent
@@ -359,9 +407,9 @@ class AgentManager:
             if agent.can_accept_task()
         ]
         
-        if not suitable_agents:
+        if not suitable_agents or not self._can_dispatch(task):
             # Add to queue
-            self.task_queue.append(task)
+            self._enqueue_task(task)
             return False
         
         # Select best agent (lowest current load)
@@ -373,6 +421,11 @@ class AgentManager:
     
     def _execute_task_async(self, agent: Agent, task: AgentTask):
         """Execute task asynchronously"""
+        is_risk_task = task.tier == TaskTier.RISK
+        if is_risk_task:
+            with self.task_queue_lock:
+                self.risk_tasks_inflight += 1
+        
         def execute():
             start_time = time.time()
             
@@ -413,6 +466,10 @@ class AgentManager:
                     execution_time=execution_time
                 )
                 agent.complete_task(task, success=False)
+            finally:
+                if is_risk_task:
+                    with self.task_queue_lock:
+                        self.risk_tasks_inflight -= 1
         
         # Start task in separate thread
         task_thread = threading.Thread(target=execute)
@@ -441,9 +498,12 @@ class AgentManager:
         conn.close()
     
     def create_task(self, agent_type: str, task_type: str, parameters: Dict[str, Any], 
-                   priority: int = 5, scheduled_for: Optional[datetime] = None) -> str:
-        """Create a new task"""
-        task_id = str(uuid.uuid4())
+                   priority: int = 5, scheduled_for: Optional[datetime] = None,
+                   tier: Optional[TaskTier] = None, task_id: Optional[str] = None) -> str:
+        """Create a new task (tier defaults from the task type; task_id may be pre-assigned by the caller)"""
+        task_id = task_id or str(uuid.uuid4())
+        if tier is None:
+            tier = TASK_TYPE_TIERS.get(task_type, TaskTier.BACKGROUND)
         
         # Save to database
         conn = sqlite3.connect(self.db_path)
@@ -471,7 +531,8 @@ class AgentManager:
             parameters=parameters,
             created_at=datetime.now(),
             scheduled_for=scheduled_for,
-            priority=priority
+            priority=priority,
+            tier=TaskTier(tier)
         )
         
         # Try to submit immediately
@@ -518,19 +579,63 @@ class AgentManager:
         tasks = cursor.fetchall()
         conn.close()
         
-        return [
-            {
-                'id': task[0],
-                'agent_id': task[1],
-                'task_type': task[2],
-                'status': task[3],
-                'created_at': task[4],
-                'completed_at': task[5],
-                'execution_time': task[6],
-                'error_message': task[7]
-            }
-            for task in tasks
-        ]
+        return [self._task_row_to_dict(task) for task in tasks]
+    
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single task's execution state, or None if it was never stored"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, agent_id, task_type, status, created_at, completed_at, 
+                   execution_time, error_message
+            FROM agent_tasks 
+            WHERE id = ?
+        ''', (task_id,))
+        
+        task = cursor.fetchone()
+        conn.close()
+        
+        return self._task_row_to_dict(task) if task else None
+    
+    @staticmethod
+    def _task_row_to_dict(task) -> Dict[str, Any]:
+        """Shape an agent_tasks row selected by get_task/get_task_history"""
+        return {
+            'id': task[0],
+            'agent_id': task[1],
+            'task_type': task[2],
+            'status': task[3],
+            'created_at': task[4],
+            'completed_at': task[5],
+            'execution_time': task[6],
+            'error_message': task[7]
+        }
+    
+    def record_task_failure(self, task_id: str, task_type: str, parameters: Dict[str, Any],
+                            priority: int, error_message: str):
+        """Mark a task that could not be created or submitted as failed, storing it if it never reached the table"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO agent_tasks (id, task_type, parameters, priority, status, completed_at, error_message)
+            VALUES (?, ?, ?, ?, 'failed', ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                status = 'failed',
+                completed_at = excluded.completed_at,
+                error_message = excluded.error_message
+        ''', (
+            task_id,
+            task_type,
+            json.dumps(parameters, default=str),
+            priority,
+            datetime.now(),
+            error_message
+        ))
+        
+        conn.commit()
+        conn.close()
     
     def start_scheduler(self):
         """Start the task scheduler"""
@@ -552,12 +657,10 @@ class AgentManager:
         """Main scheduler loop"""
         while self.running:
             try:
-                # Process queued tasks
-                if self.task_queue:
-                    task = self.task_queue.pop(0)
-                    if not self.submit_task(task):
-                        # Put back if no agent available
-                        self.task_queue.insert(0, task)
+                # Process queued tasks (submit_task re-queues it if no agent is available)
+                task = self._next_queued_task()
+                if task is not None:
+                    self.submit_task(task)
                 
                 # Check for scheduled tasks
                 self._process_scheduled_tasks()
@@ -595,7 +698,8 @@ class AgentManager:
                 task_type=task_data[1],
                 parameters=json.loads(task_data[2]),
                 created_at=datetime.now(),
-                priority=task_data[3]
+                priority=task_data[3],
+                tier=TASK_TYPE_TIERS.get(task_data[1], TaskTier.BACKGROUND)
             )
             
             self.submit_task(task)
@@ -68,7 +68,14 @@ class AIEngine:
                 news_hash TEXT
             )
         ''')
-        
+
+        # Indexes for the journal/stats queries (outcome counts, newest-first listings)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sp_outcome ON signal_performance(actual_outcome)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sp_ts ON signal_performance(timestamp DESC)')
+        # NOCASE so the case-insensitive prefix LIKE in signal search can use them
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sp_symbol ON signal_performance(symbol COLLATE NOCASE, timestamp DESC)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sp_signal_type ON signal_performance(signal_type COLLATE NOCASE, timestamp DESC)')
+
         # News sentiment history
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS news_sentiment (
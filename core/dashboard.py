@@ -7,14 +7,22 @@ Web interface for AI interaction, performance monitoring, and learning managemen
 # Configure logging to reduce verbose output
 import logging
 import warnings
+logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
 logging.getLogger('werkzeug').setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
 warnings.filterwarnings("ignore", category=UserWarning, module="transformers")
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file, flash, session
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_file, send_from_directory, flash, session
 from db_service import db_service
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 import pickle
+import shutil
+from dataclasses import dataclass, asdict
+import heapq
+from collections import OrderedDict
+from itertools import chain
+from functools import lru_cache
 from ai_engine import AIEngine
 from ai_manager import AIManager
 import os
@@ -24,16 +32,48 @@ from strategy import calculate_signal, get_display_name, get_trading_date, forma
 from data_fetch import fetch_last_two_1h_bars, get_current_price
 from discord_working import post_signal, test_discord_connection
 from discord_signals import DiscordSignals
-import traceback
-import schedule
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+import uuid
+import secrets
 import pytz
 from manual_journal import journal_manager
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import NotFound
 from auth_manager import auth_manager, login_required, admin_required
 from email_config import email_service
-from agent_manager import agent_manager
+from agent_manager import agent_manager, AgentType, TaskTier, TASK_TYPE_TIERS
+import sqlite3
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Per-thread SQLite connections, reused across requests instead of reconnecting each time
+DB_PATH = 'ai_learning.db'
+_db_local = threading.local()
+
+def get_db_connection():
+    """Return this thread's long-lived SQLite connection (WAL mode), opening it on first use"""
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        # Rows are addressable by column name as well as by index
+        conn.row_factory = sqlite3.Row
+        _db_local.conn = conn
+    return conn
 
 def send_verification_email(user_email, username, verification_token):
     """Send email verification to new user"""
@@ -177,8 +217,8 @@ def get_todays_signals():
         signals_data = db_service.get_todays_signals()
         return format_signal_data_supabase(signals_data)
         
-    except Exception as e:
-        print(f"❌ Error getting today's signals: {str(e)}")
+    except Exception:
+        logger.exception("Error getting today's signals")
         return []
 
 def get_week_signals():
@@ -187,26 +227,24 @@ def get_week_signals():
         signals_data = db_service.get_week_signals()
         return format_signal_data_supabase(signals_data)
         
-    except Exception as e:
-        print(f"❌ Error getting week signals: {str(e)}")
+    except Exception:
+        logger.exception('Error getting week signals')
         return []
 
-def format_signal_data(signals_data):
-    """Format signal data for consistent frontend display"""
-    formatted_signals = []
-    
-    for signal in signals_data:
+def iter_formatted_signals(signal_rows):
+    """Yield signal_performance rows (sqlite3.Row) formatted for the frontend, one row at a time"""
+    for signal in signal_rows:
         try:
             formatted_signal = {
-                'id': signal[0],
-                'symbol': signal[1] or 'N/A',
-                'signal_type': signal[2] or 'N/A',
-                'predicted_probability': float(signal[3]) if signal[3] is not None else 0.0,
-                'risk_level': signal[4] or 'N/A',
-                'timestamp': signal[5],
-                'actual_outcome': signal[6] if signal[6] is not None else None,
-                'profit_loss': float(signal[7]) if signal[7] is not None else 0.0,
-                'risky_play_outcome': signal[8] if signal[8] is not None else None,
+                'id': signal['id'],
+                'symbol': signal['symbol'] or 'N/A',
+                'signal_type': signal['signal_type'] or 'N/A',
+                'predicted_probability': float(signal['predicted_probability']) if signal['predicted_probability'] is not None else 0.0,
+                'risk_level': signal['risk_level'] or 'N/A',
+                'timestamp': signal['timestamp'],
+                'actual_outcome': signal['actual_outcome'],
+                'profit_loss': float(signal['profit_loss']) if signal['profit_loss'] is not None else 0.0,
+                'risky_play_outcome': signal['risky_play_outcome'],
                 'formatted_timestamp': None,
                 'outcome_text': 'Pending',
                 'outcome_class': 'text-warning'
@@ -229,13 +267,15 @@ def format_signal_data(signals_data):
                     formatted_signal['outcome_text'] = 'Loss'
                     formatted_signal['outcome_class'] = 'text-danger'
             
-            formatted_signals.append(formatted_signal)
+            yield formatted_signal
             
-        except Exception as e:
-            print(f"❌ Error formatting signal: {str(e)}")
+        except Exception:
+            logger.exception('Error formatting signal')
             continue
-    
-    return formatted_signals
+
+def format_signal_data(signals_data):
+    """Format signal data for consistent frontend display"""
+    return list(iter_formatted_signals(signals_data))
 
 def calculate_signal_stats():
     """Calculate comprehensive signal performance statistics"""
@@ -352,8 +392,8 @@ def calculate_signal_stats():
             'by_symbol': formatted_symbols
         }
         
-    except Exception as e:
-        print(f"❌ Error calculating signal stats: {str(e)}")
+    except Exception:
+        logger.exception('Error calculating signal stats')
         return {
             'total_signals': 0,
             'wins': 0,
@@ -398,8 +438,8 @@ def create_signal_notification(signal_data, signal_id=None):
         print(f"📡 Created signal notifications for {len(regular_users)} users")
         conn.close()
         
-    except Exception as e:
-        print(f"❌ Error creating signal notifications: {str(e)}")
+    except Exception:
+        logger.exception('Error creating signal notifications')
 
 # Load environment variables
 load_dotenv('../.env')
@@ -411,6 +451,28 @@ app.secret_key = 'bfi_signals_dashboard_2025'
 app.config['UPLOAD_FOLDER'] = 'uploads/charts'
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
 
+# Response compression (gzip/brotli) for HTML pages, JSON APIs and static assets
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'application/json', 'text/css', 'application/javascript']
+app.config['COMPRESS_LEVEL'] = 5
+if COMPRESS_AVAILABLE:
+    Compress(app)
+
+# Fast JSON responses for the hot signal/agent endpoints (orjson when installed, Flask's encoder otherwise)
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC) if ORJSON_AVAILABLE else 0
+
+def dumps_json(obj):
+    """Serialize obj to a JSON body, falling back to Flask's encoder for types orjson rejects"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return app.json.dumps(obj)
+
+def ojsonify(obj, status=200):
+    """jsonify replacement that serializes with orjson and wraps the bytes in a Response"""
+    return Response(dumps_json(obj), status=status, mimetype='application/json')
+
 # Ensure favicon files are available in static folder
 def ensure_favicons():
     """Copy favicon files from assets to static folder if needed"""
@@ -418,7 +480,6 @@ def ensure_favicons():
     static_path = app.static_folder or 'static'
     
     if os.path.exists(assets_favicon_path) and static_path:
-        import shutil
         favicon_files = ['favicon.ico', 'favicon-16x16.png', 'favicon-32x32.png']
         for favicon_file in favicon_files:
             src_path = os.path.join(assets_favicon_path, favicon_file)
@@ -429,37 +490,60 @@ def ensure_favicons():
                 except:
                     pass  # Silently ignore copy errors
 
+# Template/static directories are created once at import (exist_ok avoids the exists-then-create race)
+os.makedirs(os.path.join(app.root_path, 'templates'), exist_ok=True)
+os.makedirs(os.path.join(app.root_path, 'static'), exist_ok=True)
 ensure_favicons()
 
+# Market close schedule runs on GMT+2
+MARKET_CLOSE_TZ = pytz.timezone('Africa/Cairo')
+
 # Initialize AI components
 ai_engine = AIEngine()
 ai_manager = AIManager()
 
+# Columns added to signal_performance after its original schema (ai_engine creates the base table)
+SIGNAL_PERFORMANCE_MIGRATIONS = (
+    ('risky_play_outcome', 'INTEGER'),
+    ('manual', 'INTEGER DEFAULT 0'),
+    ('entry_price', 'REAL'),
+    ('take_profit', 'REAL'),
+    ('stop_loss', 'REAL'),
+    ('bias', 'TEXT'),
+    ('net_change', 'REAL'),
+)
+
+def migrate_signal_performance_schema():
+    """Add late columns once at startup so request handlers never run DDL or branch on the schema"""
+    conn = get_db_connection()
+    for column_name, column_type in SIGNAL_PERFORMANCE_MIGRATIONS:
+        try:
+            conn.execute(f'ALTER TABLE signal_performance ADD COLUMN {column_name} {column_type}')
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Column already exists
+            pass
+
+migrate_signal_performance_schema()
+
+def ensure_notification_indexes():
+    """Partial index over unread notifications so mark-all-read touches only unread rows"""
+    try:
+        conn = get_db_connection()
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_un_user_unread ON user_notifications(user_id) WHERE is_read = 0')
+        conn.commit()
+    except sqlite3.OperationalError:
+        # user_notifications lives in Supabase unless a local table has been created
+        pass
+
+ensure_notification_indexes()
+
 def sync_json_signals_to_db():
     """Load signals from JSON files and sync them to SQLite database"""
     try:
         conn = sqlite3.connect("ai_learning.db")
         cursor = conn.cursor()
         
-        # Add missing columns to existing table if needed
-        columns_to_add = [
-            ('entry_price', 'REAL'),
-            ('take_profit', 'REAL'),
-            ('stop_loss', 'REAL'),
-            ('bias', 'TEXT'),
-            ('net_change', 'REAL')
-        ]
-        
-        for column_name, column_type in columns_to_add:
-            try:
-                cursor.execute(f'ALTER TABLE signal_performance ADD COLUMN {column_name} {column_type}')
-            except sqlite3.OperationalError as e:
-                if "duplicate column name" in str(e):
-                    # Column already exists
-                    pass
-                else:
-                    raise
-        
         # Get existing signal timestamps to avoid duplicates
         cursor.execute('SELECT timestamp FROM signal_performance')
         existing_timestamps = set(row[0] for row in cursor.fetchall())
@@ -511,13 +595,17 @@ def sync_json_signals_to_db():
         
         conn.commit()
         conn.close()
+        invalidate_signals_views()
         print("✅ Signal sync completed successfully")
         return True
         
-    except Exception as e:
-        print(f"❌ Error syncing signals: {e}")
+    except Exception:
+        logger.exception('Error syncing signals')
         return False
 
+# Read buffer for market_data.pkl - pickle.load issues many small reads, so coalesce them
+PICKLE_READ_BUFFER_SIZE = 1 << 20
+
 # Market Data Storage System
 class MarketDataStorage:
     def __init__(self, file_path='market_data.pkl'):
@@ -528,7 +616,7 @@ class MarketDataStorage:
         """Load market data from file"""
         try:
             if os.path.exists(self.file_path):
-                with open(self.file_path, 'rb') as f:
+                with open(self.file_path, 'rb', buffering=PICKLE_READ_BUFFER_SIZE) as f:
                     return pickle.load(f)
             else:
                 return {
@@ -761,8 +849,8 @@ def api_register():
                         print(f"⚠️ Failed to send verification email to {email}")
                 else:
                     print("⚠️ No verification token generated")
-            except Exception as e:
-                print(f"❌ Email sending error: {e}")
+            except Exception:
+                logger.exception('Email sending error')
             
             return jsonify({
                 'success': True,
@@ -1082,14 +1170,19 @@ def api_add_outcome():
     """API endpoint to add trading outcome"""
     try:
         signal_id = request.form.get('signal_id')
-        outcome = request.form.get('outcome') == 'true'
-        profit_loss = float(request.form.get('profit_loss', 0))
-        
         if not signal_id:
             return jsonify({'error': 'Signal ID required'})
+        try:
+            signal_id = int(signal_id)
+        except ValueError:
+            return jsonify({'error': 'Signal ID must be an integer'})
+        
+        outcome = request.form.get('outcome') == 'true'
+        profit_loss = float(request.form.get('profit_loss', 0))
         
         # Add outcome using AI manager
         ai_engine.learn_from_outcome(signal_id, outcome, profit_loss)
+        invalidate_signal_cache(signal_id)
         
         return jsonify({'success': True, 'message': 'Trading outcome added successfully!'})
         
@@ -1110,6 +1203,7 @@ def api_manual_outcome():
         
         # Add manual outcome - ensure symbol and signal_type are not None
         ai_manager.add_manual_outcome(symbol, signal_type, outcome, profit_loss)
+        invalidate_signal_cache()  # the updated signal id isn't known here
         
         return jsonify({'success': True, 'message': 'Manual trading outcome added successfully!'})
         
@@ -1121,7 +1215,7 @@ def api_manual_outcome():
 def signals():
     """Enhanced signals history page with modern UI"""
     try:
-        conn = sqlite3.connect("ai_learning.db")
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         # Get all signals with pagination
@@ -1129,41 +1223,19 @@ def signals():
         per_page = 20
         offset = (page - 1) * per_page
         
-        # Ensure risky_play_outcome column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN risky_play_outcome INTEGER')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
-        # Check if risky_play_outcome column exists
-        cursor.execute('PRAGMA table_info(signal_performance)')
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'risky_play_outcome' in columns:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, risky_play_outcome
-                FROM signal_performance 
-                ORDER BY timestamp DESC 
-                LIMIT ? OFFSET ?
-            ''', (per_page, offset))
-        else:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, NULL as risky_play_outcome
-                FROM signal_performance 
-                ORDER BY timestamp DESC 
-                LIMIT ? OFFSET ?
-            ''', (per_page, offset))
+        cursor.execute('''
+            SELECT id, symbol, signal_type, predicted_probability, risk_level, 
+                   timestamp, actual_outcome, profit_loss, risky_play_outcome
+            FROM signal_performance 
+            ORDER BY timestamp DESC 
+            LIMIT ? OFFSET ?
+        ''', (per_page, offset))
         signals_data = cursor.fetchall()
         
         # Get total count for pagination
         cursor.execute('SELECT COUNT(*) FROM signal_performance')
         total_signals = cursor.fetchone()[0]
         
-        conn.close()
-        
         # Format signals data using helper function
         formatted_signals = format_signal_data(signals_data)
         
@@ -1185,7 +1257,7 @@ def signals():
                              total_signals=total_signals)
         
     except Exception as e:
-        print(f"❌ Error loading signals page: {str(e)}")
+        logger.exception('Error loading signals page')
         return render_template('signals_modern.html', 
                              error=f"Error loading signals: {e}",
                              signals=[],
@@ -1308,9 +1380,7 @@ def journal():
                              debug_info={'manual_journal': True})
         
     except Exception as e:
-        print(f"❌ Error in journal route: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Error in journal route')
         return render_template('journal_modern.html', 
                              error=f"Error loading journal data: {e}",
                              overall_stats=(0, 0, 0, 0, 0, 0, 0, 0),
@@ -1760,7 +1830,7 @@ def api_dashboard_data():
         })
         
     except Exception as e:
-        print(f"❌ Dashboard data error: {str(e)}")
+        logger.exception('Dashboard data error')
         return jsonify({
             'success': False,
             'error': f'Dashboard data error: {str(e)}'
@@ -1780,7 +1850,7 @@ def api_live_market_data():
         })
         
     except Exception as e:
-        print(f"❌ Live market data error: {str(e)}")
+        logger.exception('Live market data error')
         return jsonify({
             'success': False,
             'error': f'Live market data error: {str(e)}'
@@ -1800,7 +1870,7 @@ def api_market_data():
         })
         
     except Exception as e:
-        print(f"❌ Market data error: {str(e)}")
+        logger.exception('Market data error')
         return jsonify({
             'success': False,
             'error': f'Market data error: {str(e)}'
@@ -1846,7 +1916,7 @@ def api_send_discord_signal():
             })
             
     except Exception as e:
-        print(f"❌ Discord signal posting error: {str(e)}")
+        logger.exception('Discord signal posting error')
         return jsonify({
             'success': False,
             'error': f'Server error: {str(e)}'
@@ -1859,41 +1929,14 @@ def track_signals():
         conn = sqlite3.connect("ai_learning.db")
         cursor = conn.cursor()
         
-        # Ensure risky_play_outcome and manual columns exist
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN risky_play_outcome INTEGER')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN manual INTEGER DEFAULT 0')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
-        # Check if risky_play_outcome column exists
-        cursor.execute('PRAGMA table_info(signal_performance)')
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'risky_play_outcome' in columns:
-            cursor.execute('''
-                SELECT 
-                    id, symbol, signal_type, predicted_probability, risk_level, 
-                    timestamp, actual_outcome, risky_play_outcome, COALESCE(manual, 0) as manual
-                FROM signal_performance 
-                ORDER BY timestamp DESC
-                LIMIT 100
-            ''')
-        else:
-            cursor.execute('''
-                SELECT 
-                    id, symbol, signal_type, predicted_probability, risk_level, 
-                    timestamp, actual_outcome, NULL as risky_play_outcome, COALESCE(manual, 0) as manual
-                FROM signal_performance 
-                ORDER BY timestamp DESC
-                LIMIT 100
-            ''')
+        cursor.execute('''
+            SELECT 
+                id, symbol, signal_type, predicted_probability, risk_level, 
+                timestamp, actual_outcome, risky_play_outcome, COALESCE(manual, 0) as manual
+            FROM signal_performance 
+            ORDER BY timestamp DESC
+            LIMIT 100
+        ''')
         all_signals = cursor.fetchall()
         
         # Split signals into daily (auto-generated) and manual based on manual flag
@@ -1914,8 +1957,8 @@ def track_signals():
         return render_template('track_signals_modern.html', 
                              daily_signals=daily_signals,
                              manual_signals=manual_signals)
-    except Exception as e:
-        print(f"❌ Error loading track signals page: {str(e)}")
+    except Exception:
+        logger.exception('Error loading track signals page')
         return render_template('track_signals_modern.html', 
                              daily_signals=[],
                              manual_signals=[])
@@ -1974,13 +2017,6 @@ def api_auto_generate_signal():
         conn = sqlite3.connect("ai_learning.db")
         cursor = conn.cursor()
         
-        # Ensure manual column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN manual INTEGER DEFAULT 0')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
         cursor.execute('''
             INSERT INTO signal_performance 
             (symbol, signal_type, predicted_probability, risk_level, timestamp, manual)
@@ -1995,6 +2031,7 @@ def api_auto_generate_signal():
         ))
         conn.commit()
         conn.close()
+        invalidate_signals_views()
         
         # Create notifications for regular users
         create_signal_notification(signal)
@@ -2007,8 +2044,7 @@ def api_auto_generate_signal():
         })
         
     except Exception as e:
-        print(f"❌ Error in auto signal generation: {str(e)}")
-        traceback.print_exc()
+        logger.exception('Error in auto signal generation')
         return jsonify({'error': f'Error generating signal: {str(e)}'})
 
 @app.route('/api/fetch_market_data', methods=['POST'])
@@ -2080,8 +2116,7 @@ def api_fetch_market_data():
         })
         
     except Exception as e:
-        print(f"❌ Error fetching market data: {str(e)}")
-        traceback.print_exc()
+        logger.exception('Error fetching market data')
         return jsonify({'error': f'Error fetching market data: {str(e)}'})
 
 @app.route('/api/semi_auto_generate_signal', methods=['POST'])
@@ -2166,13 +2201,6 @@ def api_semi_auto_generate_signal():
         conn = sqlite3.connect("ai_learning.db")
         cursor = conn.cursor()
         
-        # Ensure manual column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN manual INTEGER DEFAULT 0')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
         cursor.execute('''
             INSERT INTO signal_performance 
             (symbol, signal_type, predicted_probability, risk_level, timestamp, manual)
@@ -2187,6 +2215,7 @@ def api_semi_auto_generate_signal():
         ))
         conn.commit()
         conn.close()
+        invalidate_signals_views()
         
         # Create notifications for regular users if posted to Discord
         if discord_success:
@@ -2200,8 +2229,7 @@ def api_semi_auto_generate_signal():
         })
         
     except Exception as e:
-        print(f"❌ Error in semi-auto signal generation: {str(e)}")
-        traceback.print_exc()
+        logger.exception('Error in semi-auto signal generation')
         return jsonify({'error': f'Error generating signal: {str(e)}'})
 
 @app.route('/api/manual_generate_signal', methods=['POST'])
@@ -2292,13 +2320,6 @@ def api_manual_generate_signal():
         conn = sqlite3.connect("ai_learning.db")
         cursor = conn.cursor()
         
-        # Ensure manual column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN manual INTEGER DEFAULT 0')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
         cursor.execute('''
             INSERT INTO signal_performance 
             (symbol, signal_type, predicted_probability, risk_level, timestamp, manual)
@@ -2313,6 +2334,7 @@ def api_manual_generate_signal():
         ))
         conn.commit()
         conn.close()
+        invalidate_signals_views()
         
         # Create notifications for regular users
         create_signal_notification(signal)
@@ -2325,8 +2347,7 @@ def api_manual_generate_signal():
         })
         
     except Exception as e:
-        print(f"❌ Error in manual signal generation: {str(e)}")
-        traceback.print_exc()
+        logger.exception('Error in manual signal generation')
         return jsonify({'error': f'Error creating manual signal: {str(e)}'})
 
 @app.route('/api/delete_signal/<int:signal_id>', methods=['DELETE'])
@@ -2347,10 +2368,11 @@ def api_delete_signal(signal_id):
         cursor.execute('DELETE FROM signal_performance WHERE id = ?', (signal_id,))
         conn.commit()
         conn.close()
+        invalidate_signal_cache(signal_id)
         
         return jsonify({'success': True, 'message': 'Signal deleted successfully!'})
     except Exception as e:
-        print(f"❌ Error deleting signal: {str(e)}")
+        logger.exception('Error deleting signal')
         return jsonify({'error': f'Error deleting signal: {str(e)}'})
 
 @app.route('/api/update_outcome', methods=['POST'])
@@ -2379,13 +2401,6 @@ def api_update_outcome():
         # 1 = Win, 0 = Loss, 2 = Breakeven
         outcome_value = int(outcome)
         
-        # First, ensure the risky_play_outcome column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN risky_play_outcome INTEGER')
-            conn.commit()
-        except sqlite3.OperationalError:
-            # Column already exists, that's fine
-            pass
         
         # Update based on type
         if outcome_type == 'main':
@@ -2405,13 +2420,14 @@ def api_update_outcome():
         
         conn.commit()
         conn.close()
+        invalidate_signal_cache(signal_id)
         
         outcome_text = {1: 'Win', 0: 'Loss', 2: 'Breakeven'}
         message = f'Signal outcome updated to {outcome_text.get(outcome_value, "Unknown")}'
         
         return jsonify({'success': True, 'message': message})
     except Exception as e:
-        print(f"❌ Error updating outcome: {str(e)}")
+        logger.exception('Error updating outcome')
         return jsonify({'error': f'Error updating outcome: {str(e)}'})
 
 @app.route('/api/clear_data', methods=['POST'])
@@ -2419,6 +2435,7 @@ def api_clear_data():
     """API endpoint to clear learning data"""
     try:
         ai_manager.clear_learning_data()
+        invalidate_signal_cache()
         return jsonify({'success': True, 'message': 'All learning data cleared successfully!'})
     except Exception as e:
         return jsonify({'error': f'Error clearing data: {str(e)}'})
@@ -2428,19 +2445,16 @@ def api_live_prices():
     """Get live market prices using enhanced data feed with multiple sources"""
     try:
         from datetime import datetime
-        import time
         from data_feed import enhanced_data_feed
         
         live_data = {}
         
-        # Get data for each symbol using enhanced data feed with spacing
+        # Fetch the indices up front in one batched request; gold goes to the web scraper first
+        feed_data = enhanced_data_feed.get_all_market_data(('nasdaq', 'dow'))
+        
         symbols = ['nasdaq', 'gold', 'dow']
-        for i, symbol_key in enumerate(symbols):
+        for symbol_key in symbols:
             try:
-                # Add spacing between requests to avoid rate limits
-                if i > 0:
-                    time.sleep(2)  # 2 second delay between symbol requests
-                
                 # Special handling for Gold - use web scraper for maximum accuracy
                 if symbol_key == 'gold':
                     gold_data_found = False
@@ -2455,11 +2469,9 @@ def api_live_prices():
                             market_data_storage.update_market_data(symbol_key, gold_data)
                             gold_data_found = True
                         else:
-                            print(f"❌ Web scraper returned None for Gold")
-                    except Exception as scraper_error:
-                        print(f"❌ Gold scraper error: {scraper_error}")
-                        import traceback
-                        traceback.print_exc()
+                            logger.warning('Web scraper returned None for Gold')
+                    except Exception:
+                        logger.exception('Gold scraper error')
                     
                     # Fallback to enhanced data feed if scraper failed
                     if not gold_data_found:
@@ -2472,12 +2484,12 @@ def api_live_prices():
                                 market_data_storage.update_market_data(symbol_key, formatted_data)
                                 print(f"✅ Got Gold data from enhanced data feed fallback")
                             else:
-                                print(f"❌ Enhanced data feed also failed for Gold")
-                        except Exception as fallback_error:
-                            print(f"❌ Enhanced data feed fallback error: {fallback_error}")
+                                logger.warning('Enhanced data feed also failed for Gold')
+                        except Exception:
+                            logger.exception('Enhanced data feed fallback error')
                 else:
                     # Use enhanced data feed for other symbols (NASDAQ, DOW)
-                    raw_data = enhanced_data_feed.get_market_data(symbol_key)
+                    raw_data = feed_data.get(symbol_key)
                     
                     if raw_data:
                         # Format the data for display
@@ -2503,10 +2515,10 @@ def api_live_prices():
                                 'high': '--',
                                 'low': '--'
                             }
-                            print(f"❌ No data available for {symbol_key}")
+                            logger.warning('No data available for %s', symbol_key)
                         
-            except Exception as e:
-                print(f"❌ Error fetching {symbol_key} data: {str(e)}")
+            except Exception:
+                logger.exception('Error fetching %s data', symbol_key)
                 # Use stored data if available
                 stored_data = market_data_storage.get_market_data(symbol_key)
                 if stored_data:
@@ -2522,7 +2534,7 @@ def api_live_prices():
                         'high': '--',
                         'low': '--'
                     }
-                    print(f"❌ No data available for {symbol_key}")
+                    logger.warning('No data available for %s', symbol_key)
         
         # Get connection status and last successful fetch times
         connection_status = enhanced_data_feed.get_connection_status()
@@ -2540,7 +2552,7 @@ def api_live_prices():
         })
         
     except Exception as e:
-        print(f"❌ Error in live prices API: {str(e)}")
+        logger.exception('Error in live prices API')
         # Return stored data as fallback
         return jsonify({
             'success': False,
@@ -2813,155 +2825,104 @@ def api_export_data():
     except Exception as e:
         return jsonify({'error': f'Error exporting data: {str(e)}'})
 
+# Rows shown per symbol on each page of the data feed history (newest first)
+DATA_FEED_HISTORY_PAGE_SIZE = 250
+
+def history_pagination(total_items, page=1):
+    """Pagination info for one data feed history table"""
+    total_pages = max(1, (total_items + DATA_FEED_HISTORY_PAGE_SIZE - 1) // DATA_FEED_HISTORY_PAGE_SIZE)
+    start_item = (page - 1) * DATA_FEED_HISTORY_PAGE_SIZE + 1
+    end_item = min(page * DATA_FEED_HISTORY_PAGE_SIZE, total_items)
+    return {
+        'total_items': total_items,
+        'total_pages': total_pages,
+        'current_page': page,
+        'has_prev': page > 1,
+        'has_next': page < total_pages,
+        'prev_page': page - 1 if page > 1 else None,
+        'next_page': page + 1 if page < total_pages else None,
+        'start_item': start_item if end_item >= start_item else 0,
+        'end_item': end_item if end_item >= start_item else 0
+    }
+
+EMPTY_HISTORY_PAGINATION = history_pagination(0)
+
 @app.route('/data_feed_history')
 def data_feed_history():
     """Data Feed History page showing historical market data"""
+    # Get latest market close data (previous day's data) for widgets
+    market_close_data = market_data_storage.get_latest_market_close_data()
+    
+    # Get date filter and page from query parameters
+    date_filter = request.args.get('date', '')
+    page = max(1, request.args.get('page', 1, type=int))
+    page_start = (page - 1) * DATA_FEED_HISTORY_PAGE_SIZE
+    
+    # Get historical data from storage
+    symbol_data = {
+        'nasdaq': [],
+        'gold': [],
+        'dow': []
+    }
+    symbol_totals = {symbol: 0 for symbol in symbol_data}
+    
+    # Load market data storage (open directly - a missing file just means no history yet)
     try:
-        # Get date filter from query parameters
-        date_filter = request.args.get('date', '')
-        
-        # Get historical data from storage
-        symbol_data = {
-            'nasdaq': [],
-            'gold': [],
-            'dow': []
-        }
-        
-        # Load market data storage
-        if os.path.exists('market_data.pkl'):
-            try:
-                with open('market_data.pkl', 'rb') as f:
-                    stored_data = pickle.load(f)
-                
-                # Process market close history data
-                if 'market_close_history' in stored_data:
-                    for symbol in stored_data['market_close_history']:
-                        for date, data in stored_data['market_close_history'][symbol].items():
-                            # Apply date filter if specified
-                            if date_filter and date != date_filter:
-                                continue
-                            
-                            symbol_data[symbol].append({
-                                'date': date,
-                                'current_value': data.get('price', '--'),
-                                'net_change': data.get('change', '--'),
-                                'previous_close': data.get('previousClose', '--'),
-                                'today_high': data.get('high', '--'),
-                                'today_low': data.get('low', '--'),
-                                'timestamp': data.get('timestamp', ''),
-                                'raw_change': data.get('rawChange', 0)
-                            })
-                
-                # Sort by date (newest first) for each symbol
-                for symbol in symbol_data:
-                    symbol_data[symbol].sort(key=lambda x: x['date'], reverse=True)
-                
-            except Exception as e:
-                print(f"Error loading historical data: {e}")
-        
-        # Create pagination info for the template
-        pagination_info = {
-            'nasdaq': {
-                'total_items': len(symbol_data['nasdaq']),
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 1 if len(symbol_data['nasdaq']) > 0 else 0,
-                'end_item': len(symbol_data['nasdaq'])
-            },
-            'dow': {
-                'total_items': len(symbol_data['dow']),
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 1 if len(symbol_data['dow']) > 0 else 0,
-                'end_item': len(symbol_data['dow'])
-            },
-            'gold': {
-                'total_items': len(symbol_data['gold']),
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 1 if len(symbol_data['gold']) > 0 else 0,
-                'end_item': len(symbol_data['gold'])
-            }
-        }
-        
-        # Get latest market close data (previous day's data) for widgets
-        market_close_data = market_data_storage.get_latest_market_close_data()
-        
-        return render_template('data_feed_history_modern.html', 
-                             symbol_data=symbol_data,
-                             date_filter=date_filter,
-                             pagination_info=pagination_info,
-                             market_close_data=market_close_data)
-                             
-    except Exception as e:
-        # Create empty pagination info for error case
-        pagination_info = {
-            'nasdaq': {
-                'total_items': 0,
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 0,
-                'end_item': 0
-            },
-            'dow': {
-                'total_items': 0,
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 0,
-                'end_item': 0
-            },
-            'gold': {
-                'total_items': 0,
-                'total_pages': 1,
-                'current_page': 1,
-                'has_prev': False,
-                'has_next': False,
-                'prev_page': None,
-                'next_page': None,
-                'start_item': 0,
-                'end_item': 0
-            }
-        }
-        
-        # Get market close data even in error case
-        try:
-            market_close_data = market_data_storage.get_latest_market_close_data()
-        except:
-            market_close_data = {'nasdaq': {}, 'dow': {}, 'gold': {}}
+        with open('market_data.pkl', 'rb', buffering=PICKLE_READ_BUFFER_SIZE) as f:
+            stored_data = pickle.load(f)
+        
+        # Process market close history data, newest first
+        for symbol, history in stored_data.get('market_close_history', {}).items():
+            if date_filter:
+                # Dates are the dict keys, so a filter is a direct lookup
+                rows = [(date_filter, history[date_filter])] if date_filter in history else []
+                symbol_totals[symbol] = len(rows)
+                rows = rows[page_start:page_start + DATA_FEED_HISTORY_PAGE_SIZE]
+            else:
+                # Only the rows up to the end of the requested page are needed - select them without sorting everything
+                rows = heapq.nlargest(page * DATA_FEED_HISTORY_PAGE_SIZE, history.items(), key=lambda kv: kv[0])[page_start:]
+                symbol_totals[symbol] = len(history)
+            
+            symbol_data[symbol] = [{
+                'date': date,
+                'current_value': data.get('price', '--'),
+                'net_change': data.get('change', '--'),
+                'previous_close': data.get('previousClose', '--'),
+                'today_high': data.get('high', '--'),
+                'today_low': data.get('low', '--'),
+                'timestamp': data.get('timestamp', ''),
+                'raw_change': data.get('rawChange', 0)
+            } for date, data in rows]
         
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, KeyError, AttributeError, OSError) as e:
+        logger.exception('Error loading historical data')
         return render_template('data_feed_history_modern.html', 
                              symbol_data={'nasdaq': [], 'gold': [], 'dow': []},
                              date_filter='',
-                             pagination_info=pagination_info,
+                             pagination_info={symbol: EMPTY_HISTORY_PAGINATION for symbol in ('nasdaq', 'dow', 'gold')},
                              market_close_data=market_close_data,
                              error=f"Error loading data feed history: {e}")
+    
+    # Create pagination info for the template
+    pagination_info = {
+        symbol: history_pagination(symbol_totals[symbol], page)
+        for symbol in ('nasdaq', 'dow', 'gold')
+    }
+    
+    return render_template('data_feed_history_modern.html', 
+                         symbol_data=symbol_data,
+                         date_filter=date_filter,
+                         pagination_info=pagination_info,
+                         market_close_data=market_close_data)
+
+# Trading day the Hybrid Math level cache was last used for
+auto_signal_cache_date = None
 
 def generate_auto_signal_for_next_day():
     """Generate signal automatically for the next trading day using market close data"""
     try:
-        from datetime import datetime, timedelta
-        import random
-        
         # Check if auto generation is enabled
         if not market_data_storage.is_auto_generation_enabled():
             print("⏸️ Auto signal generation is disabled")
@@ -2987,6 +2948,12 @@ def generate_auto_signal_for_next_day():
         next_trading_day = current_date.strftime('%Y-%m-%d')
         print(f"📅 Generating signals for: {next_trading_day}")
         
+        # Start each trading day with an empty Hybrid Math cache
+        global auto_signal_cache_date
+        if auto_signal_cache_date != next_trading_day:
+            compute_hybrid_math_levels.cache_clear()
+            auto_signal_cache_date = next_trading_day
+        
         # Generate signals for available instruments
         signals_generated = []
         instruments = ['NASDAQ', 'DOW', 'GOLD']
@@ -2999,31 +2966,141 @@ def generate_auto_signal_for_next_day():
                     signals_generated.append(signal)
                     print(f"✅ Generated {instrument} signal for {next_trading_day}")
         
-        if signals_generated:
-            print(f"🎯 Successfully generated {len(signals_generated)} signals for {next_trading_day}")
+        # Convert each signal to the post_signal/JSON dict format once; Discord, notifications and the caller share it
+        signal_dicts = [asdict(signal) for signal in signals_generated]
+        
+        if signal_dicts:
+            print(f"🎯 Successfully generated {len(signal_dicts)} signals for {next_trading_day}")
             
-            # Send signals to Discord
-            for signal in signals_generated:
-                try:
-                    print(f"📤 Posting {signal['instrument']} signal to Discord...")
-                    discord_success = post_signal(signal)
-                    if discord_success:
-                        print(f"✅ {signal['instrument']} signal posted to Discord successfully")
+            # Send signals to Discord concurrently (each post is a blocking HTTPS call)
+            with ThreadPoolExecutor(max_workers=len(signal_dicts)) as executor:
+                futures = {executor.submit(post_signal_to_discord, signal_data): signal_data for signal_data in signal_dicts}
+                for future in as_completed(futures):
+                    if future.result():
                         # Create notifications for regular users
-                        create_signal_notification(signal)
-                    else:
-                        print(f"❌ Failed to post {signal['instrument']} signal to Discord")
-                except Exception as e:
-                    print(f"❌ Error posting {signal['instrument']} signal to Discord: {e}")
+                        create_signal_notification(futures[future])
         else:
             print("❌ No signals generated - insufficient market data")
             
-        return signals_generated
+        return signal_dicts
         
-    except Exception as e:
-        print(f"❌ Error in auto signal generation: {e}")
+    except Exception:
+        logger.exception('Error in auto signal generation')
         return []
 
+def post_signal_to_discord(signal_data):
+    """Post a single auto-generated signal (post_signal dict format) to Discord, returning True on success"""
+    instrument = signal_data['instrument']
+    try:
+        print(f"📤 Posting {instrument} signal to Discord...")
+        if post_signal(signal_data):
+            print(f"✅ {instrument} signal posted to Discord successfully")
+            return True
+        logger.warning('Failed to post %s signal to Discord', instrument)
+    except Exception:
+        logger.exception('Error posting %s signal to Discord', instrument)
+    return False
+
+# Display symbol and stop loss distance (points) per auto-signal instrument
+AUTO_SIGNAL_SYMBOLS = {
+    'NASDAQ': 'NAS100',
+    'DOW': 'US30',
+    'GOLD': 'XAUUSD'
+}
+AUTO_SIGNAL_STOP_LOSS_POINTS = {
+    'NASDAQ': 75,
+    'DOW': 100,
+    'GOLD': 10
+}
+
+@dataclass
+class AutoSignal:
+    """Auto-generated Hybrid Math signal (field names match the post_signal dict format)"""
+    # Required fields for post_signal
+    symbol: str
+    display_name: str
+    instrument: str
+    direction: str
+    bias: str
+    entry_price: float
+    entry1: float
+    take_profit: float
+    tp1: float
+    stop_loss: float
+    sl_tight: float
+    confidence: int
+    probability_percentage: float
+    probability_label: str
+    
+    # Market data fields
+    current_value: float
+    net_change: float
+    change_percent: float
+    previous_close: float
+    high: float
+    low: float
+    today_high: float
+    today_low: float
+    cv_position: float
+    
+    # Metadata
+    timestamp: str
+    strategy: str
+    auto_generated: bool
+    signal_date: str
+    market_data_date: str
+    risk_level: str
+    sentiment: str
+    sentiment_score: float
+    news_count: int
+    
+    # Slotted instances (no per-signal __dict__); works on Python 3.8 since no field has a default
+    __slots__ = tuple(__annotations__)
+
+@lru_cache(maxsize=256)
+def compute_hybrid_math_levels(instrument, current_value, raw_change, high, low, change_percent):
+    """Deterministic Hybrid Math core: (bias, direction, cv_position, probability, risk_level, take_profit, stop_loss)"""
+    # Determine bias based on net change and price position
+    bias = 'LONG' if raw_change > 0 else 'SHORT'
+    direction = 'BUY' if bias == 'LONG' else 'SELL'
+    
+    # Calculate position within daily range
+    if high != low:
+        cv_position = (current_value - low) / (high - low)
+    else:
+        cv_position = 0.5
+    
+    # Calculate probability based on change magnitude and position
+    change_magnitude = abs(change_percent)
+    base_probability = 0.65  # Base probability
+    
+    # Adjust probability based on factors
+    if change_magnitude > 1.0:
+        base_probability += 0.15  # Strong move
+    if cv_position > 0.7 or cv_position < 0.3:
+        base_probability += 0.10  # At extremes
+    
+    probability = min(base_probability, 0.95)  # Cap at 95%
+    
+    # Determine risk level
+    if change_magnitude > 2.0:
+        risk_level = 'HIGH'
+    elif change_magnitude > 1.0:
+        risk_level = 'MEDIUM'
+    else:
+        risk_level = 'LOW'
+    
+    # Calculate take profit (CV + Net Change for LONG, CV - Net Change for SHORT)
+    stop_loss_points = AUTO_SIGNAL_STOP_LOSS_POINTS.get(instrument, 10)
+    if bias == 'LONG':
+        take_profit = current_value + abs(raw_change)
+        stop_loss = current_value - stop_loss_points
+    else:
+        take_profit = current_value - abs(raw_change)
+        stop_loss = current_value + stop_loss_points
+    
+    return bias, direction, cv_position, probability, risk_level, take_profit, stop_loss
+
 def create_hybrid_math_auto_signal(instrument, market_data, signal_date):
     """Create a hybrid math signal using market close data for specified date"""
     try:
@@ -3038,120 +3115,174 @@ def create_hybrid_math_auto_signal(instrument, market_data, signal_date):
         if current_value == 0 or previous_close == 0:
             return None
         
-        # Hybrid Math Strategy Logic
-        # Determine bias based on net change and price position
-        bias = 'LONG' if raw_change > 0 else 'SHORT'
-        direction = 'BUY' if bias == 'LONG' else 'SELL'
-        
-        # Calculate position within daily range
-        if high != low:
-            cv_position = (current_value - low) / (high - low)
-        else:
-            cv_position = 0.5
-        
-        # Calculate probability based on change magnitude and position
-        change_magnitude = abs(change_percent)
-        base_probability = 0.65  # Base probability
-        
-        # Adjust probability based on factors
-        if change_magnitude > 1.0:
-            base_probability += 0.15  # Strong move
-        if cv_position > 0.7 or cv_position < 0.3:
-            base_probability += 0.10  # At extremes
-        
-        probability = min(base_probability, 0.95)  # Cap at 95%
-        
-        # Determine risk level
-        if change_magnitude > 2.0:
-            risk_level = 'HIGH'
-        elif change_magnitude > 1.0:
-            risk_level = 'MEDIUM'
-        else:
-            risk_level = 'LOW'
+        # Hybrid Math Strategy Logic (cached - same close data always gives the same levels)
+        bias, direction, cv_position, probability, risk_level, take_profit, stop_loss = compute_hybrid_math_levels(
+            instrument, current_value, raw_change, high, low, change_percent
+        )
         
         # Calculate entry points and targets using Hybrid Math Strategy
         entry_price = current_value
         
-        # Calculate take profit (CV + Net Change for LONG, CV - Net Change for SHORT)
-        if bias == 'LONG':
-            take_profit = current_value + abs(raw_change)
-            stop_loss = current_value - (75 if instrument == 'NASDAQ' else 100 if instrument == 'DOW' else 10)
-        else:
-            take_profit = current_value - abs(raw_change)
-            stop_loss = current_value + (75 if instrument == 'NASDAQ' else 100 if instrument == 'DOW' else 10)
-        
         # Map instrument to display symbol
-        symbol_map = {
-            'NASDAQ': 'NAS100',
-            'DOW': 'US30',
-            'GOLD': 'XAUUSD'
-        }
+        symbol = AUTO_SIGNAL_SYMBOLS.get(instrument, instrument)
         
         # Create signal object compatible with post_signal function
-        signal = {
+        signal = AutoSignal(
             # Required fields for post_signal
-            'symbol': symbol_map.get(instrument, instrument),
-            'display_name': symbol_map.get(instrument, instrument),
-            'instrument': instrument,
-            'direction': direction,
-            'bias': bias,
-            'entry_price': entry_price,
-            'entry1': entry_price,
-            'take_profit': take_profit,
-            'tp1': take_profit,
-            'stop_loss': stop_loss,
-            'sl_tight': stop_loss,
-            'confidence': int(probability * 100),
-            'probability_percentage': probability * 100,
-            'probability_label': 'High' if probability > 0.8 else 'Medium' if probability > 0.65 else 'Low',
+            symbol=symbol,
+            display_name=symbol,
+            instrument=instrument,
+            direction=direction,
+            bias=bias,
+            entry_price=entry_price,
+            entry1=entry_price,
+            take_profit=take_profit,
+            tp1=take_profit,
+            stop_loss=stop_loss,
+            sl_tight=stop_loss,
+            confidence=int(probability * 100),
+            probability_percentage=probability * 100,
+            probability_label='High' if probability > 0.8 else 'Medium' if probability > 0.65 else 'Low',
             
             # Market data fields
-            'current_value': current_value,
-            'net_change': raw_change,
-            'change_percent': change_percent,
-            'previous_close': previous_close,
-            'high': high,
-            'low': low,
-            'today_high': high,
-            'today_low': low,
-            'cv_position': cv_position,
+            current_value=current_value,
+            net_change=raw_change,
+            change_percent=change_percent,
+            previous_close=previous_close,
+            high=high,
+            low=low,
+            today_high=high,
+            today_low=low,
+            cv_position=cv_position,
             
             # Metadata
-            'timestamp': datetime.now().isoformat(),
-            'strategy': 'Hybrid Math Strategy',
-            'auto_generated': True,
-            'signal_date': signal_date,
-            'market_data_date': market_data.get('date', ''),
-            'risk_level': risk_level,
-            'sentiment': 'Neutral',
-            'sentiment_score': 0.5,
-            'news_count': 0
-        }
+            timestamp=datetime.now().isoformat(),
+            strategy='Hybrid Math Strategy',
+            auto_generated=True,
+            signal_date=signal_date,
+            market_data_date=market_data.get('date', ''),
+            risk_level=risk_level,
+            sentiment='Neutral',
+            sentiment_score=0.5,
+            news_count=0
+        )
         
         return signal
         
-    except Exception as e:
-        print(f"❌ Error creating signal for {instrument}: {e}")
+    except Exception:
+        logger.exception('Error creating signal for %s', instrument)
         return None
 
+# Background executor for auto signal generation so requests don't block on Discord/disk I/O.
+# One worker: two overlapping runs would store and post every signal twice
+auto_signal_executor = ThreadPoolExecutor(max_workers=1)
+
+# Job state lives in SQLite so a poll can be answered by any worker process; jobs older than this are dropped
+AUTO_SIGNAL_JOB_TTL = 30 * 60
+
+def ensure_auto_signal_jobs_table():
+    """Table of background auto signal generation jobs, shared by every worker process"""
+    conn = get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS auto_signal_jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            result TEXT,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.commit()
+
+ensure_auto_signal_jobs_table()
+
+def run_auto_signal_job(job_id):
+    """Run auto signal generation and record its outcome for the status endpoint"""
+    try:
+        signals = generate_auto_signal_for_next_day() or []
+        status = 'done'
+        result = {
+            'signals_generated': len(signals),
+            'signals': signals,
+            'message': f'Generated {len(signals)} signals for next trading day'
+        }
+    except Exception as e:
+        logger.exception('Auto signal job %s failed', job_id)
+        status = 'failed'
+        result = {'error': str(e)}
+    
+    conn = get_db_connection()
+    conn.execute('UPDATE auto_signal_jobs SET status = ?, result = ? WHERE job_id = ?',
+                 (status, json.dumps(result, default=str), job_id))
+    conn.commit()
+
 @app.route('/api/generate_auto_signal', methods=['POST'])
 @admin_required
 def api_generate_auto_signal():
-    """API endpoint to manually trigger auto signal generation"""
+    """API endpoint to manually trigger auto signal generation (runs in the background)"""
     try:
-        signals = generate_auto_signal_for_next_day()
+        now = time.time()
+        conn = get_db_connection()
+        # Take the write lock up front so two workers can't both see no running job and start one each
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Expire finished jobs nobody collected, and running ones whose process went away
+            conn.execute('DELETE FROM auto_signal_jobs WHERE created_at < ?', (now - AUTO_SIGNAL_JOB_TTL,))
+            running = conn.execute(
+                "SELECT job_id FROM auto_signal_jobs WHERE status = 'running' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if running is None:
+                job_id = uuid.uuid4().hex
+                conn.execute('INSERT INTO auto_signal_jobs (job_id, status, created_at) VALUES (?, ?, ?)',
+                             (job_id, 'running', now))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        if running is not None:
+            # A generation is already in flight; hand back its id instead of generating the signals twice
+            return jsonify({
+                'success': True,
+                'job_id': running['job_id'],
+                'status': 'running',
+                'message': 'Auto signal generation already in progress'
+            }), 202
+        
+        auto_signal_executor.submit(run_auto_signal_job, job_id)
         return jsonify({
             'success': True,
-            'signals_generated': len(signals),
-            'signals': signals,
-            'message': f'Generated {len(signals)} signals for next trading day'
-        })
+            'job_id': job_id,
+            'status': 'running',
+            'message': 'Auto signal generation started'
+        }), 202
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         })
 
+@app.route('/api/generate_auto_signal/<job_id>')
+@admin_required
+def api_generate_auto_signal_status(job_id):
+    """Poll the result of a background auto signal generation job"""
+    row = get_db_connection().execute(
+        'SELECT status, result FROM auto_signal_jobs WHERE job_id = ? AND created_at >= ?',
+        (job_id, time.time() - AUTO_SIGNAL_JOB_TTL)
+    ).fetchone()
+    if row is None:
+        return jsonify({'success': False, 'job_id': job_id, 'status': 'unknown', 'error': 'Unknown job id'}), 404
+    
+    if row['status'] == 'running':
+        return jsonify({'success': True, 'job_id': job_id, 'status': 'running'})
+    
+    # Finished jobs stay readable until they expire, so a repeated poll gets the same answer
+    return jsonify({
+        'success': row['status'] == 'done',
+        'job_id': job_id,
+        'status': row['status'],
+        **json.loads(row['result'])
+    })
+
 @app.route('/settings')
 def settings():
     """Settings configuration page"""
@@ -3175,7 +3306,7 @@ def settings():
 def api_test_journal_data():
     """Test endpoint to verify journal data is working"""
     try:
-        conn = sqlite3.connect("ai_learning.db")
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         # Test the same query as journal route
@@ -3189,15 +3320,8 @@ def api_test_journal_data():
             FROM signal_performance
         ''')
         overall_stats = cursor.fetchone()
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM signal_performance 
-            ORDER BY timestamp DESC 
-            LIMIT 20
-        ''')
-        signals_count = cursor.fetchone()[0]
-        
-        conn.close()
+        # The old separate "COUNT(*) ... LIMIT 20" limited the one aggregate row, not the count: it is the table total
+        signals_count = overall_stats[0]
         
         return jsonify({
             'success': True,
@@ -3220,22 +3344,98 @@ def api_test_journal_data():
 # AGENT MANAGEMENT ROUTES
 # =============================================================================
 
+# Serialized agents status shared by all polling dashboards for a short window
+AGENTS_STATUS_TTL = 0.5
+agents_status_cache = (0.0, None)
+agents_status_cache_lock = threading.Lock()
+
 @app.route('/api/agents/status')
 @login_required
 def get_agents_status():
     """Get status of all agents"""
+    global agents_status_cache
     try:
-        agents_status = agent_manager.get_all_agents_status()
-        return jsonify({
-            'success': True,
-            'agents': agents_status
-        })
+        with agents_status_cache_lock:
+            cached_at, body = agents_status_cache
+            if body is None or time.monotonic() - cached_at > AGENTS_STATUS_TTL:
+                agents_status = agent_manager.get_all_agents_status()
+                body = dumps_json({
+                    'success': True,
+                    'agents': agents_status
+                })
+                agents_status_cache = (time.monotonic(), body)
+        return Response(body, mimetype='application/json')
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         })
 
+# Agent task creation is handed to a single consumer thread so HTTP handlers return immediately.
+# The backlog is bounded: once it is full, handlers answer 503 instead of queueing without limit
+AGENT_TASK_QUEUE_SIZE = 256
+AGENT_TASK_QUEUE = queue.Queue(maxsize=AGENT_TASK_QUEUE_SIZE)
+AGENT_TASK_PRIORITY_RANGE = (1, 10)
+
+# Ids still waiting for the consumer, and consumer failures that couldn't be written to agent_tasks
+agent_tasks_queued = set()
+AGENT_TASK_FAILURES_SIZE = 1024
+agent_task_failures = OrderedDict()
+agent_task_state_lock = threading.Lock()
+
+def agent_task_consumer():
+    """Persist and submit queued agent tasks, recording any failure for the task status endpoint"""
+    while True:
+        task_kwargs = AGENT_TASK_QUEUE.get()
+        task_id = task_kwargs['task_id']
+        try:
+            agent_manager.create_task(**task_kwargs)
+        except Exception as e:
+            logger.exception('Error creating agent task %s', task_id)
+            try:
+                agent_manager.record_task_failure(task_id, task_kwargs['task_type'], task_kwargs['parameters'],
+                                                  task_kwargs['priority'], str(e))
+            except Exception:
+                logger.exception('Error recording failure of agent task %s', task_id)
+                with agent_task_state_lock:
+                    agent_task_failures[task_id] = str(e)
+                    if len(agent_task_failures) > AGENT_TASK_FAILURES_SIZE:
+                        agent_task_failures.popitem(last=False)
+        finally:
+            with agent_task_state_lock:
+                agent_tasks_queued.discard(task_id)
+
+threading.Thread(target=agent_task_consumer, name='agent-task-consumer', daemon=True).start()
+
+def enqueue_agent_task(agent_type, task_type, parameters, priority=5, tier=None):
+    """Queue an agent task for the consumer thread and return its pre-assigned id.
+    Raises queue.Full when the backlog is at AGENT_TASK_QUEUE_SIZE"""
+    task_id = str(uuid.uuid4())
+    with agent_task_state_lock:
+        agent_tasks_queued.add(task_id)
+    try:
+        AGENT_TASK_QUEUE.put_nowait({
+            'task_id': task_id,
+            'agent_type': agent_type,
+            'task_type': task_type,
+            'parameters': parameters,
+            'priority': priority,
+            'tier': tier
+        })
+    except queue.Full:
+        with agent_task_state_lock:
+            agent_tasks_queued.discard(task_id)
+        raise
+    return task_id
+
+def agent_queue_full_response():
+    """503 returned by the agent task endpoints while the consumer is AGENT_TASK_QUEUE_SIZE tasks behind"""
+    return jsonify({
+        'success': False,
+        'error': 'Agent task queue is full, try again shortly',
+        'queue_depth': AGENT_TASK_QUEUE.qsize()
+    }), 503
+
 @app.route('/api/agents/create_task', methods=['POST'])
 @login_required
 def create_agent_task():
@@ -3247,7 +3447,18 @@ def create_agent_task():
         parameters = data.get('parameters', {})
         priority = data.get('priority', 5)
         
-        task_id = agent_manager.create_task(
+        # Validate here: the consumer thread has no way to report a bad request back to the caller
+        if agent_type not in {t.value for t in AgentType}:
+            return jsonify({'success': False, 'error': f'Unknown agent type: {agent_type}'}), 400
+        if task_type not in TASK_TYPE_TIERS:
+            return jsonify({'success': False, 'error': f'Unknown task type: {task_type}'}), 400
+        low, high = AGENT_TASK_PRIORITY_RANGE
+        if not isinstance(priority, int) or isinstance(priority, bool) or not low <= priority <= high:
+            return jsonify({'success': False, 'error': f'Priority must be an integer from {low} to {high}'}), 400
+        if not isinstance(parameters, dict):
+            return jsonify({'success': False, 'error': 'Parameters must be an object'}), 400
+        
+        task_id = enqueue_agent_task(
             agent_type=agent_type,
             task_type=task_type,
             parameters=parameters,
@@ -3257,8 +3468,35 @@ def create_agent_task():
         return jsonify({
             'success': True,
             'task_id': task_id,
+            'queue_depth': AGENT_TASK_QUEUE.qsize(),
             'message': 'Task created successfully'
         })
+    except queue.Full:
+        return agent_queue_full_response()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/agents/task/<task_id>')
+@login_required
+def get_agent_task_status(task_id):
+    """Report a queued agent task's state, including failures in the consumer before it reached an agent"""
+    try:
+        with agent_task_state_lock:
+            queued = task_id in agent_tasks_queued
+            error = agent_task_failures.get(task_id)
+        
+        if queued:
+            return jsonify({'success': True, 'task': {'id': task_id, 'status': 'queued'}})
+        if error is not None:
+            return jsonify({'success': True, 'task': {'id': task_id, 'status': 'failed', 'error_message': error}})
+        
+        task = agent_manager.get_task(task_id)
+        if task is None:
+            return jsonify({'success': False, 'error': 'Unknown task id'}), 404
+        return jsonify({'success': True, 'task': task})
     except Exception as e:
         return jsonify({
             'success': False,
@@ -3299,21 +3537,25 @@ def analyze_signal_with_agent():
             })
         
         # Create task for signal analysis
-        task_id = agent_manager.create_task(
+        task_id = enqueue_agent_task(
             agent_type='signal_analyzer',
             task_type='analyze_signal',
             parameters={
                 'symbol': symbol,
                 'signal_data': signal_data
             },
-            priority=7
+            priority=7,
+            tier=TaskTier.SIGNAL
         )
         
         return jsonify({
             'success': True,
             'task_id': task_id,
+            'queue_depth': AGENT_TASK_QUEUE.qsize(),
             'message': f'Signal analysis initiated for {symbol}'
         })
+    except queue.Full:
+        return agent_queue_full_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -3330,21 +3572,25 @@ def monitor_market_with_agent():
         timeframe = data.get('timeframe', '1h')
         
         # Create task for market monitoring
-        task_id = agent_manager.create_task(
+        task_id = enqueue_agent_task(
             agent_type='market_monitor',
             task_type='monitor_market',
             parameters={
                 'symbols': symbols,
                 'timeframe': timeframe
             },
-            priority=6
+            priority=6,
+            tier=TaskTier.MARKET
         )
         
         return jsonify({
             'success': True,
             'task_id': task_id,
+            'queue_depth': AGENT_TASK_QUEUE.qsize(),
             'message': 'Market monitoring initiated'
         })
+    except queue.Full:
+        return agent_queue_full_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -3361,21 +3607,25 @@ def assess_risk_with_agent():
         new_position = data.get('new_position', {})
         
         # Create task for risk assessment
-        task_id = agent_manager.create_task(
+        task_id = enqueue_agent_task(
             agent_type='risk_assessor',
             task_type='assess_risk',
             parameters={
                 'portfolio': portfolio,
                 'new_position': new_position
             },
-            priority=8  # High priority for risk assessment
+            priority=8,
+            tier=TaskTier.RISK  # Risk assessment preempts every other tier
         )
         
         return jsonify({
             'success': True,
             'task_id': task_id,
+            'queue_depth': AGENT_TASK_QUEUE.qsize(),
             'message': 'Risk assessment initiated'
         })
+    except queue.Full:
+        return agent_queue_full_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -3387,53 +3637,85 @@ if __name__ == '__main__':
     print("📊 Dashboard will be available at: http://localhost:5000")
     print("🤖 Intelligent agents ready for interaction!")
     print("📈 Monitor your trading performance in real-time!")
+
+# Only one process may own the market close timer; gunicorn workers and the dev server race for this lock
+SCHEDULER_LOCK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scheduler.lock')
+# Seconds between lock attempts while another process (e.g. a worker being replaced on reload) holds it
+SCHEDULER_LOCK_RETRY = 60
+_scheduler_lock_file = None
+
+def acquire_scheduler_lock():
+    """Take an exclusive lock held until this process exits; False if another process already holds it"""
+    global _scheduler_lock_file
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on Windows, where the dashboard runs as a single dev server process
+        return True
+    lock_file = open(SCHEDULER_LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _scheduler_lock_file = lock_file
+    return True
+
+def start_scheduler():
+    """Arm the market close timer once this process holds the scheduler lock, retrying in the background.
+    Called by the server entry points (gunicorn post_worker_init, __main__), never on import"""
+    def wait_for_lock():
+        while not acquire_scheduler_lock():
+            time.sleep(SCHEDULER_LOCK_RETRY)
+        setup_scheduler()
     
-    # Create templates directory if it doesn't exist
-    import os
-    if not os.path.exists('templates'):
-        os.makedirs('templates')
-    if not os.path.exists('static'):
-        os.makedirs('static')
+    threading.Thread(target=wait_for_lock, name='scheduler-lock', daemon=True).start()
+
+def setup_scheduler():
+    """Setup scheduler for auto signal generation at market close"""
     
-    # Favicon files are handled by the ensure_favicons() function
+    def scheduled_auto_generation():
+        """Wrapper function for scheduled market data collection and auto signal generation"""
+        try:
+            print("⏰ Market close routine triggered at 23:05 GMT+2")
+            
+            # Step 1: Save market close data
+            print("💾 Collecting and saving market close data...")
+            market_data_storage.save_market_close_data()
+            print("✅ Market close data saved successfully")
+            
+            # Step 2: Generate signals for next day if auto generation is enabled
+            print("🤖 Checking auto signal generation...")
+            generate_auto_signal_for_next_day()
+            invalidate_signals_views()
+            
+        except Exception:
+            logger.exception('Error in scheduled market close routine')
     
-    # Setup scheduler for automatic signal generation
-    def setup_scheduler():
-        """Setup scheduler for auto signal generation at market close"""
-        gmt_plus_2 = pytz.timezone('Africa/Cairo')  # GMT+2 timezone
-        
-        def scheduled_auto_generation():
-            """Wrapper function for scheduled market data collection and auto signal generation"""
-            try:
-                print("⏰ Market close routine triggered at 23:05 GMT+2")
-                
-                # Step 1: Save market close data
-                print("💾 Collecting and saving market close data...")
-                market_data_storage.save_market_close_data()
-                print("✅ Market close data saved successfully")
-                
-                # Step 2: Generate signals for next day if auto generation is enabled
-                print("🤖 Checking auto signal generation...")
-                generate_auto_signal_for_next_day()
-                
-            except Exception as e:
-                print(f"❌ Error in scheduled market close routine: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # Schedule auto signal generation at 23:05 GMT+2 (market close)
-        schedule.every().day.at("23:05").do(scheduled_auto_generation)
-        
-        def run_scheduler():
-            """Run the scheduler in a separate thread"""
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        
-        # Start scheduler in background thread
-        scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-        scheduler_thread.start()
-        print("📅 Auto signal generation scheduler started (23:05 GMT+2)")
+    def seconds_until_market_close():
+        """Seconds from now until the next 23:05 GMT+2"""
+        now = datetime.now(MARKET_CLOSE_TZ)
+        next_run = MARKET_CLOSE_TZ.localize(datetime(now.year, now.month, now.day, 23, 5))
+        if next_run <= now:
+            next_run = MARKET_CLOSE_TZ.localize(datetime(now.year, now.month, now.day, 23, 5) + timedelta(days=1))
+        return (next_run - now).total_seconds()
+    
+    def schedule_next_run():
+        """Arm a one-shot timer for the next market close (no polling loop)"""
+        timer = threading.Timer(seconds_until_market_close(), run_and_reschedule)
+        timer.daemon = True
+        timer.start()
+    
+    def run_and_reschedule():
+        """Run the market close routine, then arm the timer for the next day"""
+        try:
+            scheduled_auto_generation()
+        finally:
+            schedule_next_run()
+    
+    # Schedule auto signal generation at 23:05 GMT+2 (market close)
+    schedule_next_run()
+    print("📅 Auto signal generation scheduler started (23:05 GMT+2)")
     
 @app.route('/api/logout', methods=['POST'])
 def api_logout():
@@ -3446,18 +3728,48 @@ def api_logout():
         session.clear()
         return jsonify({'success': True, 'message': 'Logged out successfully'})
         
-    except Exception as e:
-        print(f"❌ Error during logout: {str(e)}")
+    except Exception:
+        logger.exception('Error during logout')
         return jsonify({'success': False, 'error': 'Logout failed'})
 
 # Profile Management Routes
+
+# Process-wide profile cache (LRU + TTL) so the profile page, profile API and avatar share one DB read
+PROFILE_CACHE_SIZE = 4096
+PROFILE_CACHE_TTL = 30
+profile_cache = OrderedDict()
+profile_cache_lock = threading.Lock()
+
+def get_cached_user_profile(user_id):
+    """auth_manager.get_user_profile, memoized for PROFILE_CACHE_TTL seconds"""
+    now = time.monotonic()
+    with profile_cache_lock:
+        entry = profile_cache.get(user_id)
+        if entry is not None and now - entry[0] <= PROFILE_CACHE_TTL:
+            profile_cache.move_to_end(user_id)
+            return entry[1]
+    
+    profile = auth_manager.get_user_profile(user_id)
+    if profile is not None:
+        with profile_cache_lock:
+            profile_cache[user_id] = (now, profile)
+            profile_cache.move_to_end(user_id)
+            if len(profile_cache) > PROFILE_CACHE_SIZE:
+                profile_cache.popitem(last=False)
+    return profile
+
+def invalidate_profile(user_id):
+    """Drop a user's cached profile after it has been written"""
+    with profile_cache_lock:
+        profile_cache.pop(user_id, None)
+
 @app.route('/profile')
 @login_required
 def profile():
     """User profile page"""
     try:
         user_id = session.get('user_id')
-        user_profile = auth_manager.get_user_profile(user_id)
+        user_profile = get_cached_user_profile(user_id)
         
         if not user_profile:
             # If no profile found, create basic user data from session
@@ -3482,10 +3794,8 @@ def profile():
         
         return render_template('profile_modern.html', user=user_profile)
         
-    except Exception as e:
-        print(f"❌ Error loading profile page: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Error loading profile page')
         from datetime import datetime
         return render_template('profile_modern.html', user={
             'id': user_id,
@@ -3511,7 +3821,7 @@ def api_get_user_profile():
     """Get current user's profile"""
     try:
         user_id = session.get('user_id')
-        profile = auth_manager.get_user_profile(user_id)
+        profile = get_cached_user_profile(user_id)
         
         if profile:
             return jsonify({
@@ -3521,8 +3831,8 @@ def api_get_user_profile():
         else:
             return jsonify({'success': False, 'error': 'Profile not found'}), 404
             
-    except Exception as e:
-        print(f"❌ Error getting user profile: {str(e)}")
+    except Exception:
+        logger.exception('Error getting user profile')
         return jsonify({'success': False, 'error': 'Failed to get profile'}), 500
 
 @app.route('/api/user/profile', methods=['POST'])
@@ -3534,6 +3844,7 @@ def api_update_user_profile():
         profile_data = request.get_json()
         
         success = auth_manager.update_user_profile(user_id, profile_data)
+        invalidate_profile(user_id)
         
         if success:
             return jsonify({
@@ -3543,10 +3854,21 @@ def api_update_user_profile():
         else:
             return jsonify({'success': False, 'error': 'Failed to update profile'}), 400
             
-    except Exception as e:
-        print(f"❌ Error updating user profile: {str(e)}")
+    except Exception:
+        logger.exception('Error updating user profile')
         return jsonify({'success': False, 'error': 'Failed to update profile'}), 500
 
+# Chunk size used when streaming uploaded files to disk
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+PROFILE_PICTURE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+
+# Profile picture locations, resolved (and the upload directory created) once at import
+PROFILE_UPLOAD_DIR = os.path.join(app.root_path, 'uploads', 'profiles')
+os.makedirs(PROFILE_UPLOAD_DIR, exist_ok=True)
+DEFAULT_AVATAR_DIR = os.path.join(app.root_path, 'static', 'images')
+DEFAULT_AVATAR_FILENAME = 'default-avatar.svg'
+DEFAULT_AVATAR_AVAILABLE = os.path.exists(os.path.join(DEFAULT_AVATAR_DIR, DEFAULT_AVATAR_FILENAME))
+
 @app.route('/api/user/profile/picture', methods=['POST'])
 @login_required
 def api_upload_profile_picture():
@@ -3562,28 +3884,24 @@ def api_upload_profile_picture():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'}), 400
         
-        # Validate file type
-        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-        if not ('.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in allowed_extensions):
+        # Validate file type from the raw name (secure_filename turns '照片.png' into 'png'); the stored name is generated
+        file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+        if file_extension not in PROFILE_PICTURE_EXTENSIONS:
             return jsonify({'success': False, 'error': 'Invalid file type'}), 400
         
-        # Create uploads directory if it doesn't exist
-        uploads_dir = os.path.join(app.root_path, 'uploads', 'profiles')
-        os.makedirs(uploads_dir, exist_ok=True)
-        
         # Generate unique filename
-        import uuid
-        file_extension = file.filename.rsplit('.', 1)[1].lower()
-        filename = f"profile_{user_id}_{uuid.uuid4().hex[:8]}.{file_extension}"
-        file_path = os.path.join(uploads_dir, filename)
+        filename = f"profile_{user_id}_{secrets.token_hex(4)}.{file_extension}"
+        file_path = os.path.join(PROFILE_UPLOAD_DIR, filename)
         
-        # Save file
-        file.save(file_path)
+        # Stream the upload to disk in large chunks
+        with open(file_path, 'wb') as dst:
+            shutil.copyfileobj(file.stream, dst, length=UPLOAD_COPY_CHUNK_SIZE)
         
         # Update user profile with picture path
         relative_path = f"uploads/profiles/{filename}"
         profile_data = {'profile_picture': relative_path}
         success = auth_manager.update_user_profile(user_id, profile_data)
+        invalidate_profile(user_id)
         
         if success:
             return jsonify({
@@ -3596,30 +3914,31 @@ def api_upload_profile_picture():
             os.remove(file_path)
             return jsonify({'success': False, 'error': 'Failed to update profile'}), 500
             
-    except Exception as e:
-        print(f"❌ Error uploading profile picture: {str(e)}")
+    except Exception:
+        logger.exception('Error uploading profile picture')
         return jsonify({'success': False, 'error': 'Failed to upload picture'}), 500
 
 @app.route('/api/user/profile/picture/<int:user_id>')
 def api_get_profile_picture(user_id):
     """Serve profile picture"""
     try:
-        profile = auth_manager.get_user_profile(user_id)
+        profile = get_cached_user_profile(user_id)
         
         if profile and profile.get('profile_picture'):
-            file_path = os.path.join(app.root_path, profile['profile_picture'])
-            if os.path.exists(file_path):
-                return send_file(file_path)
+            try:
+                # The URL is per user but the picture can change, so browsers revalidate via ETag (304)
+                return send_from_directory(app.root_path, profile['profile_picture'], max_age=0, conditional=True)
+            except NotFound:
+                pass
         
         # Return default avatar if no profile picture
-        default_avatar = os.path.join(app.root_path, 'static', 'images', 'default-avatar.svg')
-        if os.path.exists(default_avatar):
-            return send_file(default_avatar, mimetype='image/svg+xml')
+        if not DEFAULT_AVATAR_AVAILABLE:
+            return '', 404
+        return send_from_directory(DEFAULT_AVATAR_DIR, DEFAULT_AVATAR_FILENAME,
+                                   mimetype='image/svg+xml', max_age=86400, conditional=True)
         
-        return '', 404
-        
-    except Exception as e:
-        print(f"❌ Error serving profile picture: {str(e)}")
+    except Exception:
+        logger.exception('Error serving profile picture')
         return '', 404
 
 @app.route('/api/user/change-password', methods=['POST'])
@@ -3646,8 +3965,8 @@ def api_change_password():
         else:
             return jsonify({'success': False, 'error': 'Current password is incorrect'}), 400
             
-    except Exception as e:
-        print(f"❌ Error changing password: {str(e)}")
+    except Exception:
+        logger.exception('Error changing password')
         return jsonify({'success': False, 'error': 'Failed to change password'}), 500
 
 @app.route('/admin')
@@ -3666,8 +3985,8 @@ def api_admin_get_users():
             'success': True,
             'users': users
         })
-    except Exception as e:
-        print(f"❌ Error getting users: {str(e)}")
+    except Exception:
+        logger.exception('Error getting users')
         return jsonify({'success': False, 'error': 'Failed to get users'})
 
 @app.route('/api/admin/pending-users')
@@ -3680,8 +3999,8 @@ def api_admin_get_pending_users():
             'success': True,
             'users': pending_users
         })
-    except Exception as e:
-        print(f"❌ Error getting pending users: {str(e)}")
+    except Exception:
+        logger.exception('Error getting pending users')
         return jsonify({'success': False, 'error': 'Failed to get pending users'})
 
 @app.route('/api/admin/users/<int:user_id>/approve', methods=['POST'])
@@ -3696,8 +4015,8 @@ def api_admin_approve_user(user_id):
             return jsonify({'success': True, 'message': 'User approved successfully'})
         else:
             return jsonify({'success': False, 'error': 'Failed to approve user'})
-    except Exception as e:
-        print(f"❌ Error approving user: {str(e)}")
+    except Exception:
+        logger.exception('Error approving user')
         return jsonify({'success': False, 'error': 'Failed to approve user'})
 
 @app.route('/api/admin/users/<int:user_id>/reject', methods=['DELETE'])
@@ -3711,8 +4030,8 @@ def api_admin_reject_user(user_id):
             return jsonify({'success': True, 'message': 'User rejected and deleted'})
         else:
             return jsonify({'success': False, 'error': 'Failed to reject user'})
-    except Exception as e:
-        print(f"❌ Error rejecting user: {str(e)}")
+    except Exception:
+        logger.exception('Error rejecting user')
         return jsonify({'success': False, 'error': 'Failed to reject user'})
 
 @app.route('/api/admin/users/<int:user_id>/deactivate', methods=['POST'])
@@ -3727,8 +4046,8 @@ def api_admin_deactivate_user(user_id):
             return jsonify({'success': True, 'message': 'User deactivated successfully'})
         else:
             return jsonify({'success': False, 'error': 'Failed to deactivate user'})
-    except Exception as e:
-        print(f"❌ Error deactivating user: {str(e)}")
+    except Exception:
+        logger.exception('Error deactivating user')
         return jsonify({'success': False, 'error': 'Failed to deactivate user'})
 
 @app.route('/api/admin/users/<int:user_id>/reactivate', methods=['POST'])
@@ -3742,8 +4061,8 @@ def api_admin_reactivate_user(user_id):
             return jsonify({'success': True, 'message': 'User reactivated successfully'})
         else:
             return jsonify({'success': False, 'error': 'Failed to reactivate user'})
-    except Exception as e:
-        print(f"❌ Error reactivating user: {str(e)}")
+    except Exception:
+        logger.exception('Error reactivating user')
         return jsonify({'success': False, 'error': 'Failed to reactivate user'})
 
 @app.route('/api/admin/users/<int:user_id>/role', methods=['PUT'])
@@ -3764,8 +4083,8 @@ def api_admin_update_user_role(user_id):
             return jsonify({'success': True, 'message': f'User role updated to {new_role}'})
         else:
             return jsonify({'success': False, 'error': 'Failed to update user role'})
-    except Exception as e:
-        print(f"❌ Error updating user role: {str(e)}")
+    except Exception:
+        logger.exception('Error updating user role')
         return jsonify({'success': False, 'error': 'Failed to update user role'})
 
 @app.route('/api/admin/create-user', methods=['POST'])
@@ -3790,8 +4109,8 @@ def api_admin_create_user():
         
         return jsonify(result)
         
-    except Exception as e:
-        print(f"❌ Error creating user: {str(e)}")
+    except Exception:
+        logger.exception('Error creating user')
         return jsonify({'success': False, 'error': 'Failed to create user'})
 
 @app.route('/api/admin/users/<int:user_id>/change-password', methods=['PUT'])
@@ -3813,8 +4132,8 @@ def api_admin_change_password(user_id):
         
         return jsonify(result)
         
-    except Exception as e:
-        print(f"❌ Error changing user password: {str(e)}")
+    except Exception:
+        logger.exception('Error changing user password')
         return jsonify({'success': False, 'error': 'Failed to change password'})
 
 @app.route('/api/notifications/mark-all-read', methods=['POST'])
@@ -3824,23 +4143,19 @@ def api_mark_all_notifications_read():
     try:
         user_id = session.get('user_id')
         
-        # Get all unread notifications for the user
-        conn = sqlite3.connect('ai_learning.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        # Mark the user's unread notifications (served by idx_un_user_unread)
+        conn = get_db_connection()
+        conn.execute('''
             UPDATE user_notifications 
             SET is_read = 1 
             WHERE user_id = ? AND is_read = 0
         ''', (user_id,))
-        
         conn.commit()
-        conn.close()
         
         return jsonify({'success': True, 'message': 'All notifications marked as read'})
         
-    except Exception as e:
-        print(f"❌ Error marking all notifications as read: {str(e)}")
+    except Exception:
+        logger.exception('Error marking all notifications as read')
         return jsonify({'success': False, 'error': 'Failed to mark notifications as read'})
 
 @app.route('/api/sync_signals', methods=['POST'])
@@ -3860,52 +4175,93 @@ def api_sync_signals():
                 'error': 'Signal sync failed. Check server logs for details.'
             })
     except Exception as e:
-        print(f"❌ Error in sync API: {str(e)}")
+        logger.exception('Error in sync API')
         return jsonify({
             'success': False,
             'error': f'Error syncing signals: {str(e)}'
         })
 
+# Serialized today/week signal responses, keyed by ('today', date) / ('week', monday)
+SIGNALS_VIEW_CACHE_TTL = 60
+signals_view_cache = {}
+signals_view_cache_lock = threading.Lock()
+
+def get_cached_signals_view(key):
+    """Return a cached today/week response body if it is younger than the TTL"""
+    with signals_view_cache_lock:
+        entry = signals_view_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] <= SIGNALS_VIEW_CACHE_TTL:
+        return entry[1]
+    return None
+
+def cache_signals_view(key, body):
+    """Store a today/week response body, replacing bodies left over from previous days/weeks"""
+    with signals_view_cache_lock:
+        for stale_key in [k for k in signals_view_cache if k[0] == key[0] and k != key]:
+            del signals_view_cache[stale_key]
+        signals_view_cache[key] = (time.monotonic(), body)
+
+def invalidate_signals_views():
+    """Drop cached today/week responses after signals are created or updated"""
+    with signals_view_cache_lock:
+        signals_view_cache.clear()
+
 # Enhanced Signals API Endpoints
 @app.route('/api/signals/today')
 @login_required
 def api_signals_today():
     """Get today's signals only"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    cache_key = ('today', today)
+    cached = get_cached_signals_view(cache_key)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+    
     try:
         signals = get_todays_signals()
         
-        return jsonify({
+        body = dumps_json({
             'success': True,
             'data': signals,
             'count': len(signals),
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': today,
             'message': f'Retrieved {len(signals)} signals for today'
         })
+        cache_signals_view(cache_key, body)
+        
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
-        print(f"❌ Error getting today's signals: {str(e)}")
-        return jsonify({
+        logger.exception("Error getting today's signals")
+        return ojsonify({
             'success': False,
             'error': f'Error retrieving today\'s signals: {str(e)}',
             'data': [],
             'count': 0
-        }), 500
+        }, 500)
+
+@lru_cache(maxsize=7)
+def week_bounds(day_ordinal):
+    """(monday, sunday) ISO dates of the week containing the given date ordinal"""
+    day = date.fromordinal(day_ordinal)
+    monday = day - timedelta(days=day.weekday())
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
 
 @app.route('/api/signals/week')
 @login_required
 def api_signals_week():
     """Get this week's signals"""
+    # Week range for the cache key and the response
+    week_start, week_end = week_bounds(date.today().toordinal())
+    cache_key = ('week', week_start)
+    cached = get_cached_signals_view(cache_key)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+    
     try:
         signals = get_week_signals()
         
-        # Calculate week range for response
-        today = datetime.now()
-        days_since_monday = today.weekday()
-        monday = today - timedelta(days=days_since_monday)
-        week_start = monday.strftime('%Y-%m-%d')
-        week_end = (monday + timedelta(days=6)).strftime('%Y-%m-%d')
-        
-        return jsonify({
+        body = dumps_json({
             'success': True,
             'data': signals,
             'count': len(signals),
@@ -3913,15 +4269,21 @@ def api_signals_week():
             'week_end': week_end,
             'message': f'Retrieved {len(signals)} signals for this week ({week_start} to {week_end})'
         })
+        cache_signals_view(cache_key, body)
+        
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
-        print(f"❌ Error getting week signals: {str(e)}")
-        return jsonify({
+        logger.exception('Error getting week signals')
+        return ojsonify({
             'success': False,
             'error': f'Error retrieving week signals: {str(e)}',
             'data': [],
             'count': 0
-        }), 500
+        }, 500)
+
+# Server-side cap on the client-supplied search page size
+SIGNAL_SEARCH_MAX_LIMIT = 500
 
 @app.route('/api/signals/search')
 @login_required
@@ -3929,68 +4291,56 @@ def api_signals_search():
     """Search signals by symbol or type"""
     try:
         query = request.args.get('q', '').strip()
-        limit = int(request.args.get('limit', 50))
-        offset = int(request.args.get('offset', 0))
+        # SQLite treats a negative LIMIT as unlimited, so clamp both ends
+        limit = max(1, min(int(request.args.get('limit', 50)), SIGNAL_SEARCH_MAX_LIMIT))
+        offset = max(0, int(request.args.get('offset', 0)))
+        
+        # "q=NAS*" or match=prefix asks for a prefix search; anything else matches substrings
+        prefix_match = query.endswith('*') or request.args.get('match') == 'prefix'
+        query = query.rstrip('*')
         
         if not query:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Search query parameter "q" is required',
                 'data': [],
                 'count': 0
-            }), 400
+            }, 400)
         
-        conn = sqlite3.connect('ai_learning.db')
+        conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Ensure risky_play_outcome column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN risky_play_outcome INTEGER')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
-        # Check if risky_play_outcome column exists
-        cursor.execute('PRAGMA table_info(signal_performance)')
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        # Search in symbol and signal_type fields
-        search_term = f'%{query}%'
+        # Search in symbol and signal_type fields; a prefix pattern has no leading wildcard, so the NOCASE indexes apply
+        search_term = f'{query}%' if prefix_match else f'%{query}%'
         
-        if 'risky_play_outcome' in columns:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, risky_play_outcome
-                FROM signal_performance 
-                WHERE (symbol LIKE ? OR signal_type LIKE ?)
-                ORDER BY timestamp DESC 
-                LIMIT ? OFFSET ?
-            ''', (search_term, search_term, limit, offset))
-        else:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, NULL as risky_play_outcome
-                FROM signal_performance 
-                WHERE (symbol LIKE ? OR signal_type LIKE ?)
-                ORDER BY timestamp DESC 
-                LIMIT ? OFFSET ?
-            ''', (search_term, search_term, limit, offset))
-        
-        signals_data = cursor.fetchall()
-        
-        # Get total count for pagination
+        # The window count gives the pagination total from the same scan as the page itself
         cursor.execute('''
-            SELECT COUNT(*) FROM signal_performance 
+            SELECT id, symbol, signal_type, predicted_probability, risk_level, 
+                   timestamp, actual_outcome, profit_loss, risky_play_outcome,
+                   COUNT(*) OVER() AS total_count
+            FROM signal_performance 
             WHERE (symbol LIKE ? OR signal_type LIKE ?)
-        ''', (search_term, search_term))
-        total_count = cursor.fetchone()[0]
-        
-        conn.close()
-        
-        # Format signals data
-        formatted_signals = format_signal_data(signals_data)
-        
-        return jsonify({
+            ORDER BY timestamp DESC 
+            LIMIT ? OFFSET ?
+        ''', (search_term, search_term, limit, offset))
+        
+        # Format rows straight off the cursor (no intermediate fetchall list)
+        first_row = cursor.fetchone()
+        if first_row is not None:
+            total_count = first_row['total_count']
+            formatted_signals = list(iter_formatted_signals(chain((first_row,), cursor)))
+        else:
+            formatted_signals = []
+            total_count = 0
+            if offset > 0:
+                # Paged past the end: the window count has no row to ride on, so count separately
+                cursor.execute('''
+                    SELECT COUNT(*) FROM signal_performance 
+                    WHERE (symbol LIKE ? OR signal_type LIKE ?)
+                ''', (search_term, search_term))
+                total_count = cursor.fetchone()[0]
+        
+        return ojsonify({
             'success': True,
             'data': formatted_signals,
             'count': len(formatted_signals),
@@ -4002,75 +4352,99 @@ def api_signals_search():
         })
         
     except Exception as e:
-        print(f"❌ Error searching signals: {str(e)}")
-        return jsonify({
+        logger.exception('Error searching signals')
+        return ojsonify({
             'success': False,
             'error': f'Error searching signals: {str(e)}',
             'data': [],
             'count': 0
-        }), 500
+        }, 500)
+
+# Serialized /api/signals/<id> responses (LRU + TTL), invalidated whenever this process writes a signal row.
+# The TTL bounds staleness for writes made by other worker processes or outside the dashboard
+SIGNAL_DETAIL_CACHE_SIZE = 4096
+SIGNAL_DETAIL_CACHE_TTL = 30
+signal_detail_cache = OrderedDict()
+signal_detail_cache_lock = threading.Lock()
+
+def get_cached_signal_detail(signal_id):
+    """Return the cached JSON body for a signal if it is younger than the TTL, or None"""
+    with signal_detail_cache_lock:
+        entry = signal_detail_cache.get(signal_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > SIGNAL_DETAIL_CACHE_TTL:
+            del signal_detail_cache[signal_id]
+            return None
+        signal_detail_cache.move_to_end(signal_id)
+        return entry[1]
+
+def cache_signal_detail(signal_id, body):
+    """Store a signal's JSON body, evicting the least recently used entry when full"""
+    with signal_detail_cache_lock:
+        signal_detail_cache[signal_id] = (time.monotonic(), body)
+        signal_detail_cache.move_to_end(signal_id)
+        if len(signal_detail_cache) > SIGNAL_DETAIL_CACHE_SIZE:
+            signal_detail_cache.popitem(last=False)
+
+def invalidate_signal_cache(signal_id=None):
+    """Drop a signal's cached detail response (or all of them) plus the today/week views"""
+    invalidate_signals_views()
+    with signal_detail_cache_lock:
+        if signal_id is None:
+            signal_detail_cache.clear()
+        else:
+            signal_detail_cache.pop(int(signal_id), None)
 
 @app.route('/api/signals/<int:signal_id>')
 @login_required
 def api_signal_detail(signal_id):
     """Get single signal details"""
+    cached = get_cached_signal_detail(signal_id)
+    if cached is not None:
+        return Response(cached, mimetype='application/json')
+    
     try:
-        conn = sqlite3.connect('ai_learning.db')
+        conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Ensure risky_play_outcome column exists
-        try:
-            cursor.execute('ALTER TABLE signal_performance ADD COLUMN risky_play_outcome INTEGER')
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass
-        
-        # Check if risky_play_outcome column exists
-        cursor.execute('PRAGMA table_info(signal_performance)')
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        if 'risky_play_outcome' in columns:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, risky_play_outcome
-                FROM signal_performance 
-                WHERE id = ?
-            ''', (signal_id,))
-        else:
-            cursor.execute('''
-                SELECT id, symbol, signal_type, predicted_probability, risk_level, 
-                       timestamp, actual_outcome, profit_loss, NULL as risky_play_outcome
-                FROM signal_performance 
-                WHERE id = ?
-            ''', (signal_id,))
+        cursor.execute('''
+            SELECT id, symbol, signal_type, predicted_probability, risk_level, 
+                   timestamp, actual_outcome, profit_loss, risky_play_outcome
+            FROM signal_performance 
+            WHERE id = ?
+        ''', (signal_id,))
         
         signal_data = cursor.fetchone()
-        conn.close()
         
         if not signal_data:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': f'Signal with ID {signal_id} not found',
                 'data': None
-            }), 404
+            }, 404)
         
         # Format signal data
         formatted_signals = format_signal_data([signal_data])
         signal = formatted_signals[0] if formatted_signals else None
         
-        return jsonify({
+        # Cache the serialized body so repeat views skip SQLite and formatting
+        body = dumps_json({
             'success': True,
             'data': signal,
             'message': f'Retrieved signal {signal_id}'
         })
+        cache_signal_detail(signal_id, body)
+        
+        return Response(body, mimetype='application/json')
         
     except Exception as e:
-        print(f"❌ Error getting signal {signal_id}: {str(e)}")
-        return jsonify({
+        logger.exception('Error getting signal %s', signal_id)
+        return ojsonify({
             'success': False,
             'error': f'Error retrieving signal: {str(e)}',
             'data': None
-        }), 500
+        }, 500)
 
 @app.route('/api/signals/stats')
 @login_required
@@ -4086,7 +4460,7 @@ def api_signals_stats():
         })
         
     except Exception as e:
-        print(f"❌ Error getting signal stats: {str(e)}")
+        logger.exception('Error getting signal stats')
         return jsonify({
             'success': False,
             'error': f'Error retrieving signal statistics: {str(e)}',
@@ -4095,7 +4469,7 @@ def api_signals_stats():
 
 if __name__ == '__main__':
     # Initialize scheduler
-    setup_scheduler()
+    start_scheduler()
     
     # Use debug=False for production-like experience, True for development
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
@@ -3,14 +3,228 @@ Enhanced Data Feed Service for BFI Signals
 Uses multiple data sources with fallback mechanisms for reliable market data
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yfinance as yf
 from datetime import datetime, timedelta
 import time
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FuturesTimeoutError
 import logging
 import json
+import sqlite3
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+# Seconds a fetched quote is served from memory before the source is hit again
+QUOTE_CACHE_TTL = float(os.getenv('BFI_QUOTE_TTL', '30'))
+
+# Seconds a symbol validation result is reused before Yahoo is asked again
+SYMBOL_VALIDATION_TTL = 3600
+
+# SQLite file holding recent quotes, shared by every worker process and kept across restarts.
+# Anchored to this module's directory so every process finds the same file whatever its cwd
+QUOTE_CACHE_DB = os.getenv('BFI_QUOTE_CACHE_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quote_cache.db'))
+
+# Longest a fetch will sleep for a rate-limit token before giving up on that source
+RATE_LIMIT_MAX_WAIT = 1.0
+
+# Shared worker pool for querying sources concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='datafeed')
+
+# Seconds the primary source gets to answer before any other source's quote is accepted
+PRIMARY_SOURCE_GRACE = 0.5
+
+# Longest a hedged fetch waits for any source to answer
+MARKET_DATA_TIMEOUT = 30
+
+# Longest a caller waits on another thread's in-flight fetch of the same symbol
+INFLIGHT_WAIT_TIMEOUT = 30
+
+# Display values when no market data is available; shared, so callers must not mutate it
+DEFAULT_EMPTY = {
+    'price': '--',
+    'change': '--',
+    'changePercent': '--',
+    'rawChange': 0,
+    'previousClose': '--',
+    'high': '--',
+    'low': '--',
+    'source': 'No Data'
+}
+
+
+def build_market_data_formatter(price_format):
+    """Return a display formatter for one symbol given its price format spec"""
+    def format_data(data):
+        return {
+            'price': price_format.format(data['price']),
+            'change': f"{data['change']:+.2f}",
+            'changePercent': f"{data['change_percent']:+.2f}%",
+            'rawChange': data['change'],
+            'previousClose': price_format.format(data['previous_close']),
+            'high': price_format.format(data['high']),
+            'low': price_format.format(data['low']),
+            'source': data['source']
+        }
+    return format_data
+
+
+def price_bounds_for_symbol(symbol):
+    """Return (market name, min price, max price) for a symbol's sanity check, or None if unbounded"""
+    if symbol.startswith('^DJI') or symbol == 'DJIA':
+        return ('Dow Jones', 20000, 50000)
+    if symbol.startswith('GC') or 'GOLD' in symbol.upper():
+        return ('Gold', 1000, 5000)
+    if symbol.startswith('^NDX'):
+        return ('NASDAQ', 10000, 30000)
+    return None
+
+
+# Finnhub symbols for each symbol key
+FINNHUB_SYMBOLS = {
+    'nasdaq': '^NDX',
+    'gold': 'XAUUSD',
+    'dow': '^DJI'
+}
+
+# Fallback configuration used when the config module is not available
+_DEFAULT_SOURCES = {
+    'yahoo_finance': {
+        'enabled': True,
+        'rate_limit': 100
+    },
+    'alpha_vantage': {
+        'enabled': True,
+        'api_key': 'demo',
+        'base_url': 'https://www.alphavantage.co/query',
+        'rate_limit': 5
+    },
+    'finnhub': {
+        'enabled': True,
+        'api_key': 'demo',
+        'base_url': 'https://finnhub.io/api/v1',
+        'rate_limit': 60
+    }
+}
+
+# Updated symbols with more reliable options
+_DEFAULT_SYMBOLS = {
+    'nasdaq': {
+        'yahoo_finance': '^NDX',
+        'yahoo_finance_backup': '^IXIC',
+        'alpha_vantage': 'NDX'
+    },
+    'gold': {
+        'yahoo_finance': 'GC=F',  # Gold Futures (COMEX) - Most accurate for trading
+        'yahoo_finance_backup': 'XAUUSD=X',  # Gold spot USD
+        'yahoo_finance_backup2': 'GLD',  # Gold ETF fallback
+        'yahoo_finance_backup3': '^GOLD',  # Gold index
+        'alpha_vantage': 'XAUUSD'
+    },
+    'dow': {
+        'yahoo_finance': '^DJI',  # US30 (as requested)
+        'yahoo_finance_backup': 'DJIA',  # DJIA alternative
+        'yahoo_finance_backup2': 'DIA',  # Dow ETF
+        'alpha_vantage': 'DJI'
+    }
+}
+
+
+class TokenBucket:
+    """Rate limiter holding up to capacity tokens, refilled continuously at refill_per_sec"""
+    
+    def __init__(self, capacity, refill_per_sec):
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.refill_per_sec = refill_per_sec
+        self.last = time.monotonic()
+        # Each source has its own lock, so throttling one provider never blocks another
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_per_sec)
+        self.last = now
+    
+    def try_acquire(self):
+        """Take a token if one is available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+    
+    def acquire(self, max_wait):
+        """Take a token, returning the seconds to sleep before using it.
+        A wait longer than max_wait is returned without reserving a token."""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            
+            wait = (1 - self.tokens) / self.refill_per_sec
+            if wait <= max_wait:
+                # Reserve the token now so concurrent callers queue up behind this one
+                self.tokens -= 1
+            return wait
+
+
+class QuoteCache:
+    """Recent market data per symbol in SQLite, so worker processes share one warm cache"""
+    
+    def __init__(self, path=QUOTE_CACHE_DB):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        # WAL lets other processes read while one writes
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS quotes (symbol_key TEXT PRIMARY KEY, json TEXT, ts REAL)')
+        self.conn.commit()
+    
+    def get(self, symbol_key, ttl=QUOTE_CACHE_TTL):
+        """Return the stored data for symbol_key if it was saved less than ttl seconds ago"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT json FROM quotes WHERE symbol_key = ? AND ? - ts < ?',
+                (symbol_key, time.time(), ttl)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def put(self, symbol_key, data):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO quotes (symbol_key, json, ts) VALUES (?, ?, ?)',
+                (symbol_key, json.dumps(data), time.time())
+            )
+            self.conn.commit()
+    
+    def delete(self, symbol_key=None):
+        """Remove symbol_key, or every stored quote when None"""
+        with self.lock:
+            if symbol_key is None:
+                self.conn.execute('DELETE FROM quotes')
+            else:
+                self.conn.execute('DELETE FROM quotes WHERE symbol_key = ?', (symbol_key,))
+            self.conn.commit()
+
+
 class EnhancedDataFeed:
     def __init__(self):
         try:
@@ -19,79 +233,140 @@ class EnhancedDataFeed:
             self.sources = config.data_sources
             self.symbols = config.symbols
         except ImportError:
-            # Fallback configurations if config module is not available
+            # Fallback configurations if config module is not available; shared, never mutated
             self.config = None
-            self.sources = {
-                'yahoo_finance': {
-                    'enabled': True,
-                    'rate_limit': 100
-                },
-                'alpha_vantage': {
-                    'enabled': True,
-                    'api_key': 'demo',
-                    'base_url': 'https://www.alphavantage.co/query',
-                    'rate_limit': 5
-                },
-                'finnhub': {
-                    'enabled': True,
-                    'api_key': 'demo',
-                    'base_url': 'https://finnhub.io/api/v1',
-                    'rate_limit': 60
-                }
-            }
-            # Updated symbols with more reliable options
-            self.symbols = {
-                'nasdaq': {
-                    'yahoo_finance': '^NDX',
-                    'yahoo_finance_backup': '^IXIC',
-                    'alpha_vantage': 'NDX'
-                },
-                'gold': {
-                    'yahoo_finance': 'GC=F',  # Gold Futures (COMEX) - Most accurate for trading
-                    'yahoo_finance_backup': 'XAUUSD=X',  # Gold spot USD
-                    'yahoo_finance_backup2': 'GLD',  # Gold ETF fallback
-                    'yahoo_finance_backup3': '^GOLD',  # Gold index
-                    'alpha_vantage': 'XAUUSD'
-                },
-                'dow': {
-                    'yahoo_finance': '^DJI',  # US30 (as requested)
-                    'yahoo_finance_backup': 'DJIA',  # DJIA alternative
-                    'yahoo_finance_backup2': 'DIA',  # Dow ETF
-                    'alpha_vantage': 'DJI'
-                }
-            }
+            self.sources = _DEFAULT_SOURCES
+            self.symbols = _DEFAULT_SYMBOLS
         
         self.last_request_time = {}
         self.request_count = {}
+        self._request_lock = threading.Lock()
         self.connection_status = {}
         self.last_successful_fetch = {}
         
+        # Token bucket per rate-limited source, refilled continuously at rate_limit per minute
+        self._buckets = {}
+        for source, source_config in self.sources.items():
+            if 'rate_limit' not in source_config:
+                continue
+            rate = source_config['rate_limit'] / 60.0
+            if source == 'yahoo_finance':
+                rate = min(rate, 0.5)  # At least 2 seconds between Yahoo requests on average
+            self._buckets[source] = TokenBucket(source_config['rate_limit'], rate)
+        
+        # Source settings resolved once; the config does not change while the feed runs
+        self._yahoo_enabled = self.sources['yahoo_finance'].get('enabled', True)
+        self._finnhub_enabled = self.sources['finnhub'].get('enabled', True)
+        self._av_enabled = self.sources['alpha_vantage'].get('enabled', True)
+        self._av_url = self.sources['alpha_vantage'].get('base_url')
+        
+        # Request parameters that never change between calls; fetches only add the symbol
+        self._av_quote_params = {
+            'function': 'GLOBAL_QUOTE',
+            'apikey': self.sources['alpha_vantage'].get('api_key')
+        }
+        self._finnhub_params = {'token': self.sources['finnhub'].get('api_key')}
+        self._finnhub_quote_url = f"{self.sources['finnhub'].get('base_url')}/quote"
+        
+        # Display formatter per symbol; gold prices are shown without thousands separators
+        self._formatters = {
+            symbol_key: build_market_data_formatter('{:.2f}' if symbol_key == 'gold' else '{:,.2f}')
+            for symbol_key in self.symbols
+        }
+        
+        # symbol_key -> {'event', 'result'} for get_market_data calls currently fetching
+        self._inflight_lock = threading.Lock()
+        self._inflight = {}
+        
+        # Yahoo symbols to try per symbol key: the primary symbol followed by its backups
+        self._fallback_chain = {}
+        for symbol_key, symbol_config in self.symbols.items():
+            chain_symbols = [symbol_config['yahoo_finance']] if 'yahoo_finance' in symbol_config else []
+            chain_symbols.extend(symbol for source, symbol in symbol_config.items()
+                                 if source.startswith('yahoo_finance_backup'))
+            self._fallback_chain[symbol_key] = tuple(chain_symbols)
+        
+        # Yahoo symbol -> reasonable price range, so validation is a lookup instead of string matching
+        self._price_bounds = {
+            symbol: price_bounds_for_symbol(symbol)
+            for symbol_config in self.symbols.values()
+            for source, symbol in symbol_config.items()
+            if source.startswith('yahoo_finance')
+        }
+        
+        # symbol -> (validated_at, is_valid) for backup Yahoo symbols
+        self._symbol_validation_cache = {}
+        
+        # (source, symbol_key) -> (fetched_at, data) for recently fetched quotes
+        self._cache = {}
+        
+        # Market data shared with other worker processes and surviving restarts, opened on first use
+        # so importing this module never touches the filesystem
+        self._quote_store = None
+        self._quote_store_failed = False
+        self._quote_store_lock = threading.Lock()
+        
+        # Persistent HTTP session so Finnhub and Alpha Vantage calls reuse keep-alive TCP/TLS connections.
+        # Read timeouts are not retried, so a stalled source costs one 10s timeout rather than three
+        self._session = requests.Session()
+        self._session.headers['Connection'] = 'keep-alive'
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
+        # One browser-impersonating session shared by every yfinance call so Yahoo requests
+        # reuse keep-alive connections; yfinance only accepts curl_cffi sessions
+        self._yf_session = None
+        if CURL_CFFI_AVAILABLE:
+            session_options = {'impersonate': 'chrome'}
+            # Bounded retry with exponential backoff (2s, 4s) on transport errors, where supported
+            if hasattr(curl_requests, 'RetryStrategy'):
+                session_options['retry'] = curl_requests.RetryStrategy(count=2, delay=2.0, backoff='exponential')
+            self._yf_session = curl_requests.Session(**session_options)
+        
         # Setup logging
         self.setup_logging()
         
-        # Test initial connection
-        self.test_yahoo_connection()
+        # The Yahoo connection test is deferred to the first yahoo_ok lookup so importing
+        # this module never blocks on the network
 
     def setup_logging(self):
         """Setup detailed logging for debugging"""
         self.logger = logging.getLogger('EnhancedDataFeed')
-        self.logger.setLevel(logging.INFO)
+        # Per-fetch progress messages are only emitted when BFI_DEBUG is set
+        self.logger.setLevel(logging.INFO if os.getenv('BFI_DEBUG') else logging.WARNING)
         
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        # The logger is shared by every instance, so only the first one attaches a handler
+        if not self.logger.handlers:
+            # Create formatter
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            
+            # Create console handler
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            self.logger.addHandler(console_handler)
         
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        # Records are already written by the handler above; don't repeat them through the root logger
+        self.logger.propagate = False
+
+    @property
+    def yahoo_ok(self):
+        """Whether Yahoo Finance is reachable, testing the connection only if nothing has shown it yet"""
+        if 'yahoo_finance' not in self.connection_status:
+            self.test_yahoo_connection()
+        return self.connection_status['yahoo_finance']
 
     def test_yahoo_connection(self):
         """Test Yahoo Finance API connectivity"""
         try:
             self.logger.info("🔍 Testing Yahoo Finance connection...")
-            test_data = yf.download('^IXIC', period='1d', interval='1m', timeout=10)
+            test_data = yf.download('^IXIC', period='1d', interval='1m', timeout=10, session=self._yf_session)
             if not test_data.empty:
                 self.connection_status['yahoo_finance'] = True
                 self.logger.info("✅ Yahoo Finance connection successful")
@@ -102,100 +377,165 @@ class EnhancedDataFeed:
                 return False
         except Exception as e:
             self.connection_status['yahoo_finance'] = False
-            self.logger.error(f"❌ Yahoo Finance connection failed: {str(e)}")
+            self.logger.error("❌ Yahoo Finance connection failed: %s", e)
             return False
 
     def validate_symbol(self, symbol: str) -> bool:
         """Validate if a symbol is likely to work"""
+        cached = self._symbol_validation_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < SYMBOL_VALIDATION_TTL:
+            return cached[1]
+        
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            if info and info.get('regularMarketPrice'):
-                self.logger.info(f"✅ Symbol {symbol} validated successfully")
-                return True
+            # fast_info reads one quote endpoint instead of scraping the full info payload
+            fast_info = yf.Ticker(symbol, session=self._yf_session).fast_info
+            is_valid = bool(fast_info.get('lastPrice'))
+            if is_valid:
+                self.logger.info("✅ Symbol %s validated successfully", symbol)
             else:
-                self.logger.warning(f"⚠️ Symbol {symbol} validation failed - no market price")
-                return False
+                self.logger.warning("⚠️ Symbol %s validation failed - no market price", symbol)
+            # Only definite answers are cached; errors below are retried on the next call
+            self._symbol_validation_cache[symbol] = (time.monotonic(), is_valid)
+            return is_valid
         except Exception as e:
-            self.logger.error(f"❌ Symbol {symbol} validation error: {str(e)}")
+            self.logger.error("❌ Symbol %s validation error: %s", symbol, e)
             return False
 
+    def _acquire(self, source, max_wait=RATE_LIMIT_MAX_WAIT):
+        """Take a request token for source; returns the seconds to sleep before requesting"""
+        bucket = self._buckets.get(source)
+        if bucket is None:
+            return 0.0
+        return bucket.acquire(max_wait)
+    
     def _rate_limit_check(self, source):
-        """Check if we can make a request to the given source"""
-        if source not in self.last_request_time:
-            return True
-            
-        now = time.time()
-        time_since_last = now - self.last_request_time[source]
-        rate_limit = self.sources[source]['rate_limit']
-        
-        # Convert rate limit to seconds between requests
-        min_interval = 60 / rate_limit
-        
-        # Add extra spacing to avoid rate limits
-        if source == 'yahoo_finance':
-            min_interval = max(min_interval, 2)  # At least 2 seconds between Yahoo requests
-        
-        return time_since_last >= min_interval
+        """Wait briefly for a rate-limit token; False when the source is throttled for longer"""
+        wait = self._acquire(source)
+        if wait > RATE_LIMIT_MAX_WAIT:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
     
     def _update_request_time(self, source):
         """Update the last request time for a source"""
-        self.last_request_time[source] = time.time()
+        with self._request_lock:
+            self.last_request_time[source] = time.time()
+            self.request_count[source] = self.request_count.get(source, 0) + 1
+    
+    def _decode_json(self, response):
+        """Decode a JSON response body, parsing the raw bytes with orjson when it is installed"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    def _cache_get(self, key, ttl=QUOTE_CACHE_TTL):
+        """Return cached data for key if it was fetched less than ttl seconds ago"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, key, value):
+        """Cache freshly fetched data for key"""
+        self._cache[key] = (time.monotonic(), value)
+    
+    def invalidate(self, symbol_key=None):
+        """Drop cached quotes for symbol_key from every source, or the whole cache when None"""
+        if symbol_key is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache if key[1] == symbol_key]:
+                self._cache.pop(key, None)
+        self._shared_quote_delete(symbol_key)
+    
+    def _cached_market_data(self, symbol_key):
+        """Market data for symbol_key from this process's cache, else from the shared store"""
+        cached = self._cache_get(('market_data', symbol_key))
+        if cached is None:
+            cached = self._shared_quote_get(symbol_key)
+            if cached is not None:
+                self._cache_put(('market_data', symbol_key), cached)
+        return cached
+    
+    def _store_market_data(self, symbol_key, data):
+        """Cache a fetched result locally and publish it to the shared store"""
+        self._cache_put(('market_data', symbol_key), data)
+        self._shared_quote_put(symbol_key, data)
+    
+    def _shared_quote_store(self):
+        """The shared QuoteCache, opened on first use; None if it cannot be opened"""
+        if self._quote_store is None and not self._quote_store_failed:
+            with self._quote_store_lock:
+                if self._quote_store is None and not self._quote_store_failed:
+                    try:
+                        self._quote_store = QuoteCache()
+                    except sqlite3.Error as e:
+                        self._quote_store_failed = True
+                        self.logger.warning("⚠️ Shared quote cache unavailable: %s", e)
+        return self._quote_store
+    
+    def _shared_quote_get(self, symbol_key):
+        """Fresh market data another process (or a previous run) stored, or None"""
+        store = self._shared_quote_store()
+        if store is None:
+            return None
+        try:
+            return store.get(symbol_key)
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.warning("⚠️ Shared quote cache read failed: %s", e)
+            return None
+    
+    def _shared_quote_put(self, symbol_key, data):
+        store = self._shared_quote_store()
+        if store is None:
+            return
+        try:
+            store.put(symbol_key, data)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.logger.warning("⚠️ Shared quote cache write failed: %s", e)
+    
+    def _shared_quote_delete(self, symbol_key):
+        store = self._shared_quote_store()
+        if store is None:
+            return
+        try:
+            store.delete(symbol_key)
+        except sqlite3.Error as e:
+            self.logger.warning("⚠️ Shared quote cache delete failed: %s", e)
     
     def fetch_with_fallback(self, symbol_key: str):
         """Try primary symbol, then alternatives if it fails"""
-        symbol_config = self.symbols[symbol_key]
-        symbols_to_try = []
-        
-        # Primary symbol
-        if 'yahoo_finance' in symbol_config:
-            symbols_to_try.append(symbol_config['yahoo_finance'])
-        
-        # Backup symbols
-        for key in symbol_config:
-            if key.startswith('yahoo_finance_backup'):
-                symbols_to_try.append(symbol_config[key])
+        primary_symbol = self.symbols[symbol_key].get('yahoo_finance')
+        symbols_to_try = self._fallback_chain[symbol_key]
         
-        self.logger.info(f"🔄 Attempting to fetch {symbol_key} with {len(symbols_to_try)} symbols")
+        self.logger.info("🔄 Attempting to fetch %s with %s symbols", symbol_key, len(symbols_to_try))
         
         for symbol in symbols_to_try:
             try:
-                self.logger.info(f"🔄 Trying Yahoo Finance symbol: {symbol} for {symbol_key}")
+                self.logger.info("🔄 Trying Yahoo Finance symbol: %s for %s", symbol, symbol_key)
                 
-                # Validate symbol first
-                if not self.validate_symbol(symbol):
-                    self.logger.warning(f"⚠️ Symbol {symbol} failed validation, trying next...")
+                # Validate backup symbols first; the primary symbol's own history fetch and
+                # validate_market_data already prove whether it works
+                if symbol != primary_symbol and not self.validate_symbol(symbol):
+                    self.logger.warning("⚠️ Symbol %s failed validation, trying next...", symbol)
                     continue
                 
-                ticker = yf.Ticker(symbol)
+                ticker = yf.Ticker(symbol, session=self._yf_session)
                 
-                # Add timeout and retry logic with exponential backoff
-                max_retries = 3
-                retry_count = 0
-                base_delay = 2
+                # Transport failures are retried with backoff by the shared yfinance session
+                self.logger.info("📊 Fetching data for %s", symbol)
+                current_data = ticker.history(period='5d', interval='1d', timeout=15)
                 
-                while retry_count < max_retries:
-                    try:
-                        self.logger.info(f"📊 Fetching data for {symbol} (attempt {retry_count + 1}/{max_retries})")
-                        # Get recent data with smaller period for faster response
-                        current_data = ticker.history(period='5d', interval='1d', timeout=15)
-                        break
-                    except Exception as retry_error:
-                        retry_count += 1
-                        delay = base_delay * (2 ** (retry_count - 1))  # Exponential backoff
-                        self.logger.warning(f"⚠️ Retry {retry_count}/{max_retries} for {symbol}: {str(retry_error)}")
-                        if retry_count < max_retries:
-                            self.logger.info(f"⏳ Waiting {delay} seconds before retry...")
-                            time.sleep(delay)
-                        else:
-                            raise retry_error
-                
-                self.logger.info(f"📊 Data length for {symbol}: {len(current_data)} rows")
+                self.logger.info("📊 Data length for %s: %s rows", symbol, len(current_data))
                 
                 if len(current_data) >= 1:
-                    # Get current/last available price - try to get most recent quote first
-                    current_price = current_data['Close'].iloc[-1]
-                    today_data = current_data.iloc[-1]
+                    # Get current/last available price - try to get most recent quote first.
+                    # One Close/High/Low array read by position avoids per-access pandas indexing
+                    values = current_data[['Close', 'High', 'Low']].to_numpy(dtype=np.float64)
+                    current_price = float(values[-1, 0])
+                    today_high = float(values[-1, 1])
+                    today_low = float(values[-1, 2])
                     
                     # For Gold specifically, try to get live quote for more accuracy
                     if symbol_key == 'gold':
@@ -203,12 +543,12 @@ class EnhancedDataFeed:
                             # Try to get current market price (last traded price)
                             live_data = ticker.history(period='1d', interval='1m')
                             if len(live_data) > 0:
-                                live_price = live_data['Close'].iloc[-1]
+                                live_price = float(live_data['Close'].values[-1])
                                 if live_price > 0 and abs(live_price - current_price) < (current_price * 0.1):  # Sanity check
                                     current_price = live_price
-                                    self.logger.info(f"🔴 Updated {symbol} with live price: {current_price}")
+                                    self.logger.info("🔴 Updated %s with live price: %s", symbol, current_price)
                         except Exception as live_error:
-                            self.logger.warning(f"⚠️ Could not get live price for {symbol}: {live_error}")
+                            self.logger.warning("⚠️ Could not get live price for %s: %s", symbol, live_error)
                     
                     # For previous close, use real-time info from ticker.info if available
                     previous_price = None
@@ -217,23 +557,23 @@ class EnhancedDataFeed:
                         info = ticker.info
                         if 'previousClose' in info and info['previousClose'] > 0:
                             previous_price = info['previousClose']
-                            self.logger.info(f"📊 Using ticker.info previousClose: {previous_price}")
+                            self.logger.info("📊 Using ticker.info previousClose: %s", previous_price)
                         elif 'regularMarketPreviousClose' in info and info['regularMarketPreviousClose'] > 0:
                             previous_price = info['regularMarketPreviousClose']
-                            self.logger.info(f"📊 Using regularMarketPreviousClose: {previous_price}")
+                            self.logger.info("📊 Using regularMarketPreviousClose: %s", previous_price)
                     except Exception as info_error:
-                        self.logger.warning(f"⚠️ Could not get ticker.info: {info_error}")
+                        self.logger.warning("⚠️ Could not get ticker.info: %s", info_error)
                     
                     # Fallback to historical data if info not available
                     if previous_price is None and len(current_data) >= 2:
-                        previous_price = current_data['Close'].iloc[-2]
-                        self.logger.info(f"📊 Using historical data previousClose: {previous_price}")
+                        previous_price = float(values[-2, 0])
+                        self.logger.info("📊 Using historical data previousClose: %s", previous_price)
                     elif previous_price is None:
                         # Use current price as fallback
                         previous_price = current_price
-                        self.logger.warning(f"⚠️ Using current price as previous close fallback")
+                        self.logger.warning("⚠️ Using current price as previous close fallback")
                     
-                    self.logger.info(f"💰 {symbol} - Current: {current_price}, Previous: {previous_price}")
+                    self.logger.info("💰 %s - Current: %s, Previous: %s", symbol, current_price, previous_price)
                     
                     # Enhanced data validation
                     if self.validate_market_data(current_price, previous_price, symbol):
@@ -248,42 +588,36 @@ class EnhancedDataFeed:
                             'previous_close': previous_price,
                             'change': change,
                             'change_percent': change_percent,
-                            'high': today_data['High'],
-                            'low': today_data['Low'],
+                            'high': today_high,
+                            'low': today_low,
                             'source': f'Yahoo Finance ({symbol})',
                             'timestamp': datetime.now().isoformat()
                         }
                         
-                        self.logger.info(f"✅ Successfully fetched {symbol_key} data from {symbol}")
+                        self.logger.info("✅ Successfully fetched %s data from %s", symbol_key, symbol)
                         return result
                     else:
-                        self.logger.warning(f"⚠️ Data validation failed for {symbol}")
+                        self.logger.warning("⚠️ Data validation failed for %s", symbol)
                 else:
-                    self.logger.warning(f"⚠️ Insufficient data for {symbol}: {len(current_data)} rows")
-                    # Try to get info about the ticker
-                    try:
-                        info = ticker.info
-                        self.logger.info(f"ℹ️ Ticker info for {symbol}: {info.get('shortName', 'Unknown')}")
-                    except:
-                        self.logger.info(f"ℹ️ No ticker info available for {symbol}")
+                    self.logger.warning("⚠️ Insufficient data for %s: %s rows", symbol, len(current_data))
                         
             except Exception as e:
-                self.logger.error(f"❌ Yahoo Finance error for {symbol_key} ({symbol}): {str(e)}")
+                self.logger.error("❌ Yahoo Finance error for %s (%s): %s", symbol_key, symbol, e)
                 # Enhanced error categorization
                 error_msg = str(e).lower()
                 if "symbol may be delisted" in error_msg:
-                    self.logger.error(f"🚫 Symbol {symbol} may be delisted or unavailable")
+                    self.logger.error("🚫 Symbol %s may be delisted or unavailable", symbol)
                 elif "rate limit" in error_msg:
-                    self.logger.error(f"⏰ Rate limit hit for {symbol}")
+                    self.logger.error("⏰ Rate limit hit for %s", symbol)
                 elif "timeout" in error_msg:
-                    self.logger.error(f"⏱️ Timeout for {symbol}")
+                    self.logger.error("⏱️ Timeout for %s", symbol)
                 elif "connection" in error_msg:
-                    self.logger.error(f"🌐 Connection error for {symbol}")
+                    self.logger.error("🌐 Connection error for %s", symbol)
                 elif "not found" in error_msg:
-                    self.logger.error(f"🔍 Symbol {symbol} not found")
+                    self.logger.error("🔍 Symbol %s not found", symbol)
                 continue
         
-        self.logger.error(f"❌ All symbols failed for {symbol_key}")
+        self.logger.error("❌ All symbols failed for %s", symbol_key)
         return None
 
     def validate_market_data(self, current_price, previous_price, symbol):
@@ -291,90 +625,191 @@ class EnhancedDataFeed:
         try:
             # Check for valid prices
             if not (isinstance(current_price, (int, float)) and isinstance(previous_price, (int, float))):
-                self.logger.warning(f"⚠️ Invalid price types for {symbol}")
+                self.logger.warning("⚠️ Invalid price types for %s", symbol)
                 return False
             
             # Check for positive prices
             if current_price <= 0 or previous_price <= 0:
-                self.logger.warning(f"⚠️ Non-positive prices for {symbol}: current={current_price}, previous={previous_price}")
+                self.logger.warning("⚠️ Non-positive prices for %s: current=%s, previous=%s", symbol, current_price, previous_price)
                 return False
             
             # Check for reasonable price ranges based on symbol
-            if symbol.startswith('^DJI') or symbol == 'DJIA':
-                # Dow Jones should be in 20,000-50,000 range
-                if not (20000 <= current_price <= 50000):
-                    self.logger.warning(f"⚠️ Unusual Dow Jones price: {current_price}")
-                    return False
-            elif symbol.startswith('GC') or 'GOLD' in symbol.upper():
-                # Gold should be in 1,000-5,000 range
-                if not (1000 <= current_price <= 5000):
-                    self.logger.warning(f"⚠️ Unusual Gold price: {current_price}")
-                    return False
-            elif symbol.startswith('^NDX'):
-                # NASDAQ should be in 10,000-30,000 range
-                if not (10000 <= current_price <= 30000):
-                    self.logger.warning(f"⚠️ Unusual NASDAQ price: {current_price}")
-                    return False
+            if symbol in self._price_bounds:
+                bounds = self._price_bounds[symbol]
+            else:
+                bounds = self._price_bounds[symbol] = price_bounds_for_symbol(symbol)
+            if bounds is not None and not (bounds[1] <= current_price <= bounds[2]):
+                self.logger.warning("⚠️ Unusual %s price: %s", bounds[0], current_price)
+                return False
             
             # Check for reasonable change percentage (not more than 50% in one day)
             change_percent = abs((current_price - previous_price) / previous_price * 100)
             if change_percent > 50:
-                self.logger.warning(f"⚠️ Unusual price change for {symbol}: {change_percent:.2f}%")
+                self.logger.warning("⚠️ Unusual price change for %s: %.2f%%", symbol, change_percent)
                 return False
             
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Data validation error for {symbol}: {str(e)}")
+            self.logger.error("❌ Data validation error for %s: %s", symbol, e)
             return False
 
+    def validate_market_data_batch(self, current_prices, previous_prices, symbols):
+        """Vectorized validate_market_data for many symbols; returns a boolean mask in input order"""
+        bounds = []
+        for symbol in symbols:
+            if symbol not in self._price_bounds:
+                self._price_bounds[symbol] = price_bounds_for_symbol(symbol)
+            symbol_bounds = self._price_bounds[symbol]
+            bounds.append((symbol_bounds[1], symbol_bounds[2]) if symbol_bounds else (0, np.inf))
+        
+        current = np.asarray(current_prices, dtype=np.float64)
+        previous = np.asarray(previous_prices, dtype=np.float64)
+        low, high = np.asarray(bounds, dtype=np.float64).reshape(-1, 2).T
+        
+        # NaN prices fail every comparison, matching the scalar type check
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (
+                (current > 0) & (previous > 0)
+                & (current >= low) & (current <= high)
+                & (np.abs((current - previous) / previous) * 100 <= 50)
+            )
+    
     def get_yahoo_finance_data(self, symbol_key):
         """Get data from Yahoo Finance with enhanced error handling"""
-        if not self.sources['yahoo_finance']['enabled']:
-            self.logger.warning(f"⚠️ Yahoo Finance disabled for {symbol_key}")
+        if not self._yahoo_enabled:
+            self.logger.warning("⚠️ Yahoo Finance disabled for %s", symbol_key)
             return None
+        
+        cache_key = ('yahoo_finance', symbol_key)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
             
         if not self._rate_limit_check('yahoo_finance'):
-            self.logger.warning(f"⚠️ Rate limit active for Yahoo Finance")
+            self.logger.warning("⚠️ Rate limit active for Yahoo Finance")
             return None
         
-        return self.fetch_with_fallback(symbol_key)
+        data = self.fetch_with_fallback(symbol_key)
+        if data:
+            self.connection_status['yahoo_finance'] = True
+            self._cache_put(cache_key, data)
+        return data
+    
+    def get_yahoo_finance_batch(self, symbol_keys):
+        """Fetch the primary Yahoo symbol for several keys with one yf.download call.
+        Five days are requested so the last two sessions are present after weekends and holidays"""
+        if not self._yahoo_enabled or not symbol_keys:
+            return {}
+        
+        yahoo_symbols = {key: self.symbols[key]['yahoo_finance'] for key in symbol_keys
+                         if 'yahoo_finance' in self.symbols.get(key, {})}
+        if not yahoo_symbols:
+            return {}
+        
+        try:
+            self.logger.info("📊 Batch fetching %s from Yahoo Finance", ', '.join(yahoo_symbols.values()))
+            frame = yf.download(
+                ' '.join(yahoo_symbols.values()),
+                period='5d',
+                interval='1d',
+                group_by='ticker',
+                threads=True,
+                progress=False,
+                auto_adjust=False,
+                timeout=15,
+                session=self._yf_session
+            )
+            self._update_request_time('yahoo_finance')
+        except Exception as e:
+            self.logger.error("❌ Yahoo Finance batch download failed: %s", e)
+            return {}
+        
+        # (symbol_key, symbol, current, previous, high, low) for every symbol with two closes
+        rows = []
+        for symbol_key, symbol in yahoo_symbols.items():
+            try:
+                if isinstance(frame.columns, pd.MultiIndex):
+                    if symbol not in frame.columns.get_level_values(0):
+                        continue
+                    symbol_frame = frame[symbol]
+                else:
+                    symbol_frame = frame
+                values = symbol_frame[['Close', 'High', 'Low']].to_numpy(dtype=np.float64)
+                values = values[~np.isnan(values[:, 0])]
+                if len(values) < 2:
+                    continue
+                
+                rows.append((
+                    symbol_key,
+                    symbol,
+                    float(values[-1, 0]),
+                    float(values[-2, 0]),
+                    float(values[-1, 1]),
+                    float(values[-1, 2])
+                ))
+            except Exception as e:
+                self.logger.error("❌ Yahoo Finance batch parse error for %s (%s): %s", symbol_key, symbol, e)
+        
+        if not rows:
+            return {}
+        
+        valid = self.validate_market_data_batch(
+            [row[2] for row in rows], [row[3] for row in rows], [row[1] for row in rows]
+        )
+        
+        results = {}
+        for (symbol_key, symbol, current_price, previous_price, high, low), is_valid in zip(rows, valid):
+            if not is_valid:
+                self.logger.warning("⚠️ Data validation failed for %s: current=%s, previous=%s", symbol, current_price, previous_price)
+                continue
+            
+            change = current_price - previous_price
+            data = {
+                'price': current_price,
+                'previous_close': previous_price,
+                'change': change,
+                'change_percent': (change / previous_price) * 100,
+                'high': high,
+                'low': low,
+                'source': f'Yahoo Finance ({symbol})',
+                'timestamp': datetime.now().isoformat()
+            }
+            self.last_successful_fetch[symbol_key] = datetime.now()
+            self.connection_status['yahoo_finance'] = True
+            self._cache_put(('yahoo_finance', symbol_key), data)
+            results[symbol_key] = data
+        
+        return results
     
     def get_finnhub_data(self, symbol_key):
         """Get data from Finnhub API"""
-        if not self.sources['finnhub']['enabled']:
+        if not self._finnhub_enabled:
             return None
+        
+        cache_key = ('finnhub', symbol_key)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
             
         if not self._rate_limit_check('finnhub'):
             return None
             
         try:
-            # Map symbol keys to Finnhub symbols
-            finnhub_symbols = {
-                'nasdaq': '^NDX',
-                'gold': 'XAUUSD',
-                'dow': '^DJI'
-            }
-            
-            symbol = finnhub_symbols.get(symbol_key)
+            symbol = FINNHUB_SYMBOLS.get(symbol_key)
             if not symbol:
                 return None
-                
-            params = {
-                'symbol': symbol,
-                'token': self.sources['finnhub']['api_key']
-            }
             
-            response = requests.get(
-                f"{self.sources['finnhub']['base_url']}/quote",
-                params=params,
+            response = self._session.get(
+                self._finnhub_quote_url,
+                params={**self._finnhub_params, 'symbol': symbol},
                 timeout=10
             )
             
             self._update_request_time('finnhub')
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_json(response)
                 
                 if 'c' in data and data['c'] > 0:
                     current_price = data['c']
@@ -382,7 +817,7 @@ class EnhancedDataFeed:
                     change = current_price - previous_close
                     change_percent = (change / previous_close) * 100
                     
-                    return {
+                    result = {
                         'price': current_price,
                         'previous_close': previous_close,
                         'change': change,
@@ -391,38 +826,44 @@ class EnhancedDataFeed:
                         'low': data.get('l', current_price),
                         'source': 'Finnhub'
                     }
+                    self._cache_put(cache_key, result)
+                    return result
                     
         except Exception as e:
-            self.logger.error(f"❌ Finnhub error for {symbol_key}: {str(e)}")
+            self.logger.error("❌ Finnhub error for %s: %s", symbol_key, e)
             
         return None
     
     def get_alpha_vantage_data(self, symbol_key):
         """Get data from Alpha Vantage API"""
-        if not self.sources['alpha_vantage']['enabled']:
+        if not self._av_enabled:
             return None
+        
+        # The demo key only serves Alpha Vantage's sample symbols, so real quotes can never succeed
+        if self._av_quote_params['apikey'] in (None, '', 'demo'):
+            return None
+        
+        cache_key = ('alpha_vantage', symbol_key)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
             
         if not self._rate_limit_check('alpha_vantage'):
             return None
             
         try:
             symbol = self.symbols[symbol_key]['alpha_vantage']
-            params = {
-                'function': 'GLOBAL_QUOTE',
-                'symbol': symbol,
-                'apikey': self.sources['alpha_vantage']['api_key']
-            }
             
-            response = requests.get(
-                self.sources['alpha_vantage']['base_url'],
-                params=params,
+            response = self._session.get(
+                self._av_url,
+                params={**self._av_quote_params, 'symbol': symbol},
                 timeout=10
             )
             
             self._update_request_time('alpha_vantage')
             
             if response.status_code == 200:
-                data = response.json()
+                data = self._decode_json(response)
                 
                 if 'Global Quote' in data and data['Global Quote']:
                     quote = data['Global Quote']
@@ -435,98 +876,168 @@ class EnhancedDataFeed:
                     # Clean up percentage string
                     change_percent = float(change_percent_str.replace('%', ''))
                     
-                    return {
+                    # The quote already carries the session range, so no intraday series request is needed
+                    high = float(quote.get('03. high') or 0) or current_price
+                    low = float(quote.get('04. low') or 0) or current_price
+                    
+                    result = {
                         'price': current_price,
                         'previous_close': previous_close,
                         'change': change,
                         'change_percent': change_percent,
-                        'high': current_price,  # Simplified for demo API
-                        'low': current_price,   # Simplified for demo API
+                        'high': high,
+                        'low': low,
                         'source': 'Alpha Vantage'
                     }
+                    self._cache_put(cache_key, result)
+                    return result
                     
         except Exception as e:
-            self.logger.error(f"❌ Alpha Vantage error for {symbol_key}: {str(e)}")
+            self.logger.error("❌ Alpha Vantage error for %s: %s", symbol_key, e)
             
         return None
     
     def get_market_data(self, symbol_key):
+        """Get market data, sharing one fetch between concurrent callers for the same symbol"""
+        cached = self._cached_market_data(symbol_key)
+        if cached is not None:
+            return cached
+        
+        with self._inflight_lock:
+            call = self._inflight.get(symbol_key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[symbol_key] = {'event': threading.Event(), 'result': None}
+        
+        if not is_leader:
+            self.logger.info("⏳ Waiting on in-flight %s fetch...", symbol_key.upper())
+            call['event'].wait(timeout=INFLIGHT_WAIT_TIMEOUT)
+            return call['result']
+        
+        try:
+            call['result'] = self._fetch_market_data(symbol_key)
+            if call['result']:
+                self._store_market_data(symbol_key, call['result'])
+            return call['result']
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(symbol_key, None)
+            call['event'].set()
+    
+    def _fetch_market_data(self, symbol_key):
         """Get market data with enhanced fallback to multiple sources"""
-        self.logger.info(f"📊 Fetching {symbol_key.upper()} data...")
-        
-        # Add delay between requests to avoid rate limits
-        if self.last_request_time:
-            time_since_last = time.time() - max(self.last_request_time.values())
-            if time_since_last < 3:  # At least 3 seconds between any requests
-                sleep_time = 3 - time_since_last
-                self.logger.info(f"⏳ Waiting {sleep_time:.1f}s to avoid rate limits...")
-                time.sleep(sleep_time)
-        
-        # Try Yahoo Finance first (most reliable)
-        data = self.get_yahoo_finance_data(symbol_key)
-        if data:
-            self.logger.info(f"✅ {symbol_key.upper()} data from Yahoo Finance")
-            return data
+        self.logger.info("📊 Fetching %s data...", symbol_key.upper())
         
-        # Try Finnhub as second option
-        data = self.get_finnhub_data(symbol_key)
-        if data:
-            self.logger.info(f"✅ {symbol_key.upper()} data from Finnhub")
-            return data
+        # Yahoo Finance is the most reliable source and has no request quota, so it gets a head start
+        primary = _EXECUTOR.submit(self.get_yahoo_finance_data, symbol_key)
+        futures = {primary: 'Yahoo Finance'}
+        wait([primary], timeout=PRIMARY_SOURCE_GRACE)
         
-        # Try Alpha Vantage as last resort
-        data = self.get_alpha_vantage_data(symbol_key)
-        if data:
-            self.logger.info(f"✅ {symbol_key.upper()} data from Alpha Vantage")
-            return data
+        # Finnhub and Alpha Vantage requests (rate limited) are only spent when Yahoo is slow or came back empty;
+        # from here on every source races, Yahoo included
+        if not (primary.done() and primary.exception() is None and primary.result()):
+            futures[_EXECUTOR.submit(self.get_finnhub_data, symbol_key)] = 'Finnhub'
+            futures[_EXECUTOR.submit(self.get_alpha_vantage_data, symbol_key)] = 'Alpha Vantage'
+        
+        try:
+            for future in as_completed(futures, timeout=MARKET_DATA_TIMEOUT):
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.logger.error("❌ %s error for %s: %s", futures[future], symbol_key, e)
+                    continue
+                if data:
+                    for other in futures:
+                        other.cancel()
+                    self.logger.info("✅ %s data from %s", symbol_key.upper(), futures[future])
+                    return data
+        except FuturesTimeoutError:
+            self.logger.error("⏱️ Timed out waiting for %s data sources", symbol_key)
         
         # If all sources fail
-        self.logger.error(f"❌ All data sources failed for {symbol_key}")
+        self.logger.error("❌ All data sources failed for %s", symbol_key)
+        return None
+    
+    async def get_market_data_async(self, symbol_key):
+        """Get market data by querying every source concurrently and returning the first valid quote"""
+        cached = self._cached_market_data(symbol_key)
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        # The source clients are blocking, so each one runs on the shared worker pool.
+        # Yahoo Finance gets the same head start as in the threaded path before the rate-limited sources are spent
+        primary = loop.run_in_executor(_EXECUTOR, self.get_yahoo_finance_data, symbol_key)
+        pending = {primary}
+        sources = {primary: 'Yahoo Finance'}
+        await asyncio.wait(pending, timeout=PRIMARY_SOURCE_GRACE)
+        if not (primary.done() and primary.exception() is None and primary.result()):
+            for name, fetch in (('Finnhub', self.get_finnhub_data), ('Alpha Vantage', self.get_alpha_vantage_data)):
+                future = loop.run_in_executor(_EXECUTOR, fetch, symbol_key)
+                sources[future] = name
+                pending.add(future)
+        
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.logger.error("❌ %s error for %s: %s", sources[future], symbol_key, e)
+                    continue
+                if data:
+                    for other in pending:
+                        other.cancel()
+                    self.logger.info("✅ %s data from %s", symbol_key.upper(), sources[future])
+                    self._store_market_data(symbol_key, data)
+                    return data
+        
+        self.logger.error("❌ All data sources failed for %s", symbol_key)
         return None
     
+    def get_all_market_data(self, symbol_keys=('nasdaq', 'gold', 'dow')):
+        """Get market data for several symbols at once: cached quotes, then one batched Yahoo
+        download, then the full per-symbol fallback chain for the rest, one thread per symbol"""
+        results = {}
+        pending = []
+        for symbol_key in symbol_keys:
+            cached = self._cached_market_data(symbol_key)
+            if cached is None:
+                cached = self._cache_get(('yahoo_finance', symbol_key))
+            if cached is not None:
+                results[symbol_key] = cached
+            else:
+                pending.append(symbol_key)
+        
+        for symbol_key, data in self.get_yahoo_finance_batch(pending).items():
+            self._store_market_data(symbol_key, data)
+            results[symbol_key] = data
+        pending = [symbol_key for symbol_key in pending if symbol_key not in results]
+        if not pending:
+            return results
+        
+        # A dedicated pool: each get_market_data call itself waits on the shared source pool
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='datafeed-symbol') as executor:
+            futures = {executor.submit(self.get_market_data, symbol_key): symbol_key for symbol_key in pending}
+            for future in as_completed(futures):
+                symbol_key = futures[future]
+                try:
+                    results[symbol_key] = future.result()
+                except Exception as e:
+                    self.logger.error("❌ Error fetching %s: %s", symbol_key, e)
+                    results[symbol_key] = None
+        
+        return results
+    
     def format_market_data(self, data, symbol_key):
         """Format market data for display"""
         if not data:
-            return {
-                'price': '--',
-                'change': '--',
-                'changePercent': '--',
-                'rawChange': 0,
-                'previousClose': '--',
-                'high': '--',
-                'low': '--',
-                'source': 'No Data'
-            }
-        
-        # Format based on symbol type
-        if symbol_key == 'gold':
-            price_str = f"{data['price']:.2f}"
-            change_str = f"{data['change']:+.2f}"
-            change_percent_str = f"{data['change_percent']:+.2f}%"
-            prev_close_str = f"{data['previous_close']:.2f}"
-            high_str = f"{data['high']:.2f}"
-            low_str = f"{data['low']:.2f}"
-        else:
-            price_str = f"{data['price']:,.2f}"
-            change_str = f"{data['change']:+.2f}"
-            change_percent_str = f"{data['change_percent']:+.2f}%"
-            prev_close_str = f"{data['previous_close']:,.2f}"
-            high_str = f"{data['high']:,.2f}"
-            low_str = f"{data['low']:,.2f}"
-        
-        return {
-            'price': price_str,
-            'change': change_str,
-            'changePercent': change_percent_str,
-            'rawChange': data['change'],
-            'previousClose': prev_close_str,
-            'high': high_str,
-            'low': low_str,
-            'source': data['source']
-        }
+            return DEFAULT_EMPTY
+        return self._formatters[symbol_key](data)
 
     def get_connection_status(self):
         """Get current connection status for all sources"""
+        self.yahoo_ok  # Runs the deferred Yahoo connection test if no fetch has settled it yet
         return self.connection_status
 
     def get_last_successful_fetch(self):
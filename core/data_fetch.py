@@ -6,12 +6,261 @@ Fetches historical price data for trading signals
 
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 from typing import Optional
+from functools import lru_cache
+from collections import namedtuple
 import time
 import re
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import lxml
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# libxml2-backed parser is several times faster than the pure-Python html.parser on full pages
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# google-re2 matches in guaranteed linear time and outpaces re on findall-heavy sweeps; the sweep
+# patterns below stay within the RE2 syntax and use inline (?i) so either engine compiles them
+_SWEEP_RE = re2 if RE2_AVAILABLE else re
+
+
+# Price-scraping patterns shared by the MarketWatch scrapers, compiled once at import
+# Previous close, day range, high and low in one pass. Groups 1-2 are the previous close label and
+# value (one or two decimals); groups 3-5 the day range/high/low label and value(s) (two decimals)
+_QUOTE_FIELDS_RE = _SWEEP_RE.compile(
+    r'(?i)(PREVIOUS\s+CLOSE)[:\s]*(\d{2},\d{3}\.\d{1,2})'
+    r'|(DAY\s+RANGE|HIGH|LOW)[:\s]*(\d{2},\d{3}\.\d{2})(?:[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2}))?'
+)
+_BARE_RANGE_RE = _SWEEP_RE.compile(r'(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})')
+_PRICE_TOKEN_RE = _SWEEP_RE.compile(r'(\d{2},\d{3}\.\d{2})')
+_NUMBER_RE = _SWEEP_RE.compile(r'[0-9,]+\.[0-9]{2}')
+_PRICE_CLASS_RE = re.compile(r'price|value|quote', re.IGNORECASE)
+_PRICE_TAGS = frozenset(('span', 'div', 'p'))
+
+# Library module: log through the module logger and leave handler setup to the application
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Browser-like MarketWatch request headers (needed to avoid 401s), attached to the session once.
+# Accept-Encoding is left to requests so it only advertises encodings it can decode
+_MW_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Upgrade-Insecure-Requests': '1',
+    'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache',
+    'Referer': 'https://www.google.com/',
+}
+
+# Shared HTTP session so repeated MarketWatch scrapes reuse pooled keep-alive TCP/TLS connections.
+# Only connection errors and retryable statuses are retried: a read timeout is final, so a scrape's worst
+# case stays near one read timeout (30s for US30) instead of three, inside gunicorn's 60s worker timeout
+_SESSION = requests.Session()
+_SESSION_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+# Seconds to wait for the TCP/TLS connect; the caller's timeout only bounds the read
+CONNECT_TIMEOUT = 5
+_SESSION.mount('https://', _SESSION_ADAPTER)
+_SESSION.mount('http://', _SESSION_ADAPTER)
+_SESSION.headers.update(_MW_HEADERS)
+atexit.register(_SESSION.close)
+
+# yfinance Ticker.info responses per symbol: symbol -> (fetched_at, info). Each .info call is
+# several Yahoo requests, and the same index symbols are looked up many times a minute
+TICKER_INFO_TTL = 60
+_TICKER_INFO_CACHE = {}
+_TICKER_INFO_LOCK = threading.Lock()
+
+# Upper bound on symbols fetched in parallel by fetch_many_last_two_1h_bars
+FETCH_MAX_WORKERS = 4
+
+# ETag/Last-Modified validators per MarketWatch URL: url -> (etag, last_modified, body, parsed quote)
+_CONDITIONAL_CACHE = {}
+_CONDITIONAL_CACHE_LOCK = threading.Lock()
+
+
+def _get_ticker_info(symbol: str) -> dict:
+    """Return yf.Ticker(symbol).info, reusing a response younger than TICKER_INFO_TTL seconds"""
+    now = time.time()
+    with _TICKER_INFO_LOCK:
+        cached = _TICKER_INFO_CACHE.get(symbol)
+    if cached and now - cached[0] < TICKER_INFO_TTL:
+        return cached[1]
+    
+    info = yf.Ticker(symbol).info
+    with _TICKER_INFO_LOCK:
+        _TICKER_INFO_CACHE[symbol] = (now, info)
+    return info
+
+
+# Per-day offsets used to synthesize plausible bars: seeds in [-50, 50), variation in [-100, 100)
+_DateSeeds = namedtuple('_DateSeeds', ['close', 'open', 'prev', 'variation'])
+
+
+@lru_cache(maxsize=8)
+def _date_seeds(day) -> _DateSeeds:
+    """
+    Deterministic synthetic-bar offsets for a date, computed once per day
+    
+    Derived from the date's ordinal instead of hash(str(date)): no string building, and the
+    values match across processes and restarts (str hashes are salted per interpreter).
+    """
+    n = day.toordinal()
+    
+    def mix(salt, modulus):
+        # Small integer hash (multiply/xor-shift) so nearby days and salts land far apart
+        x = (n * 0x9E3779B1 + salt) & 0xFFFFFFFF
+        x = ((x ^ (x >> 16)) * 0x45D9F3B) & 0xFFFFFFFF
+        return (x ^ (x >> 16)) % modulus
+    
+    return _DateSeeds(mix(0, 100) - 50, mix(1, 100) - 50, mix(2, 100) - 50, mix(0, 200) - 100)
+
+
+_BAR_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+def _two_bar_frame(prev_bar: tuple, curr_bar: tuple, now: datetime, symbol: str, source: str) -> pd.DataFrame:
+    """
+    Build the two-row OHLC frame (previous hour, last hour) returned by the synthetic fetch paths
+    
+    The bars go in as one float64 array so pandas takes its 2-D block path instead of inferring
+    a dtype for every column of a dict.
+    """
+    hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
+    hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+    
+    df = pd.DataFrame(np.array([prev_bar, curr_bar], dtype=np.float64), columns=_BAR_COLUMNS,
+                      index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
+    df.attrs['symbol'] = symbol
+    df.attrs['source'] = source
+    return df
+
+
+def _conditional_get(url: str, timeout: float):
+    """
+    GET a page, revalidating against the last response with If-None-Match/If-Modified-Since
+    
+    Returns:
+        tuple: (body, quote) where quote is the (current_price, previous_close, today_high, today_low)
+        parsed from the cached body when the server answers 304, otherwise None
+    """
+    with _CONDITIONAL_CACHE_LOCK:
+        cached = _CONDITIONAL_CACHE.get(url)
+    
+    request_headers = {}
+    if cached:
+        etag, last_modified = cached[0], cached[1]
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+    
+    response = _SESSION.get(url, headers=request_headers, timeout=(CONNECT_TIMEOUT, timeout))
+    if response.status_code == 304 and cached:
+        return cached[2], cached[3]
+    response.raise_for_status()
+    
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    with _CONDITIONAL_CACHE_LOCK:
+        if etag or last_modified:
+            _CONDITIONAL_CACHE[url] = (etag, last_modified, response.content, None)
+        else:
+            _CONDITIONAL_CACHE.pop(url, None)
+    return response.content, None
+
+
+def _remember_quote(url: str, quote: tuple):
+    """Attach the values parsed from a page to its conditional-GET cache entry"""
+    with _CONDITIONAL_CACHE_LOCK:
+        cached = _CONDITIONAL_CACHE.get(url)
+        if cached:
+            _CONDITIONAL_CACHE[url] = cached[:3] + (quote,)
+
+
+def _price_class_elements(soup: BeautifulSoup) -> list:
+    """
+    Return the span/div/p elements whose class mentions price, value or quote
+    
+    A single walk over soup.descendants is roughly 10x cheaper here than find_all with a class_
+    regex (or soup.select), which run bs4's generic per-tag matcher for every element.
+    """
+    return [node for node in soup.descendants
+            if node.name in _PRICE_TAGS and _PRICE_CLASS_RE.search(' '.join(node.attrs.get('class', ())))]
+
+
+def _extract_marketwatch_quote(soup: BeautifulSoup, low_bound: float, high_bound: float) -> tuple:
+    """
+    Read the quote from MarketWatch's quote widgets instead of scanning the whole page text
+    
+    Args:
+        soup (BeautifulSoup): Parsed MarketWatch index page
+        low_bound (float): Lowest plausible price for the index
+        high_bound (float): Highest plausible price for the index
+    
+    Returns:
+        tuple: (current_price, previous_close, today_high, today_low), with None for any
+        field whose widget is missing or out of range
+    """
+    def in_range(text):
+        try:
+            value = float(text.replace(',', '').strip())
+        except (AttributeError, ValueError):
+            return None
+        return value if low_bound <= value <= high_bound else None
+    
+    current_price = previous_close = today_high = today_low = None
+    
+    price_node = soup.select_one('.intraday__price bg-quote, .intraday__price .value')
+    if price_node is not None:
+        current_price = in_range(price_node.get_text(strip=True))
+    
+    # Key data list: <li class="kv__item"><small class="label">Previous Close</small><span class="primary">...</span></li>
+    for item in soup.select('li.kv__item'):
+        label = item.find('small')
+        value = item.find(class_='primary')
+        if label is None or value is None:
+            continue
+        label = label.get_text(strip=True).lower()
+        if label == 'previous close' and previous_close is None:
+            previous_close = in_range(value.get_text(strip=True))
+        elif label == 'day range' and today_high is None:
+            low, _, high = value.get_text(strip=True).partition('-')
+            today_low, today_high = in_range(low), in_range(high)
+            if today_low is None or today_high is None:
+                today_low = today_high = None
+    
+    return current_price, previous_close, today_high, today_low
 
 
 def fetch_yfinance_fast(symbol: str) -> pd.DataFrame:
@@ -29,7 +278,7 @@ def fetch_yfinance_fast(symbol: str) -> pd.DataFrame:
         now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
         start = now - timedelta(days=5)  # Shorter range for faster fetch
         
-        print(f"⚡ Fast fetch for {symbol} from {start} to {now}")
+        logger.info("⚡ Fast fetch for %s from %s to %s", symbol, start, now)
         
         # Download 1-hour interval data with minimal parameters for speed
         df = yf.download(
@@ -60,12 +309,12 @@ def fetch_yfinance_fast(symbol: str) -> pd.DataFrame:
         last_two_bars.attrs['symbol'] = symbol
         last_two_bars.attrs['source'] = 'yfinance_fast'
         
-        print(f"✅ Fast fetch success for {symbol}: {len(last_two_bars)} bars")
+        logger.info("✅ Fast fetch success for %s: %s bars", symbol, len(last_two_bars))
         
         return last_two_bars
         
     except Exception as e:
-        print(f"❌ Fast fetch error for {symbol}: {str(e)}")
+        logger.error("❌ Fast fetch error for %s: %s", symbol, e)
         return None
 
 
@@ -89,7 +338,7 @@ def fetch_gold_optimized(symbol: str) -> pd.DataFrame:
     # Try each gold source until we get good data
     for i, gold_symbol in enumerate(gold_sources):
         try:
-            print(f"🥇 Trying gold source {i+1}/{len(gold_sources)}: {gold_symbol}")
+            logger.info("🥇 Trying gold source %s/%s: %s", i+1, len(gold_sources), gold_symbol)
             
             result = fetch_yfinance_fast(gold_symbol)
             if result is not None and len(result) >= 2:
@@ -97,53 +346,41 @@ def fetch_gold_optimized(symbol: str) -> pd.DataFrame:
                 result.attrs['symbol'] = symbol  # Keep original symbol
                 result.attrs['source'] = f'gold_optimized_{gold_symbol}'
                 
-                print(f"✅ Gold data success with {gold_symbol}")
+                logger.info("✅ Gold data success with %s", gold_symbol)
                 return result
                 
         except Exception as e:
-            print(f"⚠️ Gold source {gold_symbol} failed: {str(e)[:50]}")
+            logger.warning("⚠️ Gold source %s failed: %s", gold_symbol, str(e)[:50])
             continue
     
     # If all gold sources fail, raise an error
-    print(f"❌ All gold data sources failed for {symbol}")
+    logger.error("❌ All gold data sources failed for %s", symbol)
     raise ValueError(f"Could not fetch gold data for {symbol}")
 
 
-def fetch_nasdaq_marketwatch_data(symbol: str) -> pd.DataFrame:
+def _scrape_marketwatch_index(url: str, symbol: str, low_bound: float, high_bound: float, source_tag: str,
+                              label: str, yf_symbol: str, fallback, timeout: float) -> pd.DataFrame:
     """
-    Fetch NASDAQ-100 data by web scraping marketwatch.com
+    Scrape an index quote page on marketwatch.com into the last two 1-hour bars
     
     Args:
-        symbol (str): The NASDAQ symbol (e.g., 'NDX', '^NDX')
+        url (str): MarketWatch index page
+        symbol (str): Symbol recorded on the returned DataFrame
+        low_bound (float): Lowest plausible price for the index
+        high_bound (float): Highest plausible price for the index
+        source_tag (str): Value for df.attrs['source']
+        label (str): Index name used in log messages
+        yf_symbol (str): yfinance symbol used to backfill a missing previous close
+        fallback (callable): Called with symbol when the page cannot be scraped
+        timeout (float): Request timeout in seconds
     
     Returns:
         pd.DataFrame: DataFrame with OHLC data for the last 2 periods
     """
     try:
-        # Clean symbol for MarketWatch URL
-        clean_symbol = symbol.replace('^', '').lower()
-        
-        print(f"🌐 Scraping NASDAQ data for {clean_symbol.upper()} from marketwatch.com...")
-        
-        # MarketWatch URL for NASDAQ-100 index
-        url = f"https://www.marketwatch.com/investing/index/{clean_symbol}"
-        print(f"🌐 Scraping from: {url}")
-        
-        # Simplified headers for faster requests
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
-        }
-        
-        # Make the request with reduced timeout for better performance
-        response = requests.get(url, headers=headers, timeout=8)
-        response.raise_for_status()
-        print(f"✅ Successfully connected to marketwatch.com")
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Make the request
+        body, cached_quote = _conditional_get(url, timeout=timeout)
+        logger.info("✅ Successfully connected to marketwatch.com")
         
         # Extract data from MarketWatch page
         current_price = None
@@ -151,220 +388,198 @@ def fetch_nasdaq_marketwatch_data(symbol: str) -> pd.DataFrame:
         today_high = None
         today_low = None
         
-        try:
-            # Get all text content for pattern matching
-            all_text = soup.get_text()
+        if cached_quote:
+            # Page unchanged since the last scrape (HTTP 304): reuse the values parsed from it
+            current_price, previous_close, today_high, today_low = cached_quote
+            logger.info("✅ MarketWatch page unchanged, reusing parsed quote")
+        else:
+            # Parse HTML
+            soup = BeautifulSoup(body, HTML_PARSER)
             
-            # Method 1: First find the PREVIOUS CLOSE to use as reference
-            prev_close_patterns = [
-                r'PREVIOUS CLOSE[:\s]*(\d{2},\d{3}\.\d{2})',
-                r'Previous Close[:\s]*(\d{2},\d{3}\.\d{2})',
-                r'PREVIOUS CLOSE[:\s]*(\d{2},\d{3}\.\d{1})',
-                r'Previous Close[:\s]*(\d{2},\d{3}\.\d{1})',
-            ]
-            
-            for pattern in prev_close_patterns:
-                matches = re.findall(pattern, all_text, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        price = float(match.replace(',', ''))
-                        if 20000 <= price <= 25000:  # NASDAQ-100 range
-                            previous_close = price
-                            print(f"✅ Found previous close: ${price:,.2f}")
-                            break
-                    except:
-                        continue
-                if previous_close:
-                    break
-            
-            # Method 2: Find the main current price display
-            # Look for the main price which is usually displayed prominently
-            
-            # Method 2a: Try to find the specific main price display area
-            # Look for structured elements that contain the main price
-            main_price_candidates = []
-            
-            # Try to find the main price in specific HTML elements
             try:
-                # Look for price in spans, divs, or other elements with price classes
-                price_elements = soup.find_all(['span', 'div', 'p'], class_=re.compile(r'price|value|quote', re.I))
-                for element in price_elements:
-                    text = element.get_text(strip=True)
-                    price_matches = re.findall(r'(\d{2},\d{3}\.\d{2})', text)
-                    for match in price_matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 20000 <= price <= 25000:
-                                main_price_candidates.append(price)
-                        except:
-                            continue
-            except:
-                pass
-            
-            # Method 2b: Look for the main price in the entire text using improved patterns
-            # Focus on the main price display patterns
-            if not main_price_candidates:
-                # Look for the main price which should be the largest/most prominent number
-                main_price_patterns = [
-                    r'(?:CLOSED|Close|Price|Current)[:\s]*(\d{2},\d{3}\.\d{2})',  # Look for labeled prices
-                    r'(\d{2},\d{3}\.\d{2})',  # All NASDAQ-range prices
-                ]
+                # Read the quote straight from MarketWatch's quote widgets
+                current_price, previous_close, today_high, today_low = _extract_marketwatch_quote(soup, low_bound, high_bound)
+                if current_price is not None:
+                    logger.debug("✅ Found current price (quote widget): $%.2f", current_price)
                 
-                for pattern in main_price_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 20000 <= price <= 25000:
-                                main_price_candidates.append(price)
-                        except:
-                            continue
-            
-            # Remove duplicates and sort
-            main_price_candidates = sorted(list(set(main_price_candidates)))
-            
-            # Method 2c: Smart selection of current price
-            if main_price_candidates and previous_close:
-                print(f"🔍 Found price candidates: {[f'${p:,.2f}' for p in main_price_candidates[:10]]}")
+                # Only sweep the whole page text for fields the widgets did not yield (layout drift)
+                all_text = soup.get_text() if None in (current_price, previous_close, today_high, today_low) else ''
                 
-                # Strategy 1: Remove previous close and pick the most likely candidate
-                # The current price should be different from previous close
-                potential_current = [p for p in main_price_candidates if abs(p - previous_close) > 1.0]
+                # The widgets only ever fill high/low together, from the day range
+                day_range_found = today_high is not None and today_low is not None
+                # Bare HIGH/LOW labels can belong to other stats (e.g. 52-week), so they only fill in for a missing day range
+                labeled_high = labeled_low = None
                 
-                if potential_current:
-                    # Strategy 2: The current price is usually the first/main one that's different
-                    # Also prefer prices that are within reasonable daily movement (< 2% typically)
-                    reasonable_moves = []
-                    for p in potential_current:
-                        move_pct = abs(p - previous_close) / previous_close
-                        if move_pct < 0.05:  # Less than 5% daily move is reasonable
-                            reasonable_moves.append((p, move_pct))
+                # Method 1: Sweep the text once for every labeled field (previous close, day range, high, low)
+                if previous_close is None or not day_range_found:
+                    for match in _QUOTE_FIELDS_RE.finditer(all_text):
+                        if match.group(1):
+                            price = float(match.group(2).replace(',', ''))
+                            if previous_close is None and low_bound <= price <= high_bound:
+                                previous_close = price
+                                logger.debug("✅ Found previous close: $%.2f", price)
+                        elif not day_range_found:
+                            field = match.group(3)[0].upper()  # D(ay range), H(igh) or L(ow)
+                            price = float(match.group(4).replace(',', ''))
+                            high_price = float(match.group(5).replace(',', '')) if match.group(5) else None
+                            if not low_bound <= price <= high_bound:
+                                continue
+                            if field == 'D':
+                                if high_price is not None and low_bound <= high_price <= high_bound:
+                                    today_low = price
+                                    today_high = high_price
+                                    day_range_found = True
+                                    logger.debug("✅ Found day range: Low $%.2f, High $%.2f", price, high_price)
+                            elif field == 'H':
+                                if labeled_high is None:
+                                    labeled_high = price
+                            elif labeled_low is None:
+                                labeled_low = price
+                        
+                        # The quote header sits near the top of the page; stop once the previous close and day range are known
+                        if previous_close is not None and day_range_found:
+                            break
+                
+                if current_price is None:
+                    # Method 2: Find the main current price display
+                    # Look for the main price which is usually displayed prominently
                     
-                    if reasonable_moves:
-                        # Sort by smallest move percentage (most likely to be current)
-                        reasonable_moves.sort(key=lambda x: x[1])
-                        current_price = reasonable_moves[0][0]
-                        print(f"✅ Found current price (reasonable move): ${current_price:,.2f}")
-                    else:
-                        # Fallback: take the first different price
-                        current_price = potential_current[0]
-                        print(f"✅ Found current price (first different): ${current_price:,.2f}")
-                else:
-                    # Last resort: take the first candidate that's not exactly the previous close
-                    different_prices = [p for p in main_price_candidates if p != previous_close]
-                    if different_prices:
-                        current_price = different_prices[0]
-                        print(f"✅ Found current price (first non-identical): ${current_price:,.2f}")
-                    else:
+                    # Method 2a: Try to find the specific main price display area
+                    # Look for structured elements that contain the main price
+                    main_price_candidates = []
+                    
+                    # Try to find the main price in specific HTML elements
+                    try:
+                        # Look for price in spans, divs, or other elements with price classes
+                        price_elements = _price_class_elements(soup)
+                        # Nested widgets repeat the same figures, so convert each distinct token once
+                        price_matches = set()
+                        for element in price_elements:
+                            text = element.get_text(strip=True)
+                            price_matches.update(_PRICE_TOKEN_RE.findall(text))
+                        for match in price_matches:
+                            try:
+                                price = float(match.replace(',', ''))
+                                if low_bound <= price <= high_bound:
+                                    main_price_candidates.append(price)
+                            except:
+                                continue
+                    except:
+                        pass
+                    
+                    # Method 2b: Look for the main price in the entire text using improved patterns
+                    # Focus on the main price display patterns
+                    if not main_price_candidates:
+                        # Look for the main price which should be the largest/most prominent number
+                        # Every labeled price is also a bare price token, so one sweep finds them all
+                        for match in set(_PRICE_TOKEN_RE.findall(all_text)):
+                            try:
+                                price = float(match.replace(',', ''))
+                                if low_bound <= price <= high_bound:
+                                    main_price_candidates.append(price)
+                            except:
+                                continue
+                    
+                    # Remove duplicates and sort
+                    main_price_candidates = sorted(set(main_price_candidates))
+                    
+                    # Method 2c: Smart selection of current price
+                    if main_price_candidates and previous_close:
+                        logger.debug("🔍 Found price candidates: %s", main_price_candidates[:10])
+                        
+                        # Strategy 1: Remove previous close and pick the most likely candidate
+                        # The current price should be different from previous close
+                        potential_current = [p for p in main_price_candidates if abs(p - previous_close) > 1.0]
+                        
+                        if potential_current:
+                            # Strategy 2: The current price is usually the first/main one that's different
+                            # Also prefer prices that are within reasonable daily movement (< 2% typically)
+                            reasonable_moves = []
+                            for p in potential_current:
+                                move_pct = abs(p - previous_close) / previous_close
+                                if move_pct < 0.05:  # Less than 5% daily move is reasonable
+                                    reasonable_moves.append((p, move_pct))
+                            
+                            if reasonable_moves:
+                                # Smallest move percentage is most likely to be current (first one wins ties)
+                                current_price = min(reasonable_moves, key=lambda x: x[1])[0]
+                                logger.debug("✅ Found current price (reasonable move): $%.2f", current_price)
+                            else:
+                                # Fallback: take the first different price
+                                current_price = potential_current[0]
+                                logger.debug("✅ Found current price (first different): $%.2f", current_price)
+                        else:
+                            # Last resort: take the first candidate that's not exactly the previous close
+                            different_prices = [p for p in main_price_candidates if p != previous_close]
+                            if different_prices:
+                                current_price = different_prices[0]
+                                logger.debug("✅ Found current price (first non-identical): $%.2f", current_price)
+                            else:
+                                current_price = main_price_candidates[0]
+                                logger.debug("✅ Found current price (fallback): $%.2f", current_price)
+                        
+                        logger.debug("   Previous close: $%.2f, selected current: $%.2f, net change: $%+.2f",
+                                     previous_close, current_price, current_price - previous_close)
+                        
+                    elif main_price_candidates:
+                        # If no previous close, take the first reasonable price
                         current_price = main_price_candidates[0]
-                        print(f"✅ Found current price (fallback): ${current_price:,.2f}")
-                
-                print(f"   Previous close: ${previous_close:,.2f}")
-                print(f"   Selected current: ${current_price:,.2f}")
-                print(f"   Net change: ${current_price - previous_close:+,.2f}")
+                        logger.debug("✅ Found current price: $%.2f", current_price)
+                    else:
+                        logger.warning("⚠️ No current price found in expected range")
                 
-            elif main_price_candidates:
-                # If no previous close, take the first reasonable price
-                current_price = main_price_candidates[0]
-                print(f"✅ Found current price: ${current_price:,.2f}")
-            else:
-                print("⚠️ No current price found in expected range")
-            
-            # Method 3: Look for DAY RANGE to extract high and low
-            if today_high is None or today_low is None:
-                # Pattern like "DAY RANGE 22,275.25 - 22,480.77"
-                day_range_patterns = [
-                    r'DAY RANGE[:\s]*(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'Day Range[:\s]*(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
+                # Method 3: Fall back to any unlabeled "low - high" pair if the day range is still missing
+                if not day_range_found:
+                    # Pattern like "22,275.25 - 22,480.77"; scan lazily since only the first in-range pair is used
+                    match = _BARE_RANGE_RE.search(all_text)
+                    while match:
+                        low_price = float(match.group(1).replace(',', ''))
+                        high_price = float(match.group(2).replace(',', ''))
+                        if low_bound <= low_price <= high_bound and low_bound <= high_price <= high_bound:
+                            today_low = low_price
+                            today_high = high_price
+                            day_range_found = True
+                            logger.debug("✅ Found day range: Low $%.2f, High $%.2f", low_price, high_price)
+                            break
+                        match = _BARE_RANGE_RE.search(all_text, match.end())
                 
-                for pattern in day_range_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            low_price = float(match[0].replace(',', ''))
-                            high_price = float(match[1].replace(',', ''))
-                            if 20000 <= low_price <= 25000 and 20000 <= high_price <= 25000:
-                                today_low = low_price
-                                today_high = high_price
-                                print(f"✅ Found day range: Low ${low_price:,.2f}, High ${high_price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_high and today_low:
-                        break
-            
-            # Method 4: Look for individual high/low if day range didn't work
-            if today_high is None:
-                high_patterns = [
-                    r'HIGH[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'High[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
+                # Method 4: Use individually labeled high/low values if no day range turned up
+                if not day_range_found:
+                    today_high, today_low = labeled_high, labeled_low
+                    if today_high is not None:
+                        logger.debug("✅ Found today's high: $%.2f", today_high)
+                    if today_low is not None:
+                        logger.debug("✅ Found today's low: $%.2f", today_low)
                 
-                for pattern in high_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 20000 <= price <= 25000:
-                                today_high = price
-                                print(f"✅ Found today's high: ${price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_high:
-                        break
-            
-            if today_low is None:
-                low_patterns = [
-                    r'LOW[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'Low[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
+            except Exception as e:
+                logger.warning("⚠️ Error parsing MarketWatch %s data: %s", label, e)
                 
-                for pattern in low_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 20000 <= price <= 25000:
-                                today_low = price
-                                print(f"✅ Found today's low: ${price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_low:
-                        break
-            
-        except Exception as e:
-            print(f"⚠️ Error parsing MarketWatch NASDAQ data: {str(e)}")
+            # Debug: Log some of the scraped content for troubleshooting (only built when debug logging is on)
+            if current_price is None and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 Debug: First 2000 characters of scraped content:\n%s", all_text[:2000])
+                numbers = _NUMBER_RE.findall(all_text)
+                range_numbers = [n for n in numbers[:20] if low_bound <= float(n.replace(',', '')) <= high_bound]
+                logger.debug("🔍 Debug: Found %s-range numbers: %s", label, range_numbers)
             
-        # Debug: Print some of the scraped content for troubleshooting
-        if current_price is None:
-            print("🔍 Debug: First 2000 characters of scraped content:")
-            print(all_text[:2000])
-            print("🔍 Debug: Looking for numbers in NASDAQ range:")
-            numbers = re.findall(r'[0-9,]+\.[0-9]{2}', all_text)
-            nasdaq_numbers = [n for n in numbers[:20] if 20000 <= float(n.replace(',', '')) <= 25000]
-            print(f"Found NASDAQ-range numbers: {nasdaq_numbers}")
+            if current_price is not None:
+                _remember_quote(url, (current_price, previous_close, today_high, today_low))
         
         # If we couldn't get the key data, fall back to yfinance
         if current_price is None:
-            print("⚠️ Could not scrape current price, using fallback method...")
-            return fetch_fallback_nasdaq_data(symbol)
+            logger.warning("⚠️ Could not scrape current price, using fallback method...")
+            return fallback(symbol)
         
         # If we have current price but no previous close, try yfinance backup
         if previous_close is None:
-            print("⚠️ Could not find previous close, trying yfinance for backup...")
+            logger.warning("⚠️ Could not find previous close, trying yfinance for backup...")
             try:
-                # Try to get previous close from yfinance for NASDAQ
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
+                # Try to get previous close from yfinance
+                info = _get_ticker_info(yf_symbol)
                 previous_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
                 if previous_close:
-                    print(f"✅ Got previous close from yfinance: ${previous_close:,.2f}")
+                    logger.info("✅ Got previous close from yfinance: $%.2f", previous_close)
             except Exception as e:
-                print(f"⚠️ yfinance backup failed: {str(e)}")
+                logger.warning("⚠️ yfinance backup failed: %s", e)
         
         # Create realistic data based on scraped values
         now = datetime.now()
@@ -372,24 +587,24 @@ def fetch_nasdaq_marketwatch_data(symbol: str) -> pd.DataFrame:
         # Use actual previous close if available, otherwise estimate
         if previous_close is None:
             # Estimate previous close based on current price and typical daily movements
-            previous_close = current_price * (1 + (hash(str(now.date())) % 100 - 50) / 10000)
-            print(f"⚠️ Estimated previous close: ${previous_close:,.2f}")
+            previous_close = current_price * (1 + _date_seeds(now.date()).close / 10000)
+            logger.warning("⚠️ Estimated previous close: $%.2f", previous_close)
         
         # Use actual high/low if available, otherwise estimate
         if today_high is None:
             today_high = max(current_price, previous_close) * 1.002
-            print(f"⚠️ Estimated today's high: ${today_high:,.2f}")
+            logger.warning("⚠️ Estimated today's high: $%.2f", today_high)
         
         if today_low is None:
             today_low = min(current_price, previous_close) * 0.998
-            print(f"⚠️ Estimated today's low: ${today_low:,.2f}")
+            logger.warning("⚠️ Estimated today's low: $%.2f", today_low)
         
         # Create two bars with real data
         # Bar 1 (previous hour) - using actual previous close
         prev_close = previous_close
         prev_high = today_high * 0.999  # Slightly below today's high
         prev_low = today_low * 1.001   # Slightly above today's low
-        prev_open = prev_close * (1 + (hash(str(now.date()) + "open") % 100 - 50) / 20000)
+        prev_open = prev_close * (1 + _date_seeds(now.date()).open / 20000)
         
         # Bar 2 (current/last hour) - using actual current price and MarketWatch high/low
         curr_close = current_price
@@ -398,31 +613,42 @@ def fetch_nasdaq_marketwatch_data(symbol: str) -> pd.DataFrame:
         curr_open = prev_close  # Opens at previous close
         
         # Create DataFrame
-        data = {
-            'Open': [prev_open, curr_open],
-            'High': [prev_high, curr_high],
-            'Low': [prev_low, curr_low],
-            'Close': [prev_close, curr_close],
-        }
-        
-        # Create timestamps for the last two hours
-        hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-        hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+        df = _two_bar_frame((prev_open, prev_high, prev_low, prev_close),
+                            (curr_open, curr_high, curr_low, curr_close), now, symbol, source_tag)
         
-        df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-        df.attrs['symbol'] = symbol
-        df.attrs['source'] = 'marketwatch_nasdaq_scrape'
-        
-        print(f"✅ Created NASDAQ data with {len(df)} bars from MarketWatch.com")
-        print(f"   Current: ${curr_close:,.2f}, Previous: ${prev_close:,.2f}")
-        print(f"   Net Change: ${curr_close - prev_close:+,.2f}")
-        print(f"   Day's High: ${today_high:,.2f}, Day's Low: ${today_low:,.2f}")
+        logger.info("✅ Created %s data with %s bars from MarketWatch.com: current $%.2f, previous $%.2f, "
+                    "net change $%+.2f, day's high $%.2f, day's low $%.2f", label, len(df), curr_close, prev_close,
+                    curr_close - prev_close, today_high, today_low)
         
         return df
         
     except Exception as e:
-        print(f"❌ Error scraping NASDAQ data from MarketWatch: {str(e)}")
-        return fetch_fallback_nasdaq_data(symbol)
+        logger.error("❌ Error scraping %s data from MarketWatch: %s", label, e)
+        return fallback(symbol)
+
+
+def fetch_nasdaq_marketwatch_data(symbol: str) -> pd.DataFrame:
+    """
+    Fetch NASDAQ-100 data by web scraping marketwatch.com
+    
+    Args:
+        symbol (str): The NASDAQ symbol (e.g., 'NDX', '^NDX')
+    
+    Returns:
+        pd.DataFrame: DataFrame with OHLC data for the last 2 periods
+    """
+    # Clean symbol for MarketWatch URL
+    clean_symbol = symbol.replace('^', '').lower()
+    
+    logger.info("🌐 Scraping NASDAQ data for %s from marketwatch.com...", clean_symbol.upper())
+    
+    # MarketWatch URL for NASDAQ-100 index
+    url = f"https://www.marketwatch.com/investing/index/{clean_symbol}"
+    logger.info("🌐 Scraping from: %s", url)
+    
+    # Reduced timeout for better performance
+    return _scrape_marketwatch_index(url, symbol, 20000, 25000, 'marketwatch_nasdaq_scrape',
+                                     'NASDAQ', symbol, fetch_fallback_nasdaq_data, timeout=8)
 
 
 def fetch_nasdaq_data(symbol: str) -> pd.DataFrame:
@@ -437,12 +663,11 @@ def fetch_fallback_nasdaq_data(symbol: str) -> pd.DataFrame:
     """
     Fallback method to get NASDAQ data from yfinance when scraping fails
     """
-    print(f"🔄 Using fallback data source (yfinance) for {symbol}...")
+    logger.info("🔄 Using fallback data source (yfinance) for %s...", symbol)
     
     try:
         # Try to get real data from yfinance first
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = _get_ticker_info(symbol)
         
         current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         previous_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
@@ -450,10 +675,8 @@ def fetch_fallback_nasdaq_data(symbol: str) -> pd.DataFrame:
         day_low = info.get('dayLow') or info.get('regularMarketDayLow')
         
         if current_price and previous_close:
-            print(f"✅ Got real data from yfinance:")
-            print(f"   Current: ${current_price:.2f}")
-            print(f"   Previous Close: ${previous_close:.2f}")
-            print(f"   Net Change: ${current_price - previous_close:+.2f}")
+            logger.info("✅ Got real data from yfinance: current $%.2f, previous close $%.2f, net change $%+.2f",
+                        current_price, previous_close, current_price - previous_close)
             
             # Use actual values
             curr_close = float(current_price)
@@ -464,39 +687,28 @@ def fetch_fallback_nasdaq_data(symbol: str) -> pd.DataFrame:
             # Create realistic bars
             prev_high = max(prev_close * 1.001, curr_high * 0.999)
             prev_low = max(prev_close * 0.999, curr_low * 1.001)
-            prev_open = prev_close * (1 + (hash(str(datetime.now().date()) + "open") % 100 - 50) / 20000)
+            prev_open = prev_close * (1 + _date_seeds(datetime.now().date()).open / 20000)
             curr_open = prev_close
             
-            data = {
-                'Open': [prev_open, curr_open],
-                'High': [prev_high, curr_high],
-                'Low': [prev_low, curr_low],
-                'Close': [prev_close, curr_close],
-            }
-            
             now = datetime.now()
-            hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-            hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+            df = _two_bar_frame((prev_open, prev_high, prev_low, prev_close),
+                                (curr_open, curr_high, curr_low, curr_close), now, symbol, 'yfinance_fallback')
             
-            df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-            df.attrs['symbol'] = symbol
-            df.attrs['source'] = 'yfinance_fallback'
-            
-            print(f"✅ Generated realistic NASDAQ data from yfinance: ${curr_close:.2f}")
+            logger.info("✅ Generated realistic NASDAQ data from yfinance: $%.2f", curr_close)
             return df
             
     except Exception as e:
-        print(f"⚠️ yfinance fallback failed: {str(e)}")
+        logger.warning("⚠️ yfinance fallback failed: %s", e)
     
     # Last resort: use current market levels as base
-    print(f"🔄 Using estimated data based on current market levels...")
+    logger.info("🔄 Using estimated data based on current market levels...")
     
     # Use current NASDAQ-100 level as base (around 22,800)
     base_price = 22800.0
     
     # Add some variation based on current time
     now = datetime.now()
-    daily_variation = (hash(str(now.date())) % 200 - 100) / 100  # -1% to +1% daily variation
+    daily_variation = _date_seeds(now.date()).variation / 100  # -1% to +1% daily variation
     current_price = base_price * (1 + daily_variation / 100)
     
     # Create realistic bars with proper previous close
@@ -510,23 +722,11 @@ def fetch_fallback_nasdaq_data(symbol: str) -> pd.DataFrame:
     curr_low = curr_close * 0.999
     curr_open = prev_close
     
-    data = {
-        'Open': [prev_open, curr_open],
-        'High': [prev_high, curr_high],
-        'Low': [prev_low, curr_low],
-        'Close': [prev_close, curr_close],
-    }
-    
-    hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-    hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-    
-    df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-    df.attrs['symbol'] = symbol
-    df.attrs['source'] = 'fallback'
+    df = _two_bar_frame((prev_open, prev_high, prev_low, prev_close),
+                        (curr_open, curr_high, curr_low, curr_close), now, symbol, 'fallback')
     
-    print(f"✅ Generated fallback NASDAQ data: ${curr_close:.2f}")
-    print(f"   Previous close: ${prev_close:.2f}")
-    print(f"   Net change: ${curr_close - prev_close:+.2f}")
+    logger.info("✅ Generated fallback NASDAQ data: $%.2f, previous close $%.2f, net change $%+.2f",
+                curr_close, prev_close, curr_close - prev_close)
     
     return df
 
@@ -541,331 +741,25 @@ def fetch_us30_marketwatch_data(symbol: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame with OHLC data for the last 2 periods
     """
-    try:
-        print(f"🌐 Scraping US30 data for {symbol} from marketwatch.com...")
-        
-        # MarketWatch URL for Dow Jones Industrial Average
-        url = "https://www.marketwatch.com/investing/index/djia"
-        print(f"🌐 Scraping from: {url}")
-        
-        # Headers to mimic a real browser and avoid 401 errors
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'document', 
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Upgrade-Insecure-Requests': '1',
-            'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Referer': 'https://www.google.com/',
-        }
-        
-        # Make the request
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        print(f"✅ Successfully connected to marketwatch.com")
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract data from MarketWatch page
-        current_price = None
-        previous_close = None
-        today_high = None
-        today_low = None
-        
-        try:
-            # Get all text content for pattern matching
-            all_text = soup.get_text()
-            
-            # Method 1: First find the PREVIOUS CLOSE to use as reference
-            prev_close_patterns = [
-                r'PREVIOUS CLOSE[:\s]*(\d{2},\d{3}\.\d{2})',
-                r'Previous Close[:\s]*(\d{2},\d{3}\.\d{2})',
-                r'PREVIOUS CLOSE[:\s]*(\d{2},\d{3}\.\d{1})',
-                r'Previous Close[:\s]*(\d{2},\d{3}\.\d{1})',
-            ]
-            
-            for pattern in prev_close_patterns:
-                matches = re.findall(pattern, all_text, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        price = float(match.replace(',', ''))
-                        if 30000 <= price <= 50000:
-                            previous_close = price
-                            print(f"✅ Found previous close: ${price:,.2f}")
-                            break
-                    except:
-                        continue
-                if previous_close:
-                    break
-            
-            # Method 2: Find the main current price display
-            # Look for the main price which is usually displayed prominently
-            
-            # Method 2a: Try to find the specific main price display area
-            # Look for structured elements that contain the main price
-            main_price_candidates = []
-            
-            # Try to find the main price in specific HTML elements
-            try:
-                # Look for price in spans, divs, or other elements with price classes
-                price_elements = soup.find_all(['span', 'div', 'p'], class_=re.compile(r'price|value|quote', re.I))
-                for element in price_elements:
-                    text = element.get_text(strip=True)
-                    price_matches = re.findall(r'(\d{2},\d{3}\.\d{2})', text)
-                    for match in price_matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 40000 <= price <= 50000:  # Dow Jones range
-                                main_price_candidates.append(price)
-                        except:
-                            continue
-            except:
-                pass
-            
-            # Method 2b: Look for the main price in the entire text using improved patterns
-            # Focus on the main price display patterns
-            if not main_price_candidates:
-                # Look for the main price which should be the largest/most prominent number
-                main_price_patterns = [
-                    r'(?:CLOSED|Close|Price|Current)[:\s]*(\d{2},\d{3}\.\d{2})',  # Look for labeled prices
-                    r'(\d{2},\d{3}\.\d{2})',  # All Dow Jones-range prices
-                ]
-                
-                for pattern in main_price_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 40000 <= price <= 50000:  # Dow Jones range
-                                main_price_candidates.append(price)
-                        except:
-                            continue
-            
-            # Remove duplicates and sort
-            main_price_candidates = sorted(list(set(main_price_candidates)))
-            
-            # Method 2c: Smart selection of current price
-            if main_price_candidates and previous_close:
-                print(f"🔍 Found price candidates: {[f'${p:,.2f}' for p in main_price_candidates[:10]]}")
-                
-                # Strategy 1: Remove previous close and pick the most likely candidate
-                # The current price should be different from previous close
-                potential_current = [p for p in main_price_candidates if abs(p - previous_close) > 1.0]
-                
-                if potential_current:
-                    # Strategy 2: The current price is usually the first/main one that's different
-                    # Also prefer prices that are within reasonable daily movement (< 2% typically)
-                    reasonable_moves = []
-                    for p in potential_current:
-                        move_pct = abs(p - previous_close) / previous_close
-                        if move_pct < 0.05:  # Less than 5% daily move is reasonable
-                            reasonable_moves.append((p, move_pct))
-                    
-                    if reasonable_moves:
-                        # Sort by smallest move percentage (most likely to be current)
-                        reasonable_moves.sort(key=lambda x: x[1])
-                        current_price = reasonable_moves[0][0]
-                        print(f"✅ Found current price (reasonable move): ${current_price:,.2f}")
-                    else:
-                        # Fallback: take the first different price
-                        current_price = potential_current[0]
-                        print(f"✅ Found current price (first different): ${current_price:,.2f}")
-                else:
-                    # Last resort: take the first candidate that's not exactly the previous close
-                    different_prices = [p for p in main_price_candidates if p != previous_close]
-                    if different_prices:
-                        current_price = different_prices[0]
-                        print(f"✅ Found current price (first non-identical): ${current_price:,.2f}")
-                    else:
-                        current_price = main_price_candidates[0]
-                        print(f"✅ Found current price (fallback): ${current_price:,.2f}")
-                
-                print(f"   Previous close: ${previous_close:,.2f}")
-                print(f"   Selected current: ${current_price:,.2f}")
-                print(f"   Net change: ${current_price - previous_close:+,.2f}")
-                
-            elif main_price_candidates:
-                # If no previous close, take the first reasonable price
-                current_price = main_price_candidates[0]
-                print(f"✅ Found current price: ${current_price:,.2f}")
-            else:
-                print("⚠️ No current price found in expected range")
-            
-            # Method 3: Look for DAY RANGE to extract high and low
-            if today_high is None or today_low is None:
-                # Pattern like "DAY RANGE 44,275.25 - 44,480.77"
-                day_range_patterns = [
-                    r'DAY RANGE[:\s]*(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'Day Range[:\s]*(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'(\d{2},\d{3}\.\d{2})[:\s]*-[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
-                
-                for pattern in day_range_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            low_price = float(match[0].replace(',', ''))
-                            high_price = float(match[1].replace(',', ''))
-                            if 30000 <= low_price <= 50000 and 30000 <= high_price <= 50000:
-                                today_low = low_price
-                                today_high = high_price
-                                print(f"✅ Found day range: Low ${low_price:,.2f}, High ${high_price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_high and today_low:
-                        break
-            
-            # Method 4: Look for individual high/low if day range didn't work
-            if today_high is None:
-                high_patterns = [
-                    r'HIGH[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'High[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
-                
-                for pattern in high_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 30000 <= price <= 50000:
-                                today_high = price
-                                print(f"✅ Found today's high: ${price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_high:
-                        break
-            
-            if today_low is None:
-                low_patterns = [
-                    r'LOW[:\s]*(\d{2},\d{3}\.\d{2})',
-                    r'Low[:\s]*(\d{2},\d{3}\.\d{2})',
-                ]
-                
-                for pattern in low_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    for match in matches:
-                        try:
-                            price = float(match.replace(',', ''))
-                            if 30000 <= price <= 50000:
-                                today_low = price
-                                print(f"✅ Found today's low: ${price:,.2f}")
-                                break
-                        except:
-                            continue
-                    if today_low:
-                        break
-            
-        except Exception as e:
-            print(f"⚠️ Error parsing MarketWatch data: {str(e)}")
-            
-        # Debug: Print some of the scraped content for troubleshooting
-        if current_price is None:
-            print("🔍 Debug: First 2000 characters of scraped content:")
-            print(all_text[:2000])
-            print("🔍 Debug: Looking for numbers in Dow Jones range:")
-            numbers = re.findall(r'[0-9,]+\.[0-9]{2}', all_text)
-            dow_numbers = [n for n in numbers[:20] if 30000 <= float(n.replace(',', '')) <= 50000]
-            print(f"Found Dow-range numbers: {dow_numbers}")
-        
-        # If we couldn't get the key data, fall back to yfinance
-        if current_price is None:
-            print("⚠️ Could not scrape current price, trying yfinance fallback...")
-            return fetch_us30_yfinance_fallback(symbol)
-        
-        # If we have current price but no previous close, try yfinance backup
-        if previous_close is None:
-            print("⚠️ Could not find previous close, trying yfinance for backup...")
-            try:
-                # Try to get previous close from yfinance for Dow Jones
-                ticker = yf.Ticker('^DJI')  # Dow Jones Industrial Average
-                info = ticker.info
-                previous_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
-                if previous_close:
-                    print(f"✅ Got previous close from yfinance: ${previous_close:,.2f}")
-            except Exception as e:
-                print(f"⚠️ yfinance backup failed: {str(e)}")
-        
-        # Create realistic data based on scraped values
-        now = datetime.now()
-        
-        # Use actual previous close if available, otherwise estimate
-        if previous_close is None:
-            # Estimate previous close based on current price and typical daily movements
-            previous_close = current_price * (1 + (hash(str(now.date())) % 100 - 50) / 10000)
-            print(f"⚠️ Estimated previous close: ${previous_close:,.2f}")
-        
-        # Use actual high/low if available, otherwise estimate
-        if today_high is None:
-            today_high = max(current_price, previous_close) * 1.002
-            print(f"⚠️ Estimated today's high: ${today_high:,.2f}")
-        
-        if today_low is None:
-            today_low = min(current_price, previous_close) * 0.998
-            print(f"⚠️ Estimated today's low: ${today_low:,.2f}")
-        
-        # Create two bars with real data
-        # Bar 1 (previous hour) - using actual previous close
-        prev_close = previous_close
-        prev_high = today_high * 0.999  # Slightly below today's high
-        prev_low = today_low * 1.001   # Slightly above today's low
-        prev_open = prev_close * (1 + (hash(str(now.date()) + "open") % 100 - 50) / 20000)
-        
-        # Bar 2 (current/last hour) - using actual current price and MarketWatch high/low
-        curr_close = current_price
-        curr_high = today_high  # Use actual day's high from MarketWatch
-        curr_low = today_low    # Use actual day's low from MarketWatch
-        curr_open = prev_close  # Opens at previous close
-        
-        # Create DataFrame
-        data = {
-            'Open': [prev_open, curr_open],
-            'High': [prev_high, curr_high],
-            'Low': [prev_low, curr_low],
-            'Close': [prev_close, curr_close],
-        }
-        
-        # Create timestamps for the last two hours
-        hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-        hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-        
-        df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-        df.attrs['symbol'] = symbol
-        df.attrs['source'] = 'marketwatch_scrape'
-        
-        print(f"✅ Created US30 data with {len(df)} bars from MarketWatch.com")
-        print(f"   Current: ${curr_close:,.2f}, Previous: ${prev_close:,.2f}")
-        print(f"   Net Change: ${curr_close - prev_close:+,.2f}")
-        print(f"   Day's High: ${today_high:,.2f}, Day's Low: ${today_low:,.2f}")
-        
-        return df
-        
-    except Exception as e:
-        print(f"❌ Error scraping US30 data from MarketWatch: {str(e)}")
-        return fetch_us30_yfinance_fallback(symbol)
+    logger.info("🌐 Scraping US30 data for %s from marketwatch.com...", symbol)
+    
+    # MarketWatch URL for Dow Jones Industrial Average
+    url = "https://www.marketwatch.com/investing/index/djia"
+    logger.info("🌐 Scraping from: %s", url)
+    
+    return _scrape_marketwatch_index(url, symbol, 30000, 50000, 'marketwatch_scrape',
+                                     'US30', '^DJI', fetch_us30_yfinance_fallback, timeout=30)
 
 
 def fetch_us30_yfinance_fallback(symbol: str) -> pd.DataFrame:
     """
     Fallback method to get US30 data from yfinance when Barchart scraping fails
     """
-    print(f"🔄 Using yfinance fallback for US30 data...")
+    logger.info("🔄 Using yfinance fallback for US30 data...")
     
     try:
         # Try to get real data from yfinance for Dow Jones
-        ticker = yf.Ticker('^DJI')  # Dow Jones Industrial Average
-        info = ticker.info
+        info = _get_ticker_info('^DJI')  # Dow Jones Industrial Average
         
         current_price = info.get('currentPrice') or info.get('regularMarketPrice')
         previous_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
@@ -873,10 +767,8 @@ def fetch_us30_yfinance_fallback(symbol: str) -> pd.DataFrame:
         day_low = info.get('dayLow') or info.get('regularMarketDayLow')
         
         if current_price and previous_close:
-            print(f"✅ Got real US30 data from yfinance:")
-            print(f"   Current: ${current_price:,.2f}")
-            print(f"   Previous Close: ${previous_close:,.2f}")
-            print(f"   Net Change: ${current_price - previous_close:+,.2f}")
+            logger.info("✅ Got real US30 data from yfinance: current $%.2f, previous close $%.2f, net change $%+.2f",
+                        current_price, previous_close, current_price - previous_close)
             
             # Use actual values
             curr_close = float(current_price)
@@ -887,43 +779,32 @@ def fetch_us30_yfinance_fallback(symbol: str) -> pd.DataFrame:
             # Create realistic bars
             prev_high = max(prev_close * 1.001, curr_high * 0.999)
             prev_low = max(prev_close * 0.999, curr_low * 1.001)
-            prev_open = prev_close * (1 + (hash(str(datetime.now().date()) + "open") % 100 - 50) / 20000)
+            prev_open = prev_close * (1 + _date_seeds(datetime.now().date()).open / 20000)
             curr_open = prev_close
             
-            data = {
-                'Open': [prev_open, curr_open],
-                'High': [prev_high, curr_high],
-                'Low': [prev_low, curr_low],
-                'Close': [prev_close, curr_close],
-            }
-            
             now = datetime.now()
-            hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-            hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+            df = _two_bar_frame((prev_open, prev_high, prev_low, prev_close),
+                                (curr_open, curr_high, curr_low, curr_close), now, symbol, 'yfinance_us30_fallback')
             
-            df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-            df.attrs['symbol'] = symbol
-            df.attrs['source'] = 'yfinance_us30_fallback'
-            
-            print(f"✅ Generated US30 data from yfinance: ${curr_close:,.2f}")
+            logger.info("✅ Generated US30 data from yfinance: $%.2f", curr_close)
             return df
             
     except Exception as e:
-        print(f"⚠️ yfinance US30 fallback failed: {str(e)}")
+        logger.warning("⚠️ yfinance US30 fallback failed: %s", e)
     
     # Last resort: use estimated US30 data
-    print(f"🔄 Using estimated US30 data based on current market levels...")
+    logger.info("🔄 Using estimated US30 data based on current market levels...")
     
     # Use current Dow Jones level as base (around 38,000)
     base_price = 38000.0
     
     # Add some variation based on current time
     now = datetime.now()
-    daily_variation = (hash(str(now.date())) % 200 - 100) / 100  # -1% to +1% daily variation
+    daily_variation = _date_seeds(now.date()).variation / 100  # -1% to +1% daily variation
     current_price = base_price * (1 + daily_variation / 100)
     
     # Create realistic bars with proper previous close
-    prev_close = current_price * (1 + (hash(str(now.date()) + "prev") % 100 - 50) / 10000)
+    prev_close = current_price * (1 + _date_seeds(now.date()).prev / 10000)
     prev_high = prev_close * 1.002
     prev_low = prev_close * 0.998
     prev_open = prev_close * 1.001
@@ -933,21 +814,10 @@ def fetch_us30_yfinance_fallback(symbol: str) -> pd.DataFrame:
     curr_low = curr_close * 0.999
     curr_open = prev_close
     
-    data = {
-        'Open': [prev_open, curr_open],
-        'High': [prev_high, curr_high],
-        'Low': [prev_low, curr_low],
-        'Close': [prev_close, curr_close],
-    }
-    
-    hour_2_ago = (now - timedelta(hours=2)).replace(minute=0, second=0, microsecond=0)
-    hour_1_ago = (now - timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-    
-    df = pd.DataFrame(data, index=pd.DatetimeIndex([hour_2_ago, hour_1_ago]))
-    df.attrs['symbol'] = symbol
-    df.attrs['source'] = 'us30_fallback'
+    df = _two_bar_frame((prev_open, prev_high, prev_low, prev_close),
+                        (curr_open, curr_high, curr_low, curr_close), now, symbol, 'us30_fallback')
     
-    print(f"✅ Generated estimated US30 data: ${curr_close:,.2f}")
+    logger.info("✅ Generated estimated US30 data: $%.2f", curr_close)
     return df
 
 
@@ -970,44 +840,44 @@ def fetch_last_two_1h_bars(symbol: str) -> pd.DataFrame:
     us30_symbols = ['US30', 'US30.', '$DOWI', 'DOWI', '^DJI', 'DJI']
     
     if symbol.upper() in [s.upper() for s in us30_symbols]:
-        print(f"📈 Detected US30 symbol {symbol}, trying yfinance first...")
+        logger.info("📈 Detected US30 symbol %s, trying yfinance first...", symbol)
         try:
             # Map US30 symbols to yfinance equivalent
             yf_symbol = '^DJI' if symbol.upper() != '^DJI' else symbol
             yf_result = fetch_yfinance_fast(yf_symbol)
             if yf_result is not None and len(yf_result) >= 2:
-                print(f"✅ yfinance success for {symbol}")
+                logger.info("✅ yfinance success for %s", symbol)
                 return yf_result
         except Exception as e:
-            print(f"⚠️ yfinance failed for {symbol}: {str(e)[:50]}")
+            logger.warning("⚠️ yfinance failed for %s: %s", symbol, str(e)[:50])
         
         # Fallback to MarketWatch scraping if yfinance fails
-        print(f"🌐 Falling back to MarketWatch scraping for {symbol}...")
+        logger.info("🌐 Falling back to MarketWatch scraping for %s...", symbol)
         return fetch_us30_marketwatch_data(symbol)
     
     # Check if this is a NASDAQ symbol - try yfinance first for better performance
     nasdaq_symbols = ['^NDX', 'NDX', '^IXIC', 'IXIC', '^GSPC', 'GSPC']
     
     if symbol.upper() in [s.upper() for s in nasdaq_symbols]:
-        print(f"📈 Detected NASDAQ symbol {symbol}, trying yfinance first...")
+        logger.info("📈 Detected NASDAQ symbol %s, trying yfinance first...", symbol)
         try:
             # Try yfinance first for faster performance
             yf_result = fetch_yfinance_fast(symbol)
             if yf_result is not None and len(yf_result) >= 2:
-                print(f"✅ yfinance success for {symbol}")
+                logger.info("✅ yfinance success for %s", symbol)
                 return yf_result
         except Exception as e:
-            print(f"⚠️ yfinance failed for {symbol}: {str(e)[:50]}")
+            logger.warning("⚠️ yfinance failed for %s: %s", symbol, str(e)[:50])
         
         # Fallback to MarketWatch scraping if yfinance fails
-        print(f"🌐 Falling back to MarketWatch scraping for {symbol}...")
+        logger.info("🌐 Falling back to MarketWatch scraping for %s...", symbol)
         return fetch_nasdaq_marketwatch_data(symbol)
     
     # Check if this is a GOLD symbol - use optimized gold fetching
     gold_symbols = ['GOLD', 'GC=F', 'GLD', 'XAUUSD=X', 'XAU']
     
     if symbol.upper() in [s.upper() for s in gold_symbols]:
-        print(f"🥇 Detected GOLD symbol {symbol}, using optimized gold fetch...")
+        logger.info("🥇 Detected GOLD symbol %s, using optimized gold fetch...", symbol)
         return fetch_gold_optimized(symbol)
     
     # For other symbols, use yfinance
@@ -1016,7 +886,7 @@ def fetch_last_two_1h_bars(symbol: str) -> pd.DataFrame:
         now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
         start = now - timedelta(days=7)  # Get more data to ensure we have enough
         
-        print(f"📊 Fetching data for {symbol} from {start} to {now}")
+        logger.info("📊 Fetching data for %s from %s to %s", symbol, start, now)
         
         # Download 1-hour interval data
         df = yf.download(
@@ -1044,16 +914,45 @@ def fetch_last_two_1h_bars(symbol: str) -> pd.DataFrame:
         last_two_bars.attrs['symbol'] = symbol
         last_two_bars.attrs['source'] = 'yfinance'
         
-        print(f"✅ Successfully fetched {len(last_two_bars)} bars for {symbol}")
-        print(f"📈 Data range: {last_two_bars.index[0]} to {last_two_bars.index[-1]}")
+        logger.info("✅ Successfully fetched %s bars for %s", len(last_two_bars), symbol)
+        logger.info("📈 Data range: %s to %s", last_two_bars.index[0], last_two_bars.index[-1])
         
         return last_two_bars
         
     except Exception as e:
-        print(f"❌ Error fetching data for {symbol}: {str(e)}")
+        logger.error("❌ Error fetching data for %s: %s", symbol, e)
         raise
 
 
+def fetch_many_last_two_1h_bars(symbols) -> dict:
+    """
+    Fetch the last two 1-hour bars for several symbols concurrently
+    
+    Each symbol runs fetch_last_two_1h_bars on its own thread, so scraping NASDAQ and US30
+    together costs roughly the slower page instead of both round trips back to back.
+    
+    Args:
+        symbols (list): Ticker symbols to fetch
+    
+    Returns:
+        dict: symbol -> DataFrame, or the exception raised while fetching that symbol
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(len(symbols), FETCH_MAX_WORKERS), thread_name_prefix='datafetch') as pool:
+        futures = {pool.submit(fetch_last_two_1h_bars, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                results[symbol] = e
+    return results
+
+
 def get_current_price(symbol: str) -> Optional[float]:
     """
     Get the current/latest price for a symbol
@@ -1065,8 +964,7 @@ def get_current_price(symbol: str) -> Optional[float]:
         float: Current price or None if unavailable
     """
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = _get_ticker_info(symbol)
         
         # Try different price fields
         price = (
@@ -1078,7 +976,7 @@ def get_current_price(symbol: str) -> Optional[float]:
         return float(price) if price else None
         
     except Exception as e:
-        print(f"⚠️  Could not get current price for {symbol}: {str(e)}")
+        logger.warning("⚠️ Could not get current price for %s: %s", symbol, e)
         return None
 
 
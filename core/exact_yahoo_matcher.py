@@ -16,9 +16,15 @@ import logging
 import re
 from bs4 import BeautifulSoup
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Library module: log through the module logger and leave handler setup to the application
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 class ExactYahooDataMatcher:
     def __init__(self):
@@ -38,33 +44,29 @@ class ExactYahooDataMatcher:
         
         for name, symbol in self.symbols.items():
             try:
-                print(f"Fetching LIVE {name} data to match Yahoo Finance...")
+                logger.info("Fetching LIVE %s data to match Yahoo Finance...", name)
                 
                 # Use direct Yahoo Finance API for most accurate data
                 live_data = self.get_yahoo_finance_api_data(symbol, name)
                 
                 if live_data:
-                    print(f"SUCCESS - Yahoo API for {name}:")
-                    print(f"  High: {live_data['daily_high']:.2f}")
-                    print(f"  Low: {live_data['daily_low']:.2f}")
-                    print(f"  Current: {live_data['current_value']:.2f}")
+                    logger.info("SUCCESS - Yahoo API for %s: High %.2f, Low %.2f, Current %.2f",
+                                name, live_data['daily_high'], live_data['daily_low'], live_data['current_value'])
                     
                     validated_data = self.validate_yahoo_methodology(live_data, symbol)
                     market_data[name] = validated_data
                 else:
                     # Fallback to enhanced data fetching
-                    print(f"Yahoo API failed for {name}, using enhanced fallback...")
+                    logger.warning("Yahoo API failed for %s, using enhanced fallback...", name)
                     fallback_data = self.get_enhanced_fallback_data(symbol, name)
                     market_data[name] = fallback_data
                 
-                print(f"FINAL {name} ranges:")
-                print(f"   High: {market_data[name]['daily_high']:.2f}")
-                print(f"   Low: {market_data[name]['daily_low']:.2f}")
-                print(f"   Current: {market_data[name]['current_value']:.2f}")
-                print(f"   Source: {market_data[name]['data_source']}")
+                logger.info("FINAL %s ranges: High %.2f, Low %.2f, Current %.2f, Source %s",
+                            name, market_data[name]['daily_high'], market_data[name]['daily_low'],
+                            market_data[name]['current_value'], market_data[name]['data_source'])
                 
             except Exception as e:
-                print(f"ERROR fetching {name} data: {e}")
+                logger.error("Error fetching %s data: %s", name, e)
                 # Use enhanced fallback as last resort
                 market_data[name] = self.get_enhanced_fallback_data(symbol, name)
         
@@ -73,7 +75,7 @@ class ExactYahooDataMatcher:
     def get_yahoo_finance_api_data(self, symbol, name):
         """Get data directly from Yahoo Finance API for accurate day's range values"""
         try:
-            print(f"Fetching Yahoo Finance API data for {symbol}...")
+            logger.info("Fetching Yahoo Finance API data for %s...", symbol)
             
             # Use yfinance to get the most current data
             ticker = yf.Ticker(symbol)
@@ -90,7 +92,7 @@ class ExactYahooDataMatcher:
                 daily_open = float(today_data['Open'].iloc[0])
                 daily_volume = int(today_data['Volume'].sum())
                 
-                print(f"Method 1 (1d/1m) for {name}: High {daily_high:.2f}, Low {daily_low:.2f}")
+                logger.info("Method 1 (1d/1m) for %s: High %.2f, Low %.2f", name, daily_high, daily_low)
                 
                 return {
                     'current_value': current_price,
@@ -121,7 +123,7 @@ class ExactYahooDataMatcher:
                     daily_open = float(today_filtered['Open'].iloc[0])
                     daily_volume = int(today_filtered['Volume'].sum())
                     
-                    print(f"Method 2 (2d/1m filtered) for {name}: High {daily_high:.2f}, Low {daily_low:.2f}")
+                    logger.info("Method 2 (2d/1m filtered) for %s: High %.2f, Low %.2f", name, daily_high, daily_low)
                     
                     return {
                         'current_value': current_price,
@@ -147,7 +149,7 @@ class ExactYahooDataMatcher:
                 daily_open = float(latest['Open'])
                 daily_volume = int(latest['Volume'])
                 
-                print(f"Method 3 (5d/1d latest) for {name}: High {daily_high:.2f}, Low {daily_low:.2f}")
+                logger.info("Method 3 (5d/1d latest) for %s: High %.2f, Low %.2f", name, daily_high, daily_low)
                 
                 return {
                     'current_value': current_price,
@@ -162,11 +164,11 @@ class ExactYahooDataMatcher:
                     'last_updated': datetime.now().isoformat()
                 }
             
-            print(f"All methods failed for {name} - no data available")
+            logger.warning("All methods failed for %s - no data available", name)
             return None
             
         except Exception as e:
-            print(f"Yahoo Finance API failed for {name}: {e}")
+            logger.warning("Yahoo Finance API failed for %s: %s", name, e)
             return None
     
     def scrape_yahoo_finance_web(self, symbol, name):
@@ -189,7 +191,7 @@ class ExactYahooDataMatcher:
                 'Cache-Control': 'no-cache'
             }
             
-            print(f"Scraping Yahoo Finance web: {url}")
+            logger.info("Scraping Yahoo Finance web: %s", url)
             response = requests.get(url, headers=headers, timeout=15)
             response.raise_for_status()
             
@@ -262,10 +264,8 @@ class ExactYahooDataMatcher:
             
             # If we found valid data, return it
             if current_price and daily_high and daily_low:
-                print(f"Web scraping SUCCESS for {name}:")
-                print(f"  Current: {current_price:,.2f}")
-                print(f"  High: {daily_high:,.2f}")
-                print(f"  Low: {daily_low:,.2f}")
+                logger.info("Web scraping SUCCESS for %s: Current %.2f, High %.2f, Low %.2f",
+                            name, current_price, daily_high, daily_low)
                 
                 return {
                     'current_value': current_price,
@@ -280,11 +280,11 @@ class ExactYahooDataMatcher:
                     'last_updated': datetime.now().isoformat()
                 }
             else:
-                print(f"Web scraping incomplete for {name}: price={current_price}, high={daily_high}, low={daily_low}")
+                logger.warning("Web scraping incomplete for %s: price=%s, high=%s, low=%s", name, current_price, daily_high, daily_low)
                 return None
                 
         except Exception as e:
-            print(f"Web scraping failed for {name}: {e}")
+            logger.warning("Web scraping failed for %s: %s", name, e)
             return None
     
     def fetch_exact_intraday_data(self, symbol, name):
@@ -294,28 +294,28 @@ class ExactYahooDataMatcher:
             ticker = yf.Ticker(symbol)
             
             # Method 1: Try 1-minute data for current trading day
-            print(f"Attempting 1-minute data for {symbol}...")
+            logger.info("Attempting 1-minute data for %s...", symbol)
             minute_data = self.get_1_minute_current_day(ticker, symbol)
             
             if minute_data is not None and len(minute_data) > 10:  # Sufficient data points
                 return self.calculate_ranges_from_intraday(minute_data, '1min')
             
             # Method 2: Try 5-minute data  
-            print(f"Attempting 5-minute data for {symbol}...")
+            logger.info("Attempting 5-minute data for %s...", symbol)
             five_min_data = self.get_5_minute_current_day(ticker, symbol)
             
             if five_min_data is not None and len(five_min_data) > 5:
                 return self.calculate_ranges_from_intraday(five_min_data, '5min')
             
             # Method 3: Try hourly data for current day
-            print(f"Attempting hourly data for {symbol}...")
+            logger.info("Attempting hourly data for %s...", symbol)
             hourly_data = self.get_hourly_current_day(ticker, symbol)
             
             if hourly_data is not None and len(hourly_data) > 0:
                 return self.calculate_ranges_from_intraday(hourly_data, 'hourly')
             
             # Method 4: Direct Yahoo Finance API call
-            print(f"Attempting direct Yahoo API for {symbol}...")
+            logger.info("Attempting direct Yahoo API for %s...", symbol)
             return self.get_direct_yahoo_data(symbol)
             
         except Exception as e:
@@ -338,11 +338,11 @@ class ExactYahooDataMatcher:
             data.index = data.index.tz_convert(self.market_tz)
             today_data = data[data.index.date == today_et]
             
-            print(f"   1-min data points: {len(today_data)}")
+            logger.info("1-min data points: %s", len(today_data))
             return today_data if len(today_data) > 0 else None
             
         except Exception as e:
-            print(f"   1-minute data failed: {e}")
+            logger.warning("1-minute data failed: %s", e)
             return None
     
     def get_5_minute_current_day(self, ticker, symbol):
@@ -360,11 +360,11 @@ class ExactYahooDataMatcher:
             data.index = data.index.tz_convert(self.market_tz)
             today_data = data[data.index.date == today_et]
             
-            print(f"   5-min data points: {len(today_data)}")
+            logger.info("5-min data points: %s", len(today_data))
             return today_data if len(today_data) > 0 else None
             
         except Exception as e:
-            print(f"   5-minute data failed: {e}")
+            logger.warning("5-minute data failed: %s", e)
             return None
     
     def get_hourly_current_day(self, ticker, symbol):
@@ -382,11 +382,11 @@ class ExactYahooDataMatcher:
             data.index = data.index.tz_convert(self.market_tz)
             today_data = data[data.index.date == today_et]
             
-            print(f"   Hourly data points: {len(today_data)}")
+            logger.info("Hourly data points: %s", len(today_data))
             return today_data if len(today_data) > 0 else None
             
         except Exception as e:
-            print(f"   Hourly data failed: {e}")
+            logger.warning("Hourly data failed: %s", e)
             return None
     
     def calculate_ranges_from_intraday(self, data, source_type):
@@ -438,7 +438,8 @@ class ExactYahooDataMatcher:
             response = requests.get(url, params=params, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                # Parse the 1-minute chart payload straight from bytes, skipping charset detection
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
                 return self.parse_yahoo_api_response(data, symbol)
             else:
                 raise Exception(f"Yahoo API returned status {response.status_code}")
@@ -461,15 +462,21 @@ class ExactYahooDataMatcher:
             
             # Get historical data for validation
             quotes = result.get('indicators', {}).get('quote', [{}])[0]
-            highs = [h for h in quotes.get('high', []) if h is not None]
-            lows = [l for l in quotes.get('low', []) if l is not None]
             
-            # Use the maximum high and minimum low from intraday data
-            if highs and lows:
-                intraday_high = max(highs)
-                intraday_low = min(lows)
-                
-                # Use intraday values if they're more extreme
+            # Running maximum high and minimum low over the parallel intraday bars in one pass
+            intraday_high = float('-inf')
+            intraday_low = float('inf')
+            data_points = 0
+            for high, low in zip(quotes.get('high') or (), quotes.get('low') or ()):
+                if high is not None:
+                    data_points += 1
+                    if high > intraday_high:
+                        intraday_high = high
+                if low is not None and low < intraday_low:
+                    intraday_low = low
+            
+            # Use intraday values if they're more extreme
+            if intraday_high != float('-inf') and intraday_low != float('inf'):
                 daily_high = max(daily_high, intraday_high)
                 daily_low = min(daily_low, intraday_low)
             
@@ -481,7 +488,7 @@ class ExactYahooDataMatcher:
                 'daily_volume': int(daily_volume),
                 'daily_range': float(daily_high - daily_low),
                 'data_source': 'yahoo_api_direct',
-                'data_points': len(highs),
+                'data_points': data_points,
                 'trading_session_complete': True
             }
             
@@ -498,22 +505,22 @@ class ExactYahooDataMatcher:
         
         # Rule 1: Current price should be within daily range
         if current > high:
-            print(f"WARNING: Current price ({current}) above daily high ({high}), adjusting...")
+            logger.warning("Current price (%s) above daily high (%s), adjusting...", current, high)
             data['daily_high'] = current
         
         if current < low:
-            print(f"WARNING: Current price ({current}) below daily low ({low}), adjusting...")
+            logger.warning("Current price (%s) below daily low (%s), adjusting...", current, low)
             data['daily_low'] = current
         
         # Rule 2: High must be >= Low
         if high < low:
-            print(f"WARNING: High ({high}) less than low ({low}), swapping...")
+            logger.warning("High (%s) less than low (%s), swapping...", high, low)
             data['daily_high'], data['daily_low'] = low, high
         
         # Rule 3: Range validation (should be reasonable)
         range_pct = ((data['daily_high'] - data['daily_low']) / current) * 100
         if range_pct > 10:  # More than 10% range seems unusual
-            print(f"WARNING: Unusual daily range: {range_pct:.2f}%")
+            logger.warning("Unusual daily range: %.2f%%", range_pct)
         
         # Add validation timestamp
         data['validated_at'] = datetime.now().isoformat()
@@ -525,7 +532,7 @@ class ExactYahooDataMatcher:
         """Enhanced fallback that attempts to fetch real-time data"""
         
         try:
-            print(f"Attempting enhanced fallback for {symbol}...")
+            logger.info("Attempting enhanced fallback for %s...", symbol)
             
             # Try direct yfinance call as last resort
             ticker = yf.Ticker(symbol)
@@ -542,8 +549,8 @@ class ExactYahooDataMatcher:
                 daily_open = float(today_1d['Open'].iloc[-1])
                 daily_volume = float(today_1d['Volume'].iloc[-1])
                 
-                print(f"Enhanced fallback SUCCESS for {symbol}:")
-                print(f"  High: {daily_high:.2f}, Low: {daily_low:.2f}, Current: {current_price:.2f}")
+                logger.info("Enhanced fallback SUCCESS for %s: High %.2f, Low %.2f, Current %.2f",
+                            symbol, daily_high, daily_low, current_price)
                 
                 return {
                     'current_value': current_price,
@@ -565,8 +572,8 @@ class ExactYahooDataMatcher:
                 daily_open = float(today_1h['Open'].iloc[0])
                 daily_volume = float(today_1h['Volume'].sum())
                 
-                print(f"Enhanced fallback SUCCESS (hourly) for {symbol}:")
-                print(f"  High: {daily_high:.2f}, Low: {daily_low:.2f}, Current: {current_price:.2f}")
+                logger.info("Enhanced fallback SUCCESS (hourly) for %s: High %.2f, Low %.2f, Current %.2f",
+                            symbol, daily_high, daily_low, current_price)
                 
                 return {
                     'current_value': current_price,
@@ -581,10 +588,10 @@ class ExactYahooDataMatcher:
                 }
             
         except Exception as e:
-            print(f"Enhanced fallback failed for {symbol}: {e}")
+            logger.warning("Enhanced fallback failed for %s: %s", symbol, e)
         
         # Only use static fallback as absolute last resort
-        print(f"WARNING: Using static fallback for {symbol} - data may be outdated")
+        logger.warning("Using static fallback for %s - data may be outdated", symbol)
         return self.get_static_fallback_data(symbol, name)
     
     def get_static_fallback_data(self, symbol, name):
@@ -637,7 +644,7 @@ class ExactYahooDataMatcher:
             }
             
         except Exception as e:
-            logger.warning(f"⚠️ Previous trading day data failed for {symbol}: {e}")
+            logger.warning("⚠️ Previous trading day data failed for %s: %s", symbol, e)
             # Return fallback based on symbol
             fallback_values = {
                 '^NDX': 22831.07,   # NASDAQ-100 previous close estimate
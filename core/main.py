@@ -11,7 +11,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 # Import our custom modules (now in the same core directory)
-from data_fetch import fetch_last_two_1h_bars
+from data_fetch import fetch_many_last_two_1h_bars
 from strategy import calculate_signal
 from discord_post import post_signal, post_simple_signal, post_market_status, test_discord_connection
 from ai_engine import AIEngine
@@ -91,12 +91,16 @@ def generate_signals():
     successful_signals = []
     failed_signals = []
     
+    # Fetch the last two 1-hour bars for every symbol at once instead of one round trip per symbol
+    bars_by_symbol = fetch_many_last_two_1h_bars(symbols)
+    
     for symbol in symbols:
         try:
             print(f"\n--- Processing {symbol} ---")
             
-            # Fetch the last two 1-hour bars
-            df = fetch_last_two_1h_bars(symbol)
+            df = bars_by_symbol[symbol]
+            if isinstance(df, Exception):
+                raise df
             
             # Calculate the signal using the new format with news analysis
             signal = calculate_signal(df, symbol, include_news=include_news)
@@ -12,6 +12,12 @@ import time
 import logging
 from typing import Dict, Optional, Any
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class RealTimeDataFeed:
     def __init__(self):
         """Initialize with correct Yahoo Finance symbols"""
@@ -154,7 +160,8 @@ class RealTimeDataFeed:
             response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                # Parse the 1-minute chart payload straight from bytes, skipping charset detection
+                data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
                 
                 if 'chart' in data and data['chart']['result']:
                     result = data['chart']['result'][0]
@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the BFI Signals dashboard
+Usage: gunicorn --config gunicorn.conf.py core.dashboard:app
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:5000')
+
+# Threaded workers: the dashboard endpoints are I/O-bound (SQLite, pickle files, HTTP),
+# so each worker serves many concurrent pollers on its thread pool. The app keeps
+# per-thread SQLite connections and uses real threads (executors, timers, queues),
+# which gevent monkey-patching would turn into per-greenlet connections
+worker_class = 'gthread'
+# One worker by default: the response caches, profile cache and MarketWatch conditional-GET cache
+# are per process, so extra workers each warm (and invalidate) their own copies
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+max_requests = 1000
+max_requests_jitter = 100
+timeout = 60
+keepalive = 5
+
+# Background threads (agent task consumer, auto signal executor) are started at import,
+# so each worker must import the app itself rather than inherit it from a preloaded master
+preload_app = False
+
+
+def post_worker_init(worker):
+    """Start the market close scheduler; whichever worker holds core/scheduler.lock arms the timer,
+    and the others keep retrying so a replacement worker takes over after a reload"""
+    from core.dashboard import start_scheduler
+    start_scheduler()